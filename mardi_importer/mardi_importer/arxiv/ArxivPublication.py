@@ -3,13 +3,13 @@ from dataclasses import dataclass, field
 from typing import List, Optional
 
 import feedparser
-import requests
 from bs4 import BeautifulSoup
 from feedparser.util import FeedParserDict
 
 from mardiclient import MardiClient
 from mardi_importer import Importer
 from mardi_importer.utils import Author
+from mardi_importer.utils.HttpClient import HttpClient
 from mardi_importer.logger.logging_utils import get_logger_safe
 
 
@@ -299,7 +299,7 @@ class Arxiv:
             }
 
             base_url = "https://arxiv.org/a/"
-            req = requests.get(base_url + arxiv_author_id + ".html", headers=headers)
+            req = HttpClient.get(base_url + arxiv_author_id + ".html", headers=headers)
             soup = BeautifulSoup(req.content, "html.parser")
 
             try:
@@ -350,7 +350,7 @@ class Arxiv:
         log.debug(
             f"Fetching arXiv entry for {clean_id} (original: {arxiv_id}) - using: {full_url}"
         )
-        response = requests.get(full_url)
+        response = HttpClient.get(full_url)
         feed = feedparser.parse(response.text)
 
         if not feed.entries:
@@ -398,26 +398,7 @@ class ArxivPublication:
             # Get authors.
             item = self.api.item.get(self.QID)
             author_QID = item.get_value("wdt:P50") or []
-            for QID in author_QID:
-                author_item = self.api.item.get(entity_id=QID)
-                name = str(author_item.labels.get("en"))
-                orcid = author_item.get_value("wdt:P496")
-                orcid = orcid[0] if orcid else None
-                arxiv_author_id = author_item.get_value("wdt:P4594")
-                arxiv_author_id = arxiv_author_id[0] if arxiv_author_id else None
-                aliases = []
-                if author_item.aliases.get("en"):
-                    for alias in author_item.aliases.get("en"):
-                        aliases.append(str(alias))
-                author = Author(
-                    self.api,
-                    name=name,
-                    orcid=orcid,
-                    arxiv_id=arxiv_author_id,
-                    _aliases=aliases,
-                    _QID=QID,
-                )
-                self.authors.append(author)
+            self.authors += Author.from_items(self.api, author_QID)
 
     def create(self):
         log = get_logger_safe(__name__)
@@ -516,6 +497,7 @@ class ArxivPublication:
             Author claims to be added (P50 entity claims and/or P2093 string claims).
         """
         claims = []
+        Author.resolve_orcids(self.authors)
         for author in self.authors:
             if author.orcid or author.arxiv_id or author.QID:
                 if not author.QID:
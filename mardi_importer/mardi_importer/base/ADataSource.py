@@ -1,17 +1,29 @@
 from abc import ABC, abstractmethod
 from mardiclient import MardiClient
+from wikibaseintegrator import wbi_helpers
 from mardi_importer.wikidata import WikidataImporter
-from datetime import datetime
+from mardi_importer.base.LabelIdCache import LabelIdCache
+from mardi_importer.base.SetupState import SetupState
 import logging
 import inspect
 import os
 import json
 
+# Number of labels resolved per SPARQL query in create_local_entities
+LABEL_QUERY_BATCH_SIZE = 100
+
 class ADataSource(ABC):
     """Abstract base class for reading data from external sources."""
     _instances = {}
     _initialized = set()
     _setup_complete = set()
+    _setup_state = None
+    # Files defining what setup() creates, relative to the source module
+    wikidata_entities_file = "/wikidata_entities.txt"
+    setup_files = (wikidata_entities_file, "/new_entities.json")
+    # Version of the results returned by setup_snapshot(); None if the
+    # source keeps no setup results. Bump it when the results change.
+    setup_snapshot_version = None
 
     def __new__(cls, *args, **kwargs):
         if cls not in cls._instances:
@@ -38,7 +50,10 @@ class ADataSource(ABC):
             wikibase_url=os.environ.get("WIKIBASE_URL"),
             importer_api_url=os.environ.get("IMPORTER_API_URL"),
         )
+        LabelIdCache.install(self.api)
         self._wdi = None
+        # Local ids of the entities created by create_local_entities
+        self.local_entities = {}
         
         if not self._should_run_setup():
             self.logger.info(f"Setup for {self.__class__.__name__} already complete")
@@ -55,56 +70,210 @@ class ADataSource(ABC):
             self._wdi = WikidataImporter()
         return self._wdi
     
-    def _get_setup_marker_path(self) -> str:
-        """Get path to setup marker file in a writable location."""
-        marker_dir = '/tmp/mardi_importer'
-        os.makedirs(marker_dir, exist_ok=True)
-        
-        marker_filename = f'.{self.__class__.__name__}_setup_complete'
-        return os.path.join(marker_dir, marker_filename)
-    
+    @property
+    def setup_state(self) -> SetupState:
+        """Setup state shared by all sources through the importer DB."""
+        if ADataSource._setup_state is None:
+            ADataSource._setup_state = SetupState(self.wdi.engine)
+        return ADataSource._setup_state
+
+    def _setup_hash(self) -> str:
+        """Content hash of the setup files of the source."""
+        return SetupState.content_hash(
+            [self.filepath + filename for filename in self.setup_files]
+        )
+
     def _should_run_setup(self) -> bool:
-        """Check if setup needs to be run."""
+        """Check if setup needs to be run.
+
+        Setup runs once per version of the setup files across all
+        processes sharing the importer DB.
+        """
         if self.__class__ in ADataSource._setup_complete:
             return False
-        
-        setup_marker = self._get_setup_marker_path()
-        if os.path.exists(setup_marker):
+
+        if self.setup_state.is_complete(self.__class__.__name__, self._setup_hash()):
+            if not self._restore_setup_snapshot():
+                self.logger.info(
+                    f"Setup snapshot of {self.__class__.__name__} missing or outdated"
+                )
+                return True
             ADataSource._setup_complete.add(self.__class__)
             return False
-        
+
         return True
 
     def _mark_setup_complete(self):
         """Mark setup as complete."""
         ADataSource._setup_complete.add(self.__class__)
-        setup_marker = self._get_setup_marker_path()
-        with open(setup_marker, 'w') as f:
-            f.write(f"Setup completed at {datetime.now().isoformat()}\n")
+        snapshot = {}
+        if self.setup_snapshot_version is not None:
+            snapshot["version"] = self.setup_snapshot_version
+            snapshot["data"] = self.setup_snapshot()
+        if self.local_entities:
+            snapshot["local_entities"] = self.local_entities
+        self.setup_state.mark_complete(
+            self.__class__.__name__, self._setup_hash(), snapshot=snapshot or None
+        )
+
+    def _restore_setup_snapshot(self) -> bool:
+        """Restore the setup results stored with the setup state.
+
+        Returns:
+            False if the source keeps setup results and no snapshot of the
+            current version is stored, True otherwise.
+        """
+        if self.setup_snapshot_version is None:
+            return True
+        snapshot = self.setup_state.load_snapshot(
+            self.__class__.__name__, self._setup_hash()
+        )
+        if not snapshot or snapshot.get("version") != self.setup_snapshot_version:
+            return False
+        self.restore_setup(snapshot["data"])
+        return True
+
+    def setup_snapshot(self) -> dict:
+        """Results of setup() needed by every instance of the source.
+
+        Only called if ``setup_snapshot_version`` is set. The returned dict
+        must be JSON-serializable; it is passed to :meth:`restore_setup`
+        when a later process skips the setup.
+        """
+        return {}
+
+    def restore_setup(self, data: dict) -> None:
+        """Restore the results of setup() saved by :meth:`setup_snapshot`."""
+        pass
+
+    @classmethod
+    def required_wikidata_entities(cls) -> list:
+        """Wikidata ids that the setup of the source imports."""
+        filename = os.path.realpath(os.path.dirname(inspect.getfile(cls))) + cls.wikidata_entities_file
+        if not os.path.isfile(filename):
+            return []
+        with open(filename) as f:
+            return [line.strip() for line in f if line.strip()]
 
     def import_wikidata_entities(self, filename: str):
+        """Import the Wikidata entities listed in a file of the source.
+
+        Entities already imported with all their claims are skipped; the
+        remaining ones are imported as a batch.
+
+        Args:
+            filename: Path relative to the source module
+        """
         filename = self.filepath + filename
-        self.wdi.import_entities(filename=filename)
+        self.wdi.import_missing_entities(self.wdi.create_id_list_from_file(filename))
 
     def create_local_entities(self, filename: str):
+        """Create the properties and items defined in a file of the source.
+
+        Entities are identified by their English label (and description,
+        for items). The labels of all entities in the file are resolved
+        with batched SPARQL queries and only the entities not found are
+        checked and written one by one. The resolved ids are kept with the
+        setup state, so that a setup repeated for the same setup files
+        skips the entities created before. Ids stored for other versions of
+        the files are not reused, since their entities may have changed.
+
+        Args:
+            filename: Path relative to the source module
+        """
         filename = self.filepath + filename
-        f = open(filename)
-        entities = json.load(f)
-
-        for prop_element in entities['properties']:
-            prop = self.api.property.new()
-            prop.labels.set(language='en', value=prop_element['label'])
-            prop.descriptions.set(language='en', value=prop_element['description'])
-            prop.datatype = prop_element['datatype']
-            if not prop.exists(): prop.write()
-
-        for item_element in entities['items']:
-            item = self.api.item.new()
-            item.labels.set(language='en', value=item_element['label'])
-            item.descriptions.set(language='en', value=item_element['description'])
-            for key, value in item_element.get('claims', {}).items():
-                item.add_claim(key,value=value)
-            if not item.exists(): item.write()
+        with open(filename) as f:
+            entities = json.load(f)
+
+        elements = [("property", element) for element in entities['properties']]
+        elements += [("item", element) for element in entities['items']]
+
+        previous = self.setup_state.load_snapshot(
+            self.__class__.__name__, self._setup_hash()
+        ) or {}
+        known = previous.get("local_entities", {})
+        pending = []
+        for kind, element in elements:
+            key = self._local_entity_key(kind, element)
+            if key in known:
+                self.local_entities[key] = known[key]
+            else:
+                pending.append((kind, element))
+        if not pending:
+            return
+
+        found = self._find_local_entities([element['label'] for _, element in pending])
+        for kind, element in pending:
+            key = self._local_entity_key(kind, element)
+            if key in found:
+                self.local_entities[key] = found[key]
+                continue
+            if kind == "property":
+                entity = self.api.property.new()
+                entity.datatype = element['datatype']
+            else:
+                entity = self.api.item.new()
+                for prop, value in element.get('claims', {}).items():
+                    entity.add_claim(prop, value=value)
+            entity.labels.set(language='en', value=element['label'])
+            entity.descriptions.set(language='en', value=element['description'])
+            # The SPARQL endpoint may lag behind recent writes
+            entity_id = entity.exists()
+            if not entity_id:
+                entity_id = entity.write().id
+                # Lookups of the label may now resolve to the new entity
+                LabelIdCache.clear()
+            self.local_entities[key] = entity_id
+
+    @staticmethod
+    def _local_entity_key(kind: str, element: dict) -> str:
+        # Property labels are unique, items are unique by label and description
+        if kind == "property":
+            return f"property|{element['label']}"
+        return f"item|{element['label']}|{element['description']}"
+
+    def _find_local_entities(self, labels: list) -> dict:
+        """Resolve English labels to local entities in batched SPARQL queries.
+
+        Args:
+            labels: English labels
+
+        Returns:
+            dict: Local ids by the keys of :meth:`_local_entity_key`; empty
+            if no SPARQL endpoint is configured or it cannot be queried.
+        """
+        found = {}
+        endpoint = os.environ.get("SPARQL_ENDPOINT_URL")
+        if not endpoint:
+            return found
+        labels = list(dict.fromkeys(labels))
+        for start in range(0, len(labels), LABEL_QUERY_BATCH_SIZE):
+            batch = labels[start:start + LABEL_QUERY_BATCH_SIZE]
+            values = " ".join(f"{json.dumps(label)}@en" for label in batch)
+            query = (
+                "PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#> "
+                "PREFIX schema: <http://schema.org/> "
+                "SELECT ?entity ?label ?description WHERE { "
+                f"VALUES ?label {{ {values} }} "
+                "?entity rdfs:label ?label . "
+                "OPTIONAL { ?entity schema:description ?description . "
+                'FILTER(LANG(?description) = "en") } }'
+            )
+            try:
+                results = wbi_helpers.execute_sparql_query(
+                    query=query, endpoint=endpoint, max_retries=3, retry_after=10
+                )
+            except Exception as e:
+                self.logger.warning(f"Resolving local entities by label failed: {e}")
+                return {}
+            for binding in results["results"]["bindings"]:
+                entity_id = binding["entity"]["value"].rsplit("/", 1)[-1]
+                label = binding["label"]["value"]
+                if entity_id.startswith("P"):
+                    found[f"property|{label}"] = entity_id
+                elif entity_id.startswith("Q") and "description" in binding:
+                    found[f"item|{label}|{binding['description']['value']}"] = entity_id
+        return found
 
     @abstractmethod
     def setup(self) -> None:
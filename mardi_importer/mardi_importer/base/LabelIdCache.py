@@ -0,0 +1,69 @@
+import threading
+
+
+class LabelIdCache:
+    """Process-wide cache of the label resolutions of MardiClient.
+
+    ``MardiClient.get_local_id_by_label`` resolves English labels as well
+    as ``wdt:``/``wd:`` prefixed Wikidata ids to local ids, and the client
+    calls it for the property and the value of every claim it builds. The
+    importers resolve the same constants (``"description"``,
+    ``"wdt:P31"``, ...) for every record, each time with a request to the
+    local Wikibase or the importer API.
+
+    :meth:`install` wraps the method of a client, so that every lookup
+    with a non-empty result is answered from a dictionary shared by all
+    clients of the process after the first request. Empty results are not
+    cached, since the entity may be created later on. The cache is cleared
+    by :meth:`clear` when new local entities are created.
+    """
+
+    _entries = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def install(cls, api):
+        """Route the label lookups of a client through the cache.
+
+        Args:
+            api (MardiClient): Client to wrap; clients already wrapped are
+                left unchanged
+
+        Returns:
+            MardiClient: The given client.
+        """
+        resolve = api.get_local_id_by_label
+        if getattr(resolve, "_label_id_cache", None) is True:
+            return api
+
+        def get_local_id_by_label(*args, **kwargs):
+            return cls.get(resolve, *args, **kwargs)
+
+        get_local_id_by_label._label_id_cache = True
+        api.get_local_id_by_label = get_local_id_by_label
+        return api
+
+    @classmethod
+    def get(cls, resolve, *args, **kwargs):
+        """Look up a label resolution, calling ``resolve`` on a miss.
+
+        Lists of item ids are stored as tuples and returned as new lists,
+        so that callers cannot modify the cached value.
+        """
+        key = (args, tuple(sorted(kwargs.items())))
+        with cls._lock:
+            entry = cls._entries.get(key)
+        if entry is not None:
+            return list(entry) if isinstance(entry, tuple) else entry
+
+        result = resolve(*args, **kwargs)
+        if result:
+            with cls._lock:
+                cls._entries[key] = tuple(result) if isinstance(result, list) else result
+        return result
+
+    @classmethod
+    def clear(cls):
+        """Drop all cached resolutions."""
+        with cls._lock:
+            cls._entries.clear()
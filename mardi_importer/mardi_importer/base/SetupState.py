@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+import time
+
+import sqlalchemy as db
+from sqlalchemy.dialects.mysql import insert
+
+TABLE_NAME = "source_setup"
+
+
+class SetupState:
+    """Setup state of the data sources, stored in the importer DB.
+
+    A source is set up once per version of its setup files (the Wikidata
+    entities and local entities it requires): the state is keyed by the
+    source name and a content hash of these files, so that all pods and
+    workers sharing the importer DB skip the setup until the files change.
+    Results of the setup that every instance of a source needs (e.g. local
+    ids resolved by label) can be stored along with the state as a JSON
+    snapshot.
+
+    Attributes:
+        engine: SQLAlchemy engine of the importer DB
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._table = None
+
+    def _get_table(self):
+        """Return the state table, creating it if it does not exist."""
+        if self._table is None:
+            if not db.inspect(self.engine).has_table(TABLE_NAME):
+                metadata = db.MetaData()
+                db.Table(
+                    TABLE_NAME,
+                    metadata,
+                    db.Column("source", db.String(64), primary_key=True),
+                    db.Column("content_hash", db.String(64), nullable=False),
+                    db.Column("completed_at", db.BigInteger, nullable=False),
+                    db.Column("snapshot", db.Text, nullable=True),
+                )
+                metadata.create_all(self.engine)
+            self._table = db.Table(TABLE_NAME, db.MetaData(), autoload_with=self.engine)
+        return self._table
+
+    @staticmethod
+    def content_hash(paths) -> str:
+        """Hash the content of the setup files of a source.
+
+        Args:
+            paths: Paths of the setup files; missing files are skipped.
+
+        Returns:
+            str: Hex digest over names and contents of the files.
+        """
+        digest = hashlib.sha256()
+        for path in sorted(paths):
+            if not os.path.isfile(path):
+                continue
+            digest.update(os.path.basename(path).encode())
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        return digest.hexdigest()
+
+    def is_complete(self, source: str, content_hash: str) -> bool:
+        """Check whether the setup of a source has run for the given files."""
+        table = self._get_table()
+        sql = db.select(table.c.content_hash).where(table.c.source == source)
+        with self.engine.connect() as connection:
+            row = connection.execute(sql).fetchone()
+        return row is not None and row[0] == content_hash
+
+    def load_snapshot(self, source: str, content_hash: str = None):
+        """Load the setup snapshot stored for the given files.
+
+        Args:
+            source: Name of the source
+            content_hash: Hash of the setup files; None to load the snapshot
+                of the last completed setup, whatever its files
+
+        Returns:
+            dict or None: The snapshot, or None if the setup has not run
+            for these files or stored no snapshot.
+        """
+        table = self._get_table()
+        sql = db.select(table.c.content_hash, table.c.snapshot).where(
+            table.c.source == source
+        )
+        with self.engine.connect() as connection:
+            row = connection.execute(sql).fetchone()
+        if row is None or not row[1]:
+            return None
+        if content_hash is not None and row[0] != content_hash:
+            return None
+        return json.loads(row[1])
+
+    def mark_complete(self, source: str, content_hash: str, snapshot: dict = None) -> None:
+        """Record that the setup of a source has run for the given files.
+
+        Args:
+            source: Name of the source
+            content_hash: Hash of the setup files, see :meth:`content_hash`
+            snapshot: JSON-serializable setup results to store
+        """
+        table = self._get_table()
+        # Workers setting up the same source may finish at the same time
+        upsert = insert(table).values(
+            source=source,
+            content_hash=content_hash,
+            completed_at=int(time.time()),
+            snapshot=json.dumps(snapshot) if snapshot is not None else None,
+        )
+        upsert = upsert.on_duplicate_key_update(
+            content_hash=upsert.inserted.content_hash,
+            completed_at=upsert.inserted.completed_at,
+            snapshot=upsert.inserted.snapshot,
+        )
+        with self.engine.connect() as connection:
+            connection.execute(upsert)
+            connection.commit()
@@ -1 +1,3 @@
-from .ADataSource import ADataSource
\ No newline at end of file
+from .ADataSource import ADataSource
+from .LabelIdCache import LabelIdCache
+from .SetupState import SetupState
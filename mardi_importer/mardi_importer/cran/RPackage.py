@@ -5,6 +5,9 @@ from mardi_importer.arxiv import ArxivSource, ArxivPublication
 from mardi_importer.crossref import CrossrefSource, CrossrefPublication
 from mardi_importer.zenodo import ZenodoSource, ZenodoResource
 from mardi_importer.utils import Author
+from mardi_importer.utils.HttpClient import HttpClient
+from mardi_importer.utils.LicenseResolver import LicenseResolver
+from mardi_importer.utils.LocalEntityFetcher import LocalEntityFetcher
 from wikibaseintegrator.wbi_helpers import search_entities, remove_claims
 
 from dataclasses import dataclass, field
@@ -13,7 +16,6 @@ from io import StringIO
 
 from bs4 import BeautifulSoup
 import pandas as pd
-import requests
 import re
 
 import logging
@@ -124,12 +126,18 @@ class RPackage:
     def exists(self) -> str:
         """Checks if an item corresponding to the R package already exists.
 
+        The existing item is only fetched by :meth:`load_item`.
+
         Returns:
           str: Entity ID
         """
+        return self.QID
+
+    def load_item(self) -> MardiItem:
+        """Fetches the existing item corresponding to the R package."""
         if self.QID:
             self._item = self.api.item.get(entity_id=self.QID)
-        return self.QID
+        return self._item
 
     def is_updated(self) -> bool:
         """Checks if the Item corresponding to the R package is up to date.
@@ -152,7 +160,7 @@ class RPackage:
         self.url = f"https://CRAN.R-project.org/package={self.label}"
 
         try:
-            page = requests.get(self.url)
+            page = HttpClient.get(self.url)
             soup = BeautifulSoup(page.content, "lxml")
         except:
             log.warning(f"Package {self.label} package not found in CRAN.")
@@ -348,14 +356,10 @@ class RPackage:
             )
 
         if self.pull():
+            self.load_item()
             # Obtain current Authors
             current_authors = self.item.get_value("wdt:P50")
-            for author_qid in current_authors:
-                author_item = self.api.item.get(entity_id=author_qid)
-                author_label = str(author_item.labels.get("en"))
-                current_author = Author(self.api, name=author_label)
-                current_author._QID = author_qid
-                self.author_pool += [current_author]
+            self.author_pool += author_factory.from_items(self.api, current_authors)
 
             # Disambiguate Authors and create corresponding Author items
             pool_for_items = []
@@ -384,7 +388,7 @@ class RPackage:
                 remove_claims(guid, login=self.api.login, is_bot=True)
 
             # Restart item state
-            self.exists()
+            self.load_item()
 
             if self.item.descriptions.values.get("en") != self.description:
                 description = self.description
@@ -548,7 +552,10 @@ class RPackage:
         Returns:
             str: Last update date in format DD-MM-YYYY.
         """
-        last_update = self.item.get_value("wdt:P5017")
+        if not self.QID:
+            return None
+        claims = LocalEntityFetcher(self.api).fetch_claims([self.QID], ["wdt:P5017"])
+        last_update = claims.get(self.QID, {}).get("wdt:P5017")
         return last_update[0][1:11] if last_update else None
 
     def clean_package_list(self, table_html):
@@ -881,74 +888,7 @@ class RPackage:
             (str): Wikidata item ID.
         """
 
-        def get_license(label: str) -> str:
-            license_item = self.api.item.new()
-            license_item.labels.set(language="en", value=label)
-            return license_item.is_instance_of("wd:Q207621")
-
-        license_mapping = {
-            "ACM": get_license("ACM Software License Agreement"),
-            "AGPL": "wd:Q28130012",
-            "AGPL-3": "wd:Q27017232",
-            "Apache License": "wd:Q616526",
-            "Apache License 2.0": "wd:Q13785927",
-            "Apache License version 1.1": "wd:Q17817999",
-            "Apache License version 2.0": "wd:Q13785927",
-            "Artistic-2.0": "wd:Q14624826",
-            "Artistic License 2.0": "wd:Q14624826",
-            "BSD 2-clause License": "wd:Q18517294",
-            "BSD 3-clause License": "wd:Q18491847",
-            "BSD_2_clause": "wd:Q18517294",
-            "BSD_3_clause": "wd:Q18491847",
-            "BSL": "wd:Q2353141",
-            "BSL-1.0": "wd:Q2353141",
-            "CC0": "wd:Q6938433",
-            "CC BY 4.0": "wd:Q20007257",
-            "CC BY-SA 4.0": "wd:Q18199165",
-            "CC BY-NC 4.0": "wd:Q34179348",
-            "CC BY-NC-SA 4.0": "wd:Q42553662",
-            "CeCILL": "wd:Q1052189",
-            "CeCILL-2": "wd:Q19216649",
-            "Common Public License Version 1.0": "wd:Q2477807",
-            "CPL-1.0": "wd:Q2477807",
-            "Creative Commons Attribution 4.0 International License": "wd:Q20007257",
-            "EPL": "wd:Q1281977",
-            "EUPL": "wd:Q1376919",
-            "EUPL-1.1": "wd:Q1376919",
-            "file LICENCE": get_license("File License"),
-            "file LICENSE": get_license("File License"),
-            "FreeBSD": "wd:Q34236",
-            "GNU Affero General Public License": "wd:Q1131681",
-            "GNU General Public License": "wd:Q7603",
-            "GNU General Public License version 2": "wd:Q10513450",
-            "GNU General Public License version 3": "wd:Q10513445",
-            "GPL": "wd:Q7603",
-            "GPL-2": "wd:Q10513450",
-            "GPL-3": "wd:Q10513445",
-            "LGPL": "wd:Q192897",
-            "LGPL-2": "wd:Q23035974",
-            "LGPL-2.1": "wd:Q18534390",
-            "LGPL-3": "wd:Q18534393",
-            "Lucent Public License": "wd:Q6696468",
-            "MIT": "wd:Q334661",
-            "MIT License": "wd:Q334661",
-            "Mozilla Public License 1.1": "wd:Q26737735",
-            "Mozilla Public License 2.0": "wd:Q25428413",
-            "Mozilla Public License Version 2.0": "wd:Q25428413",
-            "MPL": "wd:Q308915",
-            "MPL version 1.0": "wd:Q26737738",
-            "MPL version 1.1": "wd:Q26737735",
-            "MPL version 2.0": "wd:Q25428413",
-            "MPL-1.1": "wd:Q26737735",
-            "MPL-2.0": "wd:Q25428413",
-            "Unlimited": get_license("Unlimited License"),
-        }
-
-        license_info = license_mapping.get(license_str)
-        if callable(license_info):
-            return license_info()
-        else:
-            return license_info
+        return LicenseResolver.software_license(self.api, license_str)
 
     def get_wikidata_QID(self) -> Optional[str]:
         """Get the Wikidata QID for the R package.
@@ -988,7 +928,7 @@ class RPackage:
         url = f"https://cran.r-project.org/src/contrib/Archive/{self.label}"
 
         try:
-            page = requests.get(url)
+            page = HttpClient.get(url)
             soup = BeautifulSoup(page.content, "lxml")
         except:
             log.warning(f"Version page for package {self.label} not found.")
@@ -61,19 +61,7 @@ class CrossrefPublication:
             # Get authors.
             item = self.api.item.get(self.QID)
             author_QID = item.get_value("wdt:P50")
-            for QID in author_QID:
-                author_item = self.api.item.get(entity_id=QID)
-                name = str(author_item.labels.get("en"))
-                orcid = author_item.get_value("wdt:P496")
-                orcid = orcid[0] if orcid else None
-                aliases = []
-                if author_item.aliases.get("en"):
-                    for alias in author_item.aliases.get("en"):
-                        aliases.append(str(alias))
-                author = Author(
-                    self.api, name=name, orcid=orcid, _aliases=aliases, _QID=QID
-                )
-                self.authors.append(author)
+            self.authors += Author.from_items(self.api, author_QID)
         else:
             try:
                 cr = Crossref()
@@ -385,6 +373,7 @@ class CrossrefPublication:
         log = get_logger_safe(__name__)
         log.debug(f"Start preprocessing authors for: {self.authors}")
 
+        Author.resolve_orcids(self.authors)
         for author in self.authors:
             if author.orcid or author.QID:
                 if not author.QID:
@@ -1,6 +1,10 @@
-from typing import Dict, Type, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+from typing import Dict, List, Type, Tuple, Union
 from mardiclient import MardiClient
 from mardi_importer.base import ADataSource
+from mardi_importer.logger.logging_utils import get_logger_safe
+from mardi_importer.wikidata import WikidataImporter
 
 import os
 
@@ -8,19 +12,25 @@ from wikibaseintegrator.wbi_login import LoginError
 
 
 class Importer:
-    """Central registry for all data sources."""
-    _sources: Dict[str, Type['ADataSource']] = {}
+    """Central registry for all data sources.
+
+    Sources can be registered by class or by a ``"module:Class"`` path,
+    so that their modules (and dependencies such as pandas) are only
+    imported when a source is first used.
+    """
+    _sources: Dict[str, Union[str, Type['ADataSource']]] = {}
     _credentials: Dict[str, Tuple[str, str]] = {}
     _apis: Dict[str, MardiClient] = {}
     
     @classmethod
-    def register(cls, name: str, source_class: Type['ADataSource'], 
+    def register(cls, name: str, source_class: Union[str, Type['ADataSource']],
                  user_env_var: str = None, password_env_var: str = None):
         """Register a data source with its credentials.
         
         Args:
             name: Source name
-            source_class: Source class
+            source_class: Source class, or its path as ``"module:Class"``;
+                modules starting with a dot are relative to this package
             user_env_var: Environment variable name for username (defaults to {NAME}_USER)
             password_env_var: Environment variable name for password (defaults to {NAME}_PASS)
         """
@@ -33,12 +43,24 @@ class Importer:
             password_env_var = f"{name.upper()}_PASS"
             
         cls._credentials[name] = (user_env_var, password_env_var)
+
+    @classmethod
+    def get_source_class(cls, name: str) -> Type['ADataSource']:
+        """Return the class of a registered source, importing it on first use."""
+        if name not in cls._sources:
+            raise ValueError(f"Unknown source: {name}")
+        source_class = cls._sources[name]
+        if isinstance(source_class, str):
+            module_name, _, class_name = source_class.partition(":")
+            module = import_module(module_name, package=__package__)
+            source_class = getattr(module, class_name)
+            cls._sources[name] = source_class
+        return source_class
     
     @classmethod
     def create_source(cls, name: str) -> 'ADataSource':
         """Create a source instance with appropriate credentials."""
-        if name not in cls._sources:
-            raise ValueError(f"Unknown source: {name}")
+        source_class = cls.get_source_class(name)
         
         user_env_var, password_env_var = cls._credentials[name]
         user = os.environ.get(user_env_var)
@@ -52,7 +74,7 @@ class Importer:
                 missing.append(password_env_var)
             raise ValueError(f"Missing required environment variables for {name}: {', '.join(missing)}")
         
-        source = cls._sources[name](user=user, password=password)
+        source = source_class(user=user, password=password)
 
         if source.api is None or source.api.login is None:
             raise LoginError(f"Authentication failed for {name} (using {user_env_var})")
@@ -61,6 +83,72 @@ class Importer:
 
         return source
 
+    @classmethod
+    def create_sources(cls, names: List[str]) -> Dict[str, 'ADataSource']:
+        """Create several source instances concurrently.
+
+        The Wikidata entities required by the setups of all sources are
+        imported once, as a single batch, before the sources are created.
+        The sources are then created in parallel, so that the clients log
+        in concurrently and the remaining setup steps overlap; their
+        setups find the shared entities imported already.
+
+        If the shared import fails, the sources are created one after the
+        other, since each setup then imports its own entities through the
+        shared WikidataImporter.
+
+        Args:
+            names: Registered names of the sources
+
+        Returns:
+            Dict mapping each name to its source instance.
+        """
+        names = list(dict.fromkeys(names))
+        for name in names:
+            if name not in cls._sources:
+                raise ValueError(f"Unknown source: {name}")
+
+        if not cls._import_setup_entities(names):
+            return {name: cls.create_source(name) for name in names}
+
+        with ThreadPoolExecutor(max_workers=max(1, len(names))) as executor:
+            futures = {name: executor.submit(cls.create_source, name) for name in names}
+            return {name: future.result() for name, future in futures.items()}
+
+    @classmethod
+    def _import_setup_entities(cls, names: List[str]) -> bool:
+        """Import the union of the Wikidata entities required by the setups
+        of several sources, skipping sources already set up in this process.
+
+        Also initialises the shared WikidataImporter, so that the setups do
+        not create it concurrently.
+
+        Returns:
+            False if the import failed; failures are logged only and each
+            setup then imports its own entities.
+        """
+        source_classes = [cls.get_source_class(name) for name in names]
+        pending = [
+            source_class for source_class in source_classes
+            if issubclass(source_class, ADataSource)
+            and source_class not in ADataSource._setup_complete
+        ]
+        if not pending:
+            return True
+        log = get_logger_safe(__name__)
+        try:
+            wdi = WikidataImporter()
+            id_list = [
+                wikidata_id
+                for source_class in pending
+                for wikidata_id in source_class.required_wikidata_entities()
+            ]
+            wdi.import_missing_entities(id_list)
+        except Exception as e:
+            log.warning(f"Importing Wikidata entities for source setups failed: {e}")
+            return False
+        return True
+
     @classmethod
     def get_api(cls, source_name: str) -> MardiClient:
         """
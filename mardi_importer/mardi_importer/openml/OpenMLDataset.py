@@ -1,6 +1,7 @@
 import re
 import sys
 from .OpenMLPublication import OpenMLPublication
+from mardi_importer.utils.LicenseResolver import LicenseResolver
 import validators
 import math
 
@@ -370,71 +371,4 @@ class OpenMLDataset:
         Returns:
             (str): Wikidata item ID.
         """
-        def get_license(label: str) -> str:
-            license_item = self.api.item.new()
-            license_item.labels.set(language="en", value=label)
-            return license_item.is_instance_of("wd:Q207621")
-
-        license_mapping = {
-            "ACM": get_license("ACM Software License Agreement"),
-            "AGPL":"wd:Q28130012",
-            "AGPL-3": "wd:Q27017232",
-            "Apache License": "wd:Q616526",
-            "Apache License 2.0": "wd:Q13785927",
-            "Apache License version 1.1": "wd:Q17817999",
-            "Apache License version 2.0": "wd:Q13785927",
-            "Artistic-2.0": "wd:Q14624826",
-            "Artistic License 2.0": "wd:Q14624826",
-            "BSD 2-clause License": "wd:Q18517294",
-            "BSD 3-clause License": "wd:Q18491847",
-            "BSD_2_clause": "wd:Q18517294",
-            "BSD_3_clause": "wd:Q18491847",
-            "BSL": "wd:Q2353141",
-            "BSL-1.0": "wd:Q2353141",
-            "CC0": "wd:Q6938433",
-            "CC BY 4.0": "wd:Q20007257",
-            "CC BY-SA 4.0": "wd:Q18199165",
-            "CC BY-NC 4.0": "wd:Q34179348",
-            "CC BY-NC-SA 4.0": "wd:Q42553662",
-            "CeCILL": "wd:Q1052189",
-            "CeCILL-2": "wd:Q19216649",
-            "Common Public License Version 1.0": "wd:Q2477807",
-            "CPL-1.0": "wd:Q2477807",
-            "Creative Commons Attribution 4.0 International License": "wd:Q20007257",
-            "EPL": "wd:Q1281977",
-            "EUPL": "wd:Q1376919",
-            "EUPL-1.1": "wd:Q1376919",
-            "file LICENCE": get_license("File License"),
-            "file LICENSE": get_license("File License"),
-            "FreeBSD": "wd:Q34236",
-            "GNU Affero General Public License": "wd:Q1131681",
-            "GNU General Public License": "wd:Q7603",
-            "GNU General Public License version 2": "wd:Q10513450",
-            "GNU General Public License version 3": "wd:Q10513445",
-            "GPL": "wd:Q7603",
-            "GPL-2": "wd:Q10513450",
-            "GPL-3": "wd:Q10513445",
-            "LGPL": "wd:Q192897",
-            "LGPL-2": "wd:Q23035974",
-            "LGPL-2.1": "wd:Q18534390",
-            "LGPL-3": "wd:Q18534393",
-            "Lucent Public License": "wd:Q6696468",
-            "MIT": "wd:Q334661",
-            "MIT License": "wd:Q334661",
-            "Mozilla Public License 1.1": "wd:Q26737735",
-            "Mozilla Public License 2.0": "wd:Q25428413",
-            "Mozilla Public License Version 2.0": "wd:Q25428413",
-            "MPL": "wd:Q308915",
-            "MPL version 1.0": "wd:Q26737738",
-            "MPL version 1.1": "wd:Q26737735",
-            "MPL version 2.0": "wd:Q25428413",
-            "MPL-1.1": "wd:Q26737735",
-            "MPL-2.0": "wd:Q25428413",
-            "Unlimited": get_license("Unlimited License"),
-        }
-
-        license_info = license_mapping.get(license_str)
-        if callable(license_info):
-            return license_info()
-        else:
-            return license_info
\ No newline at end of file
+        return LicenseResolver.software_license(self.api, license_str)
\ No newline at end of file
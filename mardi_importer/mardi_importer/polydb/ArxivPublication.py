@@ -1,6 +1,5 @@
 import feedparser
 import logging
-import requests
 import re
 
 from bs4 import BeautifulSoup
@@ -11,6 +10,7 @@ from typing import List
 from mardiclient import MardiClient
 from mardi_importer.wikidata import WikidataImporter
 from mardi_importer.polydb.Author import Author
+from mardi_importer.utils.HttpClient import HttpClient
 
 log = logging.getLogger('CRANlogger')
 
@@ -157,7 +157,7 @@ class Arxiv():
             }
 
             base_url = "https://arxiv.org/a/"
-            req = requests.get(base_url + arxiv_author_id + ".html", headers)
+            req = HttpClient.get(base_url + arxiv_author_id + ".html", headers=headers)
             soup = BeautifulSoup(req.content, 'html.parser')
 
             author_html = soup.find("div", id="content").find("h1").get_text()
@@ -185,7 +185,7 @@ class Arxiv():
     @staticmethod
     def arxiv_api(arxiv_id: str) -> FeedParserDict:
         api_url = 'http://export.arxiv.org/api/query?id_list='
-        response = requests.get(api_url + arxiv_id)
+        response = HttpClient.get(api_url + arxiv_id)
         feed = feedparser.parse(response.text)
         return feed.entries[0]
 
@@ -1,8 +1,12 @@
 from wikibaseintegrator.wbi_enums import ActionIfExists
 from wikibaseintegrator.wbi_helpers import search_entities, merge_items
 from mardi_importer.wikidata import WikidataImporter
+from mardi_importer.wikidata.PersonRegistry import ARXIV_AUTHOR, ORCID
+from mardi_importer.utils.AuthorChangeSet import AuthorChangeSet
+from mardi_importer.utils.AuthorIndex import AuthorIndex
+from mardi_importer.utils.OrcidResolver import OrcidResolver
+from mardi_importer.utils.ParsedName import ParsedName
 
-from nameparser import HumanName
 
 class Author:
     def __init__(self, api, name="", orcid=None, arxiv_id=None, affiliation=None, aliases=[], QID=None):
@@ -13,51 +17,26 @@ class Author:
         self.affiliation = affiliation
         self._aliases = aliases
         self._QID = QID
+        self._orcid_checked = False
+        self._registry_checked = False
+        # Set by merges; the label and aliases of the item are updated by update()
+        self._relabel = False
         self._item = None
         self.wdi = WikidataImporter()
 
     @staticmethod
     def parse_name(name: str) -> str:
-        parsed_name = HumanName(name)
-        parsed_name.capitalize(force=True)
-        return str(parsed_name)
+        return ParsedName.capitalize(name)
 
     def __eq__(self, other):
         if self.orcid and self.orcid == other.orcid:
             return True
-        self_name = HumanName(self.name)
-        other_name = HumanName(other.name)
-        if self_name.first == other_name.first and self_name.last == other_name.last:
-            return True
-        if ( self_name.first.lower().replace('-','') == other_name.first.lower().replace('-','') and 
-             self_name.last.lower().replace('-','') == other_name.last.lower().replace('-','') ):
-            return True
-        if ( len(self_name.first) == 2 and self_name.first[0] == other_name.first[0] 
-             and self_name.last == other_name.last ):
-            return True
-        if ( len(other_name.first) == 2 and self_name.first[0] == other_name.first[0] 
-             and self_name.last == other_name.last ):
-            return True
-        if ( self_name.first == other_name.first and len(self_name.last) == 2 
-             and self_name.last[0] == other_name.last[0] ):
-            return True
-        if ( self_name.first == other_name.first and len(other_name.last) == 2 
-             and self_name.last[0] == other_name.last[0] ):
-            return True
-        return False
+        return AuthorIndex.names_match(
+            AuthorIndex.parse(self.name), AuthorIndex.parse(other.name)
+        )
 
     def __add__(self, other):
-        self_name = HumanName(self.name)
-        other_name = HumanName(other.name)
-
-        name_attributes = ['first', 'middle', 'last']
-        name_values = [
-            getattr(self_name, attr)
-            if len(getattr(self_name, attr)) >= len(getattr(other_name, attr))
-            else getattr(other_name, attr)
-            for attr in name_attributes
-        ]
-        long_name = " ".join([s for s in name_values if s])
+        long_name = ParsedName.merge(self.name, other.name)
 
         aliases = []
         if self.name != long_name:
@@ -77,19 +56,15 @@ class Author:
             affiliation = self.affiliation if self.affiliation else other.affiliation
         QID = self.QID if self.QID else other.QID
 
-        if QID:
-            item = self.api.item.get(entity_id=QID)
-            item.labels.set(language="en", value=long_name)
-            item.aliases.set(language="en", values=aliases)
-            item.write()
-
-        return Author(self.api,
-                      name=long_name, 
-                      orcid=orcid, 
-                      arxiv_id=arxiv_id,
-                      affiliation=affiliation,
-                      aliases=aliases,
-                      QID=QID)
+        author = Author(self.api,
+                        name=long_name, 
+                        orcid=orcid, 
+                        arxiv_id=arxiv_id,
+                        affiliation=affiliation,
+                        aliases=aliases,
+                        QID=QID)
+        author._relabel = bool(QID)
+        return author
 
     def __repr__(self):
         rep = f'Author: {self.name}, ORCID: {self.orcid}, arXiv: {self.arxiv_id}, QID: {self.QID}, {self.aliases}'
@@ -114,12 +89,23 @@ class Author:
         if self._QID:
             return self._QID
 
-        if not self.orcid:
+        if not self._registry_checked:
+            # Identifiers missing from the registry are not looked up again
+            self._registry_checked = True
+            registry = self.wdi.person_registry
+            QID = registry.get(ORCID, self.orcid) or registry.get(ARXIV_AUTHOR, self.arxiv_id)
+            if QID:
+                self._QID = QID
+                return self._QID
+
+        if not self.orcid or self._orcid_checked:
             return None
-        
+
         results = self.api.search_entity_by_value('wdt:P496', self.orcid)
+        self._orcid_checked = True
         if results:
             self._QID = results[0]
+            self.record_identifiers()
             return self._QID
 
     @QID.setter
@@ -128,18 +114,19 @@ class Author:
 
     @classmethod
     def disambiguate_authors(cls, authors):
-        disambiguated_authors = [authors[0]]
-        for author in authors:
-            if author not in disambiguated_authors:
-                disambiguated_authors.append(author)
-            else:
-                index = disambiguated_authors.index(author)
-                disambiguated_authors[index] += author
+        if authors:
+            OrcidResolver(
+                authors[0].api, registry=authors[0].wdi.person_registry
+            ).resolve_authors(authors)
+        disambiguated_authors = AuthorIndex.disambiguate(authors)
+        changes = AuthorChangeSet(authors[0].api) if authors else None
         for author in disambiguated_authors:
             if not author.QID:
                 author.create()
             else:
-                author.update()
+                author.update(changes)
+        if changes:
+            changes.flush()
         return disambiguated_authors
 
     def pull_QID(self, author_pool):
@@ -174,24 +161,44 @@ class Author:
             self.add_affiliation()
 
         self._QID = self._item.write().id
+        self.record_identifiers()
         return self.QID
 
-    def update(self):
+    def record_identifiers(self):
+        self.wdi.person_registry.record(
+            self._QID, **{ORCID: self.orcid, ARXIV_AUTHOR: self.arxiv_id}
+        )
+
+    def update(self, changes=None):
         if not self.QID: return None
 
-        self._item = self.api.item.get(self.QID)
+        flush = changes is None
+        if flush:
+            changes = AuthorChangeSet(self.api)
+        if self._relabel:
+            changes.relabel(self.QID, self.name, self.aliases)
+            self._relabel = False
         if self.orcid:
-            self._item.add_claim('ORCID iD', self.orcid)
+            changes.add_claim(self.QID, 'ORCID iD', self.orcid)
         if self.arxiv_id:
-            self._item.add_claim("wdt:P4594", self.arxiv_id)
+            changes.add_claim(self.QID, "wdt:P4594", self.arxiv_id)
         if self.affiliation:
-            self.add_affiliation()
-        self._item.write()
+            affiliation_id = self.affiliation_id()
+            if affiliation_id:
+                changes.add_claim(self.QID, "wdt:P108", affiliation_id)
+        if flush:
+            changes.flush()
+        self.record_identifiers()
 
     def add_affiliation(self):
+        affiliation_id = self.affiliation_id()
+        if affiliation_id:
+            self._item.add_claim("wdt:P108", affiliation_id)
+
+    def affiliation_id(self):
         if self.affiliation.startswith('wd:'):
             affiliation_qid = self.affiliation.split(':')[1]
             local_qid = self.wdi.query('local_id', affiliation_qid)
             if not local_qid:
                 local_qid = self.wdi.import_entities(affiliation_qid)
-            self._item.add_claim("wdt:P108", local_qid)
\ No newline at end of file
+            return local_qid
\ No newline at end of file
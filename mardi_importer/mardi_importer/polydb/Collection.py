@@ -1,6 +1,7 @@
-import urllib.request, json, re
+import re
 
 from .Author import Author
+from mardi_importer.utils.HttpClient import HttpClient
 from .ArxivPublication import ArxivPublication
 from .CrossrefPublication import CrossrefPublication
 
@@ -91,8 +92,7 @@ class Collection():
     def setup(self):
         url = f"https://polydb.org/rest/current/collection/{self.label}"
 
-        with urllib.request.urlopen(url) as url:
-            json_data = json.load(url)
+        json_data = HttpClient.get_json(url)
 
         if json_data:
             self.description = json_data.get('description')
@@ -1,9 +1,14 @@
 from mardiclient import MardiClient, MardiItem
 from mardi_importer.wikidata import WikidataImporter
+from mardi_importer.wikidata.PersonRegistry import ARXIV_AUTHOR, ORCID
+from mardi_importer.utils.AuthorChangeSet import AuthorChangeSet
+from mardi_importer.utils.AuthorIndex import AuthorIndex
+from mardi_importer.utils.LocalEntityFetcher import LocalEntityFetcher
+from mardi_importer.utils.OrcidResolver import OrcidResolver
+from mardi_importer.utils.ParsedName import ParsedName
 
 from dataclasses import dataclass, field
 from typing import List
-from nameparser import HumanName
 from nameparser.config import CONSTANTS
 
 CONSTANTS.titles.remove("Mahdi")
@@ -21,6 +26,12 @@ class Author:
     _QID: str = None
     _item: MardiItem = None
     wdi: WikidataImporter = None
+    # Set once the ORCID has been looked up without finding an item
+    _orcid_checked: bool = False
+    # Set once the identifiers have been looked up in the person registry
+    _registry_checked: bool = False
+    # Set by merges; the label and aliases of the item are updated by create()
+    _relabel: bool = False
 
     def __post_init__(self):
         self.name = self.parse_name(self.name)
@@ -29,61 +40,17 @@ class Author:
 
     @staticmethod
     def parse_name(name: str) -> str:
-        parsed_name = HumanName(name)
-        parsed_name.capitalize(force=True)
-        return str(parsed_name)
+        return ParsedName.capitalize(name)
 
     def __eq__(self, other):
         if self.orcid and self.orcid == other.orcid:
             return True
-        self_name = HumanName(self.name)
-        other_name = HumanName(other.name)
-        if self_name.first == other_name.first and self_name.last == other_name.last:
-            return True
-        if self_name.first.lower().replace("-", "") == other_name.first.lower().replace(
-            "-", ""
-        ) and self_name.last.lower().replace(
-            "-", ""
-        ) == other_name.last.lower().replace("-", ""):
-            return True
-        if (
-            len(self_name.first) == 2
-            and self_name.first[0] == other_name.first[0]
-            and self_name.last == other_name.last
-        ):
-            return True
-        if (
-            len(other_name.first) == 2
-            and self_name.first[0] == other_name.first[0]
-            and self_name.last == other_name.last
-        ):
-            return True
-        if (
-            self_name.first == other_name.first
-            and len(self_name.last) == 2
-            and self_name.last[0] == other_name.last[0]
-        ):
-            return True
-        if (
-            self_name.first == other_name.first
-            and len(other_name.last) == 2
-            and self_name.last[0] == other_name.last[0]
-        ):
-            return True
-        return False
+        return AuthorIndex.names_match(
+            AuthorIndex.parse(self.name), AuthorIndex.parse(other.name)
+        )
 
     def __add__(self, other):
-        self_name = HumanName(self.name)
-        other_name = HumanName(other.name)
-
-        name_attributes = ["first", "middle", "last"]
-        name_values = [
-            getattr(self_name, attr)
-            if len(getattr(self_name, attr)) >= len(getattr(other_name, attr))
-            else getattr(other_name, attr)
-            for attr in name_attributes
-        ]
-        long_name = " ".join([s for s in name_values if s])
+        long_name = ParsedName.merge(self.name, other.name)
 
         aliases = []
         if self.name != long_name:
@@ -98,12 +65,6 @@ class Author:
         affiliation = self.affiliation if self.affiliation else other.affiliation
         QID = self.QID if self.QID else other.QID
 
-        if QID:
-            item = self.api.item.get(entity_id=QID)
-            item.labels.set(language="en", value=long_name)
-            item.aliases.set(language="en", values=aliases)
-            item.write()
-
         return Author(
             self.api,
             name=long_name,
@@ -112,6 +73,7 @@ class Author:
             affiliation=affiliation,
             _aliases=aliases,
             _QID=QID,
+            _relabel=bool(QID),
         )
 
     def __repr__(self):
@@ -137,12 +99,23 @@ class Author:
         if self._QID:
             return self._QID
 
-        if not self.orcid:
+        if not self._registry_checked:
+            # Identifiers missing from the registry are not looked up again
+            self._registry_checked = True
+            registry = self.wdi.person_registry
+            QID = registry.get(ORCID, self.orcid) or registry.get(ARXIV_AUTHOR, self.arxiv_id)
+            if QID:
+                self._QID = QID
+                return self._QID
+
+        if not self.orcid or self._orcid_checked:
             return None
 
         results = self.api.search_entity_by_value("wdt:P496", self.orcid)
+        self._orcid_checked = True
         if results:
             self._QID = results[0]
+            self.record_identifiers()
             return self._QID
 
     @classmethod
@@ -150,35 +123,84 @@ class Author:
         # Return empty input immediately
         if not authors:
             return []
-        disambiguated_authors = [authors[0]]
-        for author in authors:
-            if author not in disambiguated_authors:
-                disambiguated_authors.append(author)
-            else:
-                index = disambiguated_authors.index(author)
-                disambiguated_authors[index] += author
+        cls.resolve_orcids(authors)
+        disambiguated_authors = AuthorIndex.disambiguate(authors)
+        changes = AuthorChangeSet(authors[0].api)
         for author in disambiguated_authors:
-            author.create()
+            author.create(changes)
+        changes.flush()
         return disambiguated_authors
 
+    @classmethod
+    def from_items(cls, api, QIDs) -> List["Author"]:
+        """Rebuild the authors of existing author items.
+
+        The items are fetched in bulk, see LocalEntityFetcher.
+
+        Args:
+            api: Client of the local Wikibase
+            QIDs: Local ids of the author items
+
+        Returns:
+            list: One author per item found, in the order of ``QIDs``.
+        """
+        entities = LocalEntityFetcher(api).fetch(QIDs, ["wdt:P496", "wdt:P4594"])
+        authors = []
+        for QID in QIDs:
+            entity = entities.get(QID)
+            if entity is None:
+                continue
+            orcid = entity["claims"]["wdt:P496"]
+            arxiv_id = entity["claims"]["wdt:P4594"]
+            authors.append(
+                cls(
+                    api,
+                    name=str(entity["label"]),
+                    orcid=orcid[0] if orcid else None,
+                    arxiv_id=arxiv_id[0] if arxiv_id else None,
+                    _aliases=entity["aliases"],
+                    _QID=QID,
+                )
+            )
+        return authors
+
+    @staticmethod
+    def resolve_orcids(authors):
+        """Resolve the ORCIDs of a pool of authors in bulk, see OrcidResolver."""
+        if authors:
+            OrcidResolver(
+                authors[0].api, registry=authors[0].wdi.person_registry
+            ).resolve_authors(authors)
+
+    def record_identifiers(self):
+        """Store the identifiers of the author item in the person registry."""
+        self.wdi.person_registry.record(
+            self._QID, **{ORCID: self.orcid, ARXIV_AUTHOR: self.arxiv_id}
+        )
+
     def pull_QID(self, author_pool):
         if self in author_pool:
             index = author_pool.index(self)
             self._QID = author_pool[index].QID
 
-    def create(self):
+    def create(self, changes: AuthorChangeSet = None):
+        """Create the author item, or update the existing one. Edits of an
+        existing item are recorded in ``changes`` if given, else written."""
         if self.QID:
-            # Update orcid and arxiv_id if given
-            if self.orcid or self.arxiv_id:
-                update_item = self.api.item.get(entity_id=self.QID)
-                current_orcid = update_item.get_value("wdt:P496")
-                current_arxiv_id = update_item.get_value("wdt:P4594")
-                if not current_orcid or not current_arxiv_id:
-                    if not current_orcid and self.orcid:
-                        update_item.add_claim("wdt:P496", self.orcid)
-                    if not current_arxiv_id and self.arxiv_id:
-                        update_item.add_claim("wdt:P4594", self.arxiv_id)
-                    update_item.write()
+            flush = changes is None
+            if flush:
+                changes = AuthorChangeSet(self.api)
+            if self._relabel:
+                changes.relabel(self.QID, self.name, self.aliases)
+                self._relabel = False
+            # Add orcid and arxiv_id if given and missing
+            if self.orcid:
+                changes.add_claim(self.QID, "wdt:P496", self.orcid, if_missing=True)
+            if self.arxiv_id:
+                changes.add_claim(self.QID, "wdt:P4594", self.arxiv_id, if_missing=True)
+            if flush:
+                changes.flush()
+            self.record_identifiers()
             return self.QID
 
         teams = {
@@ -217,4 +239,5 @@ class Author:
         self._item.add_claim("MaRDI profile type", "MaRDI person profile")
 
         self._QID = self._item.write().id
+        self.record_identifiers()
         return self.QID
@@ -0,0 +1,96 @@
+from mardi_importer.logger.logging_utils import get_logger_safe
+from mardi_importer.utils.LocalEntityFetcher import LocalEntityFetcher
+
+
+class AuthorChangeSet:
+    """Pending edits of existing author items, combined per item.
+
+    Merging authors relabels the item of the merged author and adding
+    identifiers adds claims to it. Writing each of these edits as it
+    happens edits the same item several times per author pool. The change
+    set collects the edits per QID instead, and :meth:`flush` applies them
+    with a single write per item. Claims only added if missing are checked
+    against the statements of the items first, so that items without
+    other edits are not fetched at all.
+
+    Attributes:
+        api (MardiClient): Client of the local Wikibase.
+    """
+
+    def __init__(self, api):
+        self.log = get_logger_safe(__name__)
+        self.api = api
+        self._changes = {}
+
+    def _change(self, qid: str) -> dict:
+        return self._changes.setdefault(qid, {"label": None, "aliases": None, "claims": []})
+
+    def relabel(self, qid: str, label: str, aliases):
+        """Set the English label and aliases of an item, replacing earlier ones."""
+        change = self._change(qid)
+        change["label"] = label
+        change["aliases"] = list(aliases)
+
+    def add_claim(self, qid: str, prop_nr: str, value, if_missing: bool = False):
+        """Add a claim to an item.
+
+        Args:
+            qid: Item to edit
+            prop_nr: Property of the claim
+            value: Value of the claim
+            if_missing: Only add the claim if the item has no value for the property
+        """
+        self._change(qid)["claims"].append((prop_nr, value, if_missing))
+
+    def flush(self) -> int:
+        """Apply all pending edits, writing each changed item once.
+
+        Returns:
+            int: Number of items written.
+        """
+        written = 0
+        changes, self._changes = self._changes, {}
+        self._drop_present_claims(changes)
+        for qid, change in changes.items():
+            if change["label"] is None and not change["claims"]:
+                continue
+            item = self.api.item.get(entity_id=qid)
+            changed = False
+            if change["label"] is not None:
+                label = item.labels.get("en")
+                aliases = [str(alias) for alias in item.aliases.get("en") or []]
+                if str(label) != change["label"] or aliases != change["aliases"]:
+                    item.labels.set(language="en", value=change["label"])
+                    item.aliases.set(language="en", values=change["aliases"])
+                    changed = True
+            for prop_nr, value, if_missing in change["claims"]:
+                if if_missing and item.get_value(prop_nr):
+                    continue
+                item.add_claim(prop_nr, value)
+                changed = True
+            if changed:
+                item.write()
+                written += 1
+        self.log.debug(f"Wrote {written} of {len(changes)} author items")
+        return written
+
+    def _drop_present_claims(self, changes: dict):
+        """Drop the claims added if missing whose property the item already
+        has, reading only the statements of these properties."""
+        pending = {
+            qid: change for qid, change in changes.items()
+            if any(if_missing for _, _, if_missing in change["claims"])
+        }
+        if not pending:
+            return
+        properties = {
+            prop_nr for change in pending.values()
+            for prop_nr, _, if_missing in change["claims"] if if_missing
+        }
+        present = LocalEntityFetcher(self.api).fetch_claims(pending, properties)
+        for qid, change in pending.items():
+            claims = present.get(qid, {})
+            change["claims"] = [
+                claim for claim in change["claims"]
+                if not (claim[2] and claims.get(claim[0]))
+            ]
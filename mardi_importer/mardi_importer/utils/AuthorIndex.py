@@ -0,0 +1,156 @@
+from collections import defaultdict
+from typing import List, Optional, Tuple
+
+from mardi_importer.utils.ParsedName import ParsedName
+
+
+def _normalize(name_part: str) -> str:
+    return name_part.lower().replace("-", "")
+
+
+class AuthorIndex:
+    """Disambiguation index over a pool of authors.
+
+    Comparing every author with every other one parses both names on each
+    comparison, which is quadratic in the size of the pool. The index
+    parses each name once and groups the authors into blocks that any two
+    matching authors share:
+
+    * the ORCID,
+    * the normalized last name with the initial of the first name,
+    * the first name with the initial of the last name, for last names
+      that are a single initial.
+
+    A new author is only compared with the authors of its blocks, using
+    the rules of :meth:`names_match`.
+
+    Works with any author class providing ``name``, ``orcid`` and merging
+    by ``+``, i.e. :class:`mardi_importer.utils.Author` and
+    :class:`mardi_importer.polydb.Author`.
+
+    Attributes:
+        authors (list): The disambiguated authors, in order of first occurrence.
+    """
+
+    def __init__(self):
+        self.authors = []
+        self._names = []
+        self._by_orcid = defaultdict(set)
+        self._by_last = defaultdict(set)
+        self._by_first = defaultdict(set)
+        self._short_last = defaultdict(set)
+
+    @staticmethod
+    def parse(name: str) -> Tuple[str, str]:
+        """Parse a name into its first and last name."""
+        parsed_name = ParsedName.parse(name)
+        return parsed_name.first, parsed_name.last
+
+    @staticmethod
+    def names_match(name: Tuple[str, str], other: Tuple[str, str]) -> bool:
+        """Check whether two parsed names refer to the same author.
+
+        Names match if first and last name are equal up to case and
+        hyphens, or if one of them is abbreviated to an initial and the
+        rest is equal.
+
+        Args:
+            name: First and last name, see :meth:`parse`
+            other: First and last name, see :meth:`parse`
+        """
+        first, last = name
+        other_first, other_last = other
+        if first == other_first and last == other_last:
+            return True
+        if _normalize(first) == _normalize(other_first) and _normalize(last) == _normalize(other_last):
+            return True
+        if first[:1] and first[:1] == other_first[:1] and last == other_last:
+            if len(first) == 2 or len(other_first) == 2:
+                return True
+        if first == other_first and last[:1] and last[:1] == other_last[:1]:
+            if len(last) == 2 or len(other_last) == 2:
+                return True
+        return False
+
+    def _matches(self, index: int, author, name: Tuple[str, str]) -> bool:
+        if author.orcid and author.orcid == self.authors[index].orcid:
+            return True
+        return self.names_match(name, self._names[index])
+
+    def _candidates(self, author, name: Tuple[str, str]) -> set:
+        first, last = name
+        candidates = set()
+        if author.orcid:
+            candidates |= self._by_orcid[author.orcid]
+        for initial in {first[:1].lower(), _normalize(first)[:1]}:
+            candidates |= self._by_last[(_normalize(last), initial)]
+        candidates |= self._short_last[(first, last[:1])]
+        if len(last) == 2:
+            candidates |= self._by_first[(first, last[:1])]
+        return candidates
+
+    def _index(self, index: int, author, name: Tuple[str, str]):
+        first, last = name
+        if author.orcid:
+            self._by_orcid[author.orcid].add(index)
+        for initial in {first[:1].lower(), _normalize(first)[:1]}:
+            self._by_last[(_normalize(last), initial)].add(index)
+        self._by_first[(first, last[:1])].add(index)
+        if len(last) == 2:
+            self._short_last[(first, last[:1])].add(index)
+
+    def find(self, author, name: Tuple[str, str] = None) -> Optional[int]:
+        """Find the position of the first indexed author matching an author.
+
+        Args:
+            author: Author to look up
+            name: Parsed name of the author, parsed if not given
+
+        Returns:
+            int or None: Position in :attr:`authors`, or None if no author matches.
+        """
+        if name is None:
+            name = self.parse(author.name)
+        for index in sorted(self._candidates(author, name)):
+            if self._matches(index, author, name):
+                return index
+        return None
+
+    def add(self, author):
+        """Add an author, merging it into the first matching author.
+
+        Args:
+            author: Author to add
+
+        Returns:
+            The disambiguated author the given one is now part of.
+        """
+        name = self.parse(author.name)
+        index = self.find(author, name)
+        if index is None:
+            index = len(self.authors)
+            self.authors.append(author)
+            self._names.append(name)
+        else:
+            self.authors[index] += author
+            name = self.parse(self.authors[index].name)
+            self._names[index] = name
+        # Keys of the previous name stay indexed; candidates are always
+        # checked against the current name
+        self._index(index, self.authors[index], name)
+        return self.authors[index]
+
+    @classmethod
+    def disambiguate(cls, authors) -> List:
+        """Merge the authors of a pool that refer to the same person.
+
+        Args:
+            authors: Authors in order of occurrence
+
+        Returns:
+            list: The disambiguated authors
+        """
+        index = cls()
+        for author in authors:
+            index.add(author)
+        return index.authors
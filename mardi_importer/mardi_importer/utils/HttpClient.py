@@ -0,0 +1,150 @@
+import os
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter, Retry
+
+from mardi_importer.logger.logging_utils import get_logger_safe
+
+DEFAULT_TIMEOUT = 60
+DEFAULT_RETRIES = 3
+DEFAULT_POOL_SIZE = 10
+# Responses retried by the connection pools; 429 is left to the callers,
+# which back off according to the API
+RETRY_STATUSES = (502, 503, 504)
+
+
+class HttpClient:
+    """Shared HTTP session for the requests of all sources to external APIs.
+
+    A bare ``requests.get`` opens a new connection, with a new TCP and TLS
+    handshake, for every request. All sources instead send their requests
+    through one ``requests.Session`` per process, which keeps the
+    connections to each host alive in a pool of its own. Failed
+    connections, reads and gateway errors are retried with backoff, and
+    requests without a timeout get the default one.
+
+    Configured by the environment variables ``HTTP_TIMEOUT`` (seconds),
+    ``HTTP_RETRIES`` and ``HTTP_POOL_SIZE`` (connections kept per host).
+
+    The number of requests, errors, new connections and the request
+    latency per host are available from :meth:`stats`.
+    """
+
+    _session = None
+    _lock = threading.Lock()
+    _stats = defaultdict(lambda: {"requests": 0, "errors": 0, "total_time": 0.0, "max_time": 0.0})
+
+    @classmethod
+    def session(cls) -> requests.Session:
+        """Return the shared session, creating it on first use."""
+        with cls._lock:
+            if cls._session is None:
+                retries = int(os.environ.get("HTTP_RETRIES", DEFAULT_RETRIES))
+                pool_size = int(os.environ.get("HTTP_POOL_SIZE", DEFAULT_POOL_SIZE))
+                adapter = HTTPAdapter(
+                    pool_connections=pool_size,
+                    pool_maxsize=pool_size,
+                    max_retries=Retry(
+                        total=retries,
+                        backoff_factor=1,
+                        status_forcelist=RETRY_STATUSES,
+                        raise_on_status=False,
+                    ),
+                )
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                cls._session = session
+            return cls._session
+
+    @classmethod
+    def request(cls, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request through the shared session.
+
+        Args:
+            method: HTTP method
+            url: URL of the request
+            **kwargs: Arguments of ``requests.Session.request``
+
+        Returns:
+            requests.Response: The response, also for error statuses.
+        """
+        kwargs.setdefault("timeout", float(os.environ.get("HTTP_TIMEOUT", DEFAULT_TIMEOUT)))
+        host = urlsplit(url).netloc
+        start = time.perf_counter()
+        failed = True
+        try:
+            response = cls.session().request(method, url, **kwargs)
+            failed = response.status_code >= 400
+            return response
+        finally:
+            elapsed = time.perf_counter() - start
+            with cls._lock:
+                stats = cls._stats[host]
+                stats["requests"] += 1
+                stats["errors"] += failed
+                stats["total_time"] += elapsed
+                stats["max_time"] = max(stats["max_time"], elapsed)
+
+    @classmethod
+    def get(cls, url: str, **kwargs) -> requests.Response:
+        """Send a GET request through the shared session, see :meth:`request`."""
+        return cls.request("GET", url, **kwargs)
+
+    @classmethod
+    def get_json(cls, url: str, **kwargs):
+        """Send a GET request and return the decoded JSON body.
+
+        Raises:
+            requests.HTTPError: If the response has an error status.
+        """
+        response = cls.get(url, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    @classmethod
+    def stats(cls) -> dict:
+        """Return the request statistics per host.
+
+        Returns:
+            dict: For each host the number of ``requests``, of ``errors``
+            (failed requests and error statuses), of ``connections``
+            opened by the pool and the ``mean_time`` and ``max_time`` of a
+            request in seconds.
+        """
+        connections = {}
+        if cls._session is not None:
+            for adapter in set(cls._session.adapters.values()):
+                pools = getattr(getattr(adapter, "poolmanager", None), "pools", None)
+                if pools is None:
+                    continue
+                for key in pools.keys():
+                    pool = pools[key]
+                    host = pool.host if pool.port in (None, 80, 443) else f"{pool.host}:{pool.port}"
+                    connections[host] = connections.get(host, 0) + pool.num_connections
+        with cls._lock:
+            return {
+                host: {
+                    "requests": stats["requests"],
+                    "errors": stats["errors"],
+                    "connections": connections.get(host, 0),
+                    "mean_time": stats["total_time"] / stats["requests"],
+                    "max_time": stats["max_time"],
+                }
+                for host, stats in cls._stats.items()
+            }
+
+    @classmethod
+    def log_stats(cls):
+        """Log the request statistics per host."""
+        log = get_logger_safe(__name__)
+        for host, stats in cls.stats().items():
+            log.info(
+                f"{host}: {stats['requests']} requests, {stats['errors']} errors, "
+                f"{stats['connections']} connections, "
+                f"mean {stats['mean_time']:.3f}s, max {stats['max_time']:.3f}s"
+            )
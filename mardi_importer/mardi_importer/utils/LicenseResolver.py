@@ -0,0 +1,173 @@
+import threading
+
+# Software licenses by the names used in CRAN and OpenML
+SOFTWARE_LICENSES = {
+    "AGPL": "wd:Q28130012",
+    "AGPL-3": "wd:Q27017232",
+    "Apache License": "wd:Q616526",
+    "Apache License 2.0": "wd:Q13785927",
+    "Apache License version 1.1": "wd:Q17817999",
+    "Apache License version 2.0": "wd:Q13785927",
+    "Artistic-2.0": "wd:Q14624826",
+    "Artistic License 2.0": "wd:Q14624826",
+    "BSD 2-clause License": "wd:Q18517294",
+    "BSD 3-clause License": "wd:Q18491847",
+    "BSD_2_clause": "wd:Q18517294",
+    "BSD_3_clause": "wd:Q18491847",
+    "BSL": "wd:Q2353141",
+    "BSL-1.0": "wd:Q2353141",
+    "CC0": "wd:Q6938433",
+    "CC BY 4.0": "wd:Q20007257",
+    "CC BY-SA 4.0": "wd:Q18199165",
+    "CC BY-NC 4.0": "wd:Q34179348",
+    "CC BY-NC-SA 4.0": "wd:Q42553662",
+    "CeCILL": "wd:Q1052189",
+    "CeCILL-2": "wd:Q19216649",
+    "Common Public License Version 1.0": "wd:Q2477807",
+    "CPL-1.0": "wd:Q2477807",
+    "Creative Commons Attribution 4.0 International License": "wd:Q20007257",
+    "EPL": "wd:Q1281977",
+    "EUPL": "wd:Q1376919",
+    "EUPL-1.1": "wd:Q1376919",
+    "FreeBSD": "wd:Q34236",
+    "GNU Affero General Public License": "wd:Q1131681",
+    "GNU General Public License": "wd:Q7603",
+    "GNU General Public License version 2": "wd:Q10513450",
+    "GNU General Public License version 3": "wd:Q10513445",
+    "GPL": "wd:Q7603",
+    "GPL-2": "wd:Q10513450",
+    "GPL-3": "wd:Q10513445",
+    "LGPL": "wd:Q192897",
+    "LGPL-2": "wd:Q23035974",
+    "LGPL-2.1": "wd:Q18534390",
+    "LGPL-3": "wd:Q18534393",
+    "Lucent Public License": "wd:Q6696468",
+    "MIT": "wd:Q334661",
+    "MIT License": "wd:Q334661",
+    "Mozilla Public License 1.1": "wd:Q26737735",
+    "Mozilla Public License 2.0": "wd:Q25428413",
+    "Mozilla Public License Version 2.0": "wd:Q25428413",
+    "MPL": "wd:Q308915",
+    "MPL version 1.0": "wd:Q26737738",
+    "MPL version 1.1": "wd:Q26737735",
+    "MPL version 2.0": "wd:Q25428413",
+    "MPL-1.1": "wd:Q26737735",
+    "MPL-2.0": "wd:Q25428413",
+}
+
+# Software licenses without a Wikidata item, by the label of their local item
+LABELED_LICENSES = {
+    "ACM": "ACM Software License Agreement",
+    "file LICENCE": "File License",
+    "file LICENSE": "File License",
+    "Unlimited": "Unlimited License",
+}
+
+# Licenses by the ids used in Zenodo
+ZENODO_LICENSES = {
+    "cc-by-4.0": "wd:Q20007257",
+    "cc-by-sa-4.0": "wd:Q18199165",
+    "cc-by-nc-sa-4.0": "wd:Q42553662",
+    "mit-license": "wd:Q334661",
+}
+
+# Local license items by the license URLs used in zbMATH Open
+ZBMATH_LICENSES = {
+    "http://arxiv.org/licenses/nonexclusive-distrib/1.0/": "Q6830561",
+    "https://arxiv.org/licenses/nonexclusive-distrib/1.0/": "Q6830561",
+    "https://creativecommons.org": "Q56978",
+    "https://creativecommons.org/": "Q56978",
+    "https://creativecommons.org/Licenses/by-nc-nd/4.0/": "Q6830565",
+    "https://creativecommons.org/Licenses/by/4.0/": "Q57056",
+    "https://creativecommons.org/licences/by/4.0/": "Q57056",
+    "https://creativecommons.org/licenses/": "Q56978",
+    "https://creativecommons.org/licenses/by-nc-by/4.0/": "Q57074",  # malformed, likely CC BY-NC 4.0
+    "https://creativecommons.org/licenses/by-nc-nd/3.0/": "Q6830563",
+    "https://creativecommons.org/licenses/by-nc-nd/4.0/": "Q6830565",
+    "https://creativecommons.org/licenses/by-nc-sa/3.0/": "Q57076",
+    "https://creativecommons.org/licenses/by-nc-sa/4.0/": "Q57078",
+    "https://creativecommons.org/licenses/by-nc/2.0/": "Q6830583",
+    "https://creativecommons.org/licenses/by-nc/2.5/": "Q6830578",  # Q26874140 not in portal
+    "https://creativecommons.org/licenses/by-nc/2/": "Q6830583",  # malformed, likely CC BY-NC 2.0
+    "https://creativecommons.org/licenses/by-nc/3.0/": "Q57072",
+    "https://creativecommons.org/licenses/by-nc/4.0/": "Q57074",
+    "https://creativecommons.org/licenses/by-nd/3.0/": "Q6830595",
+    "https://creativecommons.org/licenses/by-nd/4.0/": "Q6830589",
+    "https://creativecommons.org/licenses/by-sa/3.0/": "Q57029",
+    "https://creativecommons.org/licenses/by-sa/4.0/": "Q57038",
+    "https://creativecommons.org/licenses/by/1.0/": "Q6830600",
+    "https://creativecommons.org/licenses/by/2.0/": "Q6830597",
+    "https://creativecommons.org/licenses/by/2/": "Q6830597",  # malformed, likely CC BY 2.0
+    "https://creativecommons.org/licenses/by/3.0/": "Q57050",
+    "https://creativecommons.org/licenses/by/4.0/": "Q57056",
+    "https://creativecommons.org/licenses/by/4.0/legalcode": "Q57056",
+    "https://creativecommons.org/licenses/by/4/": "Q57056",  # malformed, likely CC BY 4.0
+    "https://creativecommons.org/licenses/by/4:0/": "Q57056",  # malformed, likely CC BY 4.0
+    "https://creativecommons.org/licenses/by/nc/4.0/": "Q57074",  # malformed, likely CC BY-NC 4.0
+    "https://creativecommons.org/licenses/ny/4.0/": "Q57056",  # malformed, likely CC BY 4.0
+    "https://creativecommons.org/publicdomain/mark/1.0/": "Q56990",
+    "https://creativecommons.org/publicdomain/zero/1.0/": "Q56468",
+    "http://creativecommons.org/publicdomain/zero/1.0/": "Q56468",
+    "http://creativecommons.org/licenses/by/4.0/": "Q57056",
+    "http://creativecommons.org/licenses/by/3.0/": "Q57050",
+    "http://creativecommons.org/licenses/by-nc-sa/3.0/": "Q57076",
+    "http://creativecommons.org/licenses/publicdomain/": "Q56990",
+    "http://creativecommons.org/licenses/by-sa/4.0/": "Q57038",
+    "http://creativecommons.org/licenses/by-nc-nd/4.0/": "Q6830565",
+    "http://creativecommons.org/licenses/by-nc-sa/4.0/": "Q57078",
+}
+
+
+class LicenseResolver:
+    """License resolution shared by the CRAN, OpenML, zbMATH and Zenodo importers.
+
+    The license tables are loaded once per process with this module.
+    Licenses identified by the label of a local item (e.g. *File License*)
+    are only searched when a record refers to them, and the result is kept
+    for the rest of the process.
+    """
+
+    _labeled = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def software_license(cls, api, license_str: str):
+        """Return the item of a software license named as in CRAN or OpenML.
+
+        The same license is often denominated using different names (e.g.
+        *Artistic-2.0* and *Artistic License 2.0* both refer to the same
+        license, corresponding to item *Q14624826*).
+
+        Args:
+            api (MardiClient): Client used to search labeled licenses
+            license_str: Name of the license
+
+        Returns:
+            str or None: Wikidata id with ``wd:`` prefix or local QID, or
+            None if the license is unknown.
+        """
+        if license_str in SOFTWARE_LICENSES:
+            return SOFTWARE_LICENSES[license_str]
+        label = LABELED_LICENSES.get(license_str)
+        if not label:
+            return None
+        with cls._lock:
+            if label in cls._labeled:
+                return cls._labeled[label]
+        license_item = api.item.new()
+        license_item.labels.set(language="en", value=label)
+        QID = license_item.is_instance_of("wd:Q207621")
+        if QID:
+            with cls._lock:
+                cls._labeled[label] = QID
+        return QID
+
+    @staticmethod
+    def zenodo_license(license_id: str):
+        """Return the Wikidata id of a license identified as in Zenodo."""
+        return ZENODO_LICENSES.get(license_id)
+
+    @staticmethod
+    def zbmath_license(url: str):
+        """Return the local QID of a license identified by its URL in zbMATH Open."""
+        return ZBMATH_LICENSES.get(url)
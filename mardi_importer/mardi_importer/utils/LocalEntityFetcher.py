@@ -0,0 +1,202 @@
+import os
+from typing import Dict, Iterable, List
+
+from wikibaseintegrator import wbi_helpers
+
+from mardi_importer.logger.logging_utils import get_logger_safe
+
+# Maximum number of ids per wbgetentities request
+WBGETENTITIES_LIMIT = 50
+# Number of entities whose statements are read per SPARQL query
+SPARQL_BATCH_SIZE = 100
+XSD_DATETIME = "http://www.w3.org/2001/XMLSchema#dateTime"
+
+
+class LocalEntityFetcher:
+    """Fetches parts of entities of the local Wikibase.
+
+    ``api.item.get`` requests one complete entity per call. Rebuilding the
+    authors of an existing publication that way takes one request per
+    author. :meth:`fetch` requests up to 50 entities per ``wbgetentities``
+    call and keeps only the English label, the English aliases and the
+    values of the requested properties.
+
+    Checks that only read a property or two (e.g. the last update of a
+    package) use :meth:`fetch_claims`, which downloads only the statements
+    of the requested properties.
+
+    Attributes:
+        api (MardiClient): Client of the local Wikibase.
+    """
+
+    def __init__(self, api):
+        self.log = get_logger_safe(__name__)
+        self.api = api
+
+    def fetch(self, entity_ids: Iterable[str], properties: Iterable[str] = ()) -> Dict[str, dict]:
+        """Fetch the label, aliases and selected claims of local entities.
+
+        Args:
+            entity_ids: Local ids (Q or P prefix)
+            properties: Properties whose values are returned, as local ids
+                or in any form accepted by ``api.get_local_id_by_label``,
+                e.g. ``"wdt:P496"``
+
+        Returns:
+            dict: ``{entity_id: {"label": str, "aliases": list, "claims": dict}}``
+            keyed by the requested ids, also for redirected entities; the
+            claims map each requested property, as given, to its list of
+            values. Missing entities are left out.
+        """
+        entity_ids = list(dict.fromkeys(entity_ids))
+        local_props = {
+            prop: self.api.get_local_id_by_label(prop, "property") for prop in properties
+        }
+        entities = {}
+        for start in range(0, len(entity_ids), WBGETENTITIES_LIMIT):
+            chunk = entity_ids[start:start + WBGETENTITIES_LIMIT]
+            response = self._call({
+                "action": "wbgetentities",
+                "ids": "|".join(chunk),
+                "props": "labels|aliases|claims" if local_props else "labels|aliases",
+                "languages": "en",
+            })
+            for entity_id, entity_json in response.get("entities", {}).items():
+                if "missing" in entity_json:
+                    continue
+                entities[entity_id] = {
+                    "label": entity_json.get("labels", {}).get("en", {}).get("value"),
+                    "aliases": [
+                        alias["value"] for alias in entity_json.get("aliases", {}).get("en", [])
+                    ],
+                    "claims": {
+                        prop: self._claim_values(entity_json, local_prop)
+                        for prop, local_prop in local_props.items()
+                    },
+                }
+        self.log.debug(f"Fetched {len(entities)} of {len(entity_ids)} local entities")
+        return entities
+
+    def fetch_claims(self, entity_ids: Iterable[str], properties: Iterable[str]) -> Dict[str, dict]:
+        """Fetch the values of selected properties of local entities.
+
+        A single entity is read with one ``wbgetclaims`` request per
+        property, filtered by the API. The statements of several entities
+        are projected with SPARQL queries on the local query service, 100
+        entities per query. If the query service is not configured or
+        cannot be queried, each entity is read with ``wbgetclaims``.
+
+        Values read by SPARQL are those of the best rank, and the query
+        service may lag behind recent edits, so callers writing statements
+        still have to check the item they edit.
+
+        Args:
+            entity_ids: Local ids (Q or P prefix)
+            properties: Properties as accepted by :meth:`fetch`
+
+        Returns:
+            dict: ``{entity_id: {property: [values]}}`` for all requested
+            entities, with the properties as given. Values are given as by
+            ``MardiItem.get_value``, e.g. ids for items and
+            ``+YYYY-MM-DDT00:00:00Z`` strings for dates.
+        """
+        entity_ids = list(dict.fromkeys(entity_ids))
+        local_props = {
+            prop: self.api.get_local_id_by_label(prop, "property") for prop in properties
+        }
+        if len(entity_ids) > 1:
+            entities = self._query_claims(entity_ids, local_props)
+            if entities is not None:
+                return entities
+        entities = {}
+        for entity_id in entity_ids:
+            claims = {}
+            for prop, local_prop in local_props.items():
+                response = self._call({
+                    "action": "wbgetclaims",
+                    "entity": entity_id,
+                    "property": local_prop,
+                })
+                claims[prop] = self._claim_values(response, local_prop)
+            entities[entity_id] = claims
+        return entities
+
+    def _query_claims(self, entity_ids: List[str], local_props: dict):
+        """Project the values of the given properties with SPARQL.
+
+        Returns:
+            dict or None: As :meth:`fetch_claims`, or None if the query
+            service is not configured or cannot be queried.
+        """
+        endpoint = os.environ.get("SPARQL_ENDPOINT_URL")
+        if not endpoint or not local_props:
+            return None
+        by_local_prop = {}
+        for prop, local_prop in local_props.items():
+            by_local_prop.setdefault(local_prop, []).append(prop)
+        entities = {
+            entity_id: {prop: [] for prop in local_props} for entity_id in entity_ids
+        }
+        props = " ".join(f"wdt:{local_prop}" for local_prop in by_local_prop)
+        try:
+            for start in range(0, len(entity_ids), SPARQL_BATCH_SIZE):
+                batch = entity_ids[start:start + SPARQL_BATCH_SIZE]
+                items = " ".join(f"wd:{entity_id}" for entity_id in batch)
+                query = (
+                    "SELECT ?entity ?prop ?value WHERE { "
+                    f"VALUES ?entity {{ {items} }} "
+                    f"VALUES ?prop {{ {props} }} "
+                    "?entity ?prop ?value . "
+                    "FILTER(!isBLANK(?value)) }"
+                )
+                results = wbi_helpers.execute_sparql_query(
+                    query=query, endpoint=endpoint, max_retries=3, retry_after=10
+                )
+                for binding in results["results"]["bindings"]:
+                    entity_id = binding["entity"]["value"].rsplit("/", 1)[-1]
+                    local_prop = binding["prop"]["value"].rsplit("/", 1)[-1]
+                    value = self._sparql_value(binding["value"])
+                    if entity_id not in entities or value is None:
+                        continue
+                    for prop in by_local_prop.get(local_prop, ()):
+                        entities[entity_id][prop].append(value)
+        except Exception as e:
+            self.log.warning(f"Reading statements with SPARQL failed: {e}")
+            return None
+        return entities
+
+    @staticmethod
+    def _sparql_value(binding: dict):
+        value = binding["value"]
+        if binding.get("type") == "uri":
+            if "/.well-known/genid/" in value:
+                # Unknown value
+                return None
+            return value.rsplit("/", 1)[-1]
+        if binding.get("datatype") == XSD_DATETIME and value[:1] not in "+-":
+            return f"+{value}"
+        return value
+
+    def _call(self, data: dict) -> dict:
+        return wbi_helpers.mediawiki_api_call_helper(
+            data={**data, "format": "json"},
+            login=self.api.login,
+            mediawiki_api_url=os.environ.get("MEDIAWIKI_API_URL"),
+            allow_anonymous=True,
+        )
+
+    @staticmethod
+    def _claim_values(entity_json: dict, prop_nr: str) -> List:
+        values = []
+        for claim in entity_json.get("claims", {}).get(prop_nr, []):
+            mainsnak = claim.get("mainsnak", {})
+            if mainsnak.get("snaktype") != "value":
+                continue
+            value = mainsnak["datavalue"]["value"]
+            if isinstance(value, dict):
+                for key in ("id", "time", "amount", "text"):
+                    if key in value:
+                        value = value[key]
+                        break
+            values.append(value)
+        return values
@@ -0,0 +1,116 @@
+import json
+import os
+from typing import Dict, Iterable, Optional
+
+from wikibaseintegrator import wbi_helpers
+
+from mardi_importer.logger.logging_utils import get_logger_safe
+from mardi_importer.wikidata.PersonRegistry import ORCID
+
+# Number of ORCIDs resolved per SPARQL query
+BATCH_SIZE = 200
+
+
+class OrcidResolver:
+    """Resolves the ORCIDs of a pool of authors to local items in bulk.
+
+    Accessing ``Author.QID`` searches the local Wikibase for the ORCID of
+    the author, one request per author. The resolver instead collects the
+    unresolved ORCIDs of all authors of a pool (e.g. the authors of a CRAN
+    package or of a batch of publications), looks them up in the person
+    registry and resolves the remaining ones with batched SPARQL queries
+    against the local query service.
+
+    Authors whose ORCID is not found are marked as checked, so that
+    ``Author.QID`` does not search for them again.
+
+    Attributes:
+        api (MardiClient): Client of the local Wikibase.
+        registry (PersonRegistry): Registry of resolved person identifiers,
+            optional.
+    """
+
+    def __init__(self, api, registry=None):
+        self.log = get_logger_safe(__name__)
+        self.api = api
+        self.registry = registry
+
+    def resolve(self, orcids: Iterable[str]) -> Optional[Dict[str, str]]:
+        """Look up the local items of several ORCIDs.
+
+        Args:
+            orcids: ORCID iDs
+
+        Returns:
+            dict or None: Local QID by ORCID for the ORCIDs found, or None
+            if the query service is not configured or cannot be queried.
+        """
+        endpoint = os.environ.get("SPARQL_ENDPOINT_URL")
+        if not endpoint:
+            return None
+        orcids = list(dict.fromkeys(orcids))
+        found = {}
+        if not orcids:
+            return found
+        try:
+            orcid_prop = self.api.get_local_id_by_label("wdt:P496", "property")
+            for start in range(0, len(orcids), BATCH_SIZE):
+                batch = orcids[start:start + BATCH_SIZE]
+                values = " ".join(json.dumps(orcid) for orcid in batch)
+                query = (
+                    "SELECT ?item ?orcid WHERE { "
+                    f"VALUES ?orcid {{ {values} }} "
+                    f"?item wdt:{orcid_prop} ?orcid . }}"
+                )
+                results = wbi_helpers.execute_sparql_query(
+                    query=query, endpoint=endpoint, max_retries=3, retry_after=10
+                )
+                for binding in results["results"]["bindings"]:
+                    qid = binding["item"]["value"].rsplit("/", 1)[-1]
+                    orcid = binding["orcid"]["value"]
+                    # Prefer the oldest item if an ORCID is used more than once
+                    if orcid not in found or int(qid[1:]) < int(found[orcid][1:]):
+                        found[orcid] = qid
+        except Exception as e:
+            self.log.warning(f"Resolving ORCIDs in bulk failed: {e}")
+            return None
+        return found
+
+    def resolve_authors(self, authors) -> int:
+        """Fill the QID of all authors with an ORCID and no QID yet.
+
+        Args:
+            authors: Authors of a pool; both ``mardi_importer.utils.Author``
+                and ``mardi_importer.polydb.Author`` are supported
+
+        Returns:
+            int: Number of authors whose QID was found.
+        """
+        pending = [
+            author for author in authors
+            if author.orcid and not author._QID and not author._orcid_checked
+        ]
+        if not pending:
+            return 0
+        found = {}
+        if self.registry is not None:
+            found = self.registry.get_many(ORCID, [author.orcid for author in pending])
+        unknown = [author.orcid for author in pending if author.orcid not in found]
+        if unknown:
+            resolved_orcids = self.resolve(unknown)
+            if resolved_orcids is None:
+                # Left to the per-author search of Author.QID
+                pending = [author for author in pending if author.orcid in found]
+            else:
+                if self.registry is not None:
+                    for orcid, qid in resolved_orcids.items():
+                        self.registry.record(qid, **{ORCID: orcid})
+                found.update(resolved_orcids)
+        resolved = 0
+        for author in pending:
+            author._orcid_checked = True
+            if author.orcid in found:
+                author._QID = found[author.orcid]
+                resolved += 1
+        self.log.debug(f"Resolved {resolved} of {len(pending)} ORCIDs in bulk")
+        return resolved
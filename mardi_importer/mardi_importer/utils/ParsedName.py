@@ -0,0 +1,73 @@
+from functools import lru_cache
+from typing import NamedTuple
+
+from nameparser import HumanName
+
+# Number of distinct name strings kept in each memo
+NAME_CACHE_SIZE = 20000
+
+
+class ParsedName(NamedTuple):
+    """First, middle and last name of a person name.
+
+    Building a ``nameparser.HumanName`` is expensive, and author
+    normalization parses the same strings over and over: on construction,
+    on each comparison and on each merge of two authors. Parsed and
+    capitalized names are therefore memoized in bounded LRU caches; the
+    parsed names are kept as immutable tuples, so cached results cannot be
+    modified by their users.
+
+    Use :meth:`parse`, :meth:`capitalize` and :meth:`merge` instead of
+    ``HumanName`` in author classes.
+    """
+
+    first: str
+    middle: str
+    last: str
+
+    @staticmethod
+    def parse(name: str) -> "ParsedName":
+        """Parse a name into first, middle and last name."""
+        return _parse(name)
+
+    @staticmethod
+    def capitalize(name: str) -> str:
+        """Normalize a name to its full, capitalized form."""
+        return _capitalize(name)
+
+    @staticmethod
+    def merge(name: str, other: str) -> str:
+        """Combine the longest first, middle and last name of two names.
+
+        Args:
+            name: Name of an author
+            other: Name of the same author, e.g. with abbreviated first name
+
+        Returns:
+            str: The combined name
+        """
+        parsed, other_parsed = _parse(name), _parse(other)
+        parts = [
+            part if len(part) >= len(other_part) else other_part
+            for part, other_part in zip(parsed, other_parsed)
+        ]
+        return " ".join(part for part in parts if part)
+
+    @staticmethod
+    def cache_clear():
+        """Empty the memoized names."""
+        _parse.cache_clear()
+        _capitalize.cache_clear()
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def _parse(name: str) -> ParsedName:
+    parsed_name = HumanName(name)
+    return ParsedName(parsed_name.first, parsed_name.middle, parsed_name.last)
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def _capitalize(name: str) -> str:
+    parsed_name = HumanName(name)
+    parsed_name.capitalize(force=True)
+    return str(parsed_name)
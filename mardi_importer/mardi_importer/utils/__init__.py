@@ -15,7 +15,7 @@ to resolve to the *module* instead of the class (leading to
 from importlib import import_module
 from typing import Any
 
-__all__ = ["Author"]
+__all__ = ["Author", "AuthorIndex", "HttpClient", "ParsedName"]
 
 
 def __getattr__(name: str) -> Any:
@@ -32,4 +32,10 @@ def __getattr__(name: str) -> Any:
     """
     if name == "Author":
         return import_module("mardi_importer.utils.Author").Author
+    if name == "AuthorIndex":
+        return import_module("mardi_importer.utils.AuthorIndex").AuthorIndex
+    if name == "HttpClient":
+        return import_module("mardi_importer.utils.HttpClient").HttpClient
+    if name == "ParsedName":
+        return import_module("mardi_importer.utils.ParsedName").ParsedName
     raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,176 @@
+import gzip
+import json
+import os
+import threading
+import time
+
+from mardi_importer.logger.logging_utils import get_logger_safe
+
+# Defaults for the size bound and the time entries are used without
+# checking their revision against Wikidata
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+DEFAULT_MAX_AGE = 3600
+# Eviction removes the oldest entries until the cache is below this share
+# of its size bound
+EVICTION_TARGET = 0.8
+SUFFIX = ".json.gz"
+
+
+class EntityCache:
+    """On-disk cache of raw Wikidata entity JSON shared by all importer
+    processes of a node.
+
+    Entries are addressed by entity id, revision id and variant, i.e. the
+    requested languages and whether the claims are included, and stored as
+    ``<directory>/<shard>/<id>/<lastrevid>-<variant>.json.gz``. Since an
+    entry never changes once written, processes can read, write and evict
+    concurrently without locking: files are written to a temporary name and
+    moved into place, and entries removed by another process are treated
+    as misses.
+
+    The modification time of an entry is the time its revision was last
+    known to be current. Entries younger than ``max_age`` are used as they
+    are; older ones have to be revalidated by the caller (see
+    :meth:`lookup` and :meth:`touch`). When the cache grows beyond
+    ``max_bytes``, the least recently validated entries are removed.
+
+    Attributes:
+        directory (str): Cache directory.
+        max_bytes (int): Size bound of the cache.
+        max_age (int): Seconds entries are used without revalidation.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_age: int = DEFAULT_MAX_AGE):
+        self.log = get_logger_safe(__name__)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._size = None
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _entity_dir(self, wikidata_id: str) -> str:
+        return os.path.join(self.directory, wikidata_id[-2:], wikidata_id)
+
+    def lookup(self, wikidata_id: str, variants):
+        """Find the newest cached revision of an entity.
+
+        Args:
+            wikidata_id: Wikidata id (Q or P prefix)
+            variants: Acceptable variants, see :meth:`store`
+
+        Returns:
+            tuple or None: ``(lastrevid, path, age)`` with the age of the
+            entry in seconds, or None if no entry exists.
+        """
+        try:
+            names = os.listdir(self._entity_dir(wikidata_id))
+        except FileNotFoundError:
+            return None
+        best = None
+        for name in names:
+            if not name.endswith(SUFFIX):
+                continue
+            revision, _, variant = name[:-len(SUFFIX)].partition("-")
+            if variant not in variants or not revision.isdigit():
+                continue
+            if best is None or int(revision) > best[0]:
+                best = (int(revision), name)
+        if best is None:
+            return None
+        path = os.path.join(self._entity_dir(wikidata_id), best[1])
+        try:
+            age = time.time() - os.path.getmtime(path)
+        except FileNotFoundError:
+            return None
+        return best[0], path, age
+
+    def read(self, path: str):
+        """Read an entry found with :meth:`lookup`.
+
+        Returns:
+            dict or None: The entity JSON, or None if the entry has been
+            evicted in the meantime.
+        """
+        try:
+            with gzip.open(path, "rt") as f:
+                return json.load(f)
+        except (FileNotFoundError, EOFError, OSError, ValueError):
+            return None
+
+    def touch(self, path: str):
+        """Mark an entry as validated against the current revision."""
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+    def store(self, wikidata_id: str, variant: str, entity_json: dict):
+        """Store the JSON of an entity under its current revision.
+
+        Args:
+            wikidata_id: Requested Wikidata id (the entity may be a redirect
+                target with a different id)
+            variant: Languages and parts contained in the JSON, e.g.
+                ``claims-de.en.mul``
+            entity_json: Raw entity JSON as returned by Wikidata
+        """
+        lastrevid = entity_json.get("lastrevid")
+        if not lastrevid:
+            return
+        entity_dir = self._entity_dir(wikidata_id)
+        path = os.path.join(entity_dir, f"{lastrevid}-{variant}{SUFFIX}")
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(entity_dir, exist_ok=True)
+            with gzip.open(tmp_path, "wt", compresslevel=3) as f:
+                json.dump(entity_json, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+            size = os.path.getsize(path)
+        except OSError as e:
+            self.log.warning(f"Could not cache Wikidata entity {wikidata_id}: {e}")
+            return
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan()[1]
+            else:
+                self._size += size
+            evict = self._size > self.max_bytes
+        if evict:
+            self.evict()
+
+    def _scan(self):
+        """List all entries with their modification time and size."""
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+        return entries, total
+
+    def evict(self):
+        """Remove the least recently validated entries until the cache is
+        below its size bound."""
+        entries, total = self._scan()
+        target = self.max_bytes * EVICTION_TARGET
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        with self._lock:
+            self._size = total
+        self.log.debug(f"Evicted {removed} entries from the Wikidata entity cache")
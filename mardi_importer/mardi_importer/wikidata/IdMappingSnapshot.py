@@ -0,0 +1,262 @@
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+
+import sqlalchemy as db
+
+from mardi_importer.logger.logging_utils import get_logger_safe
+
+# Header: magic/version, number of rows, highest row id of the mapping table
+# that is contained in the snapshot (used for incremental refreshes).
+HEADER = struct.Struct("<8sQQ")
+MAGIC = b"MRDIMAP1"
+TABLES = ("items", "properties")
+
+
+class _MappedTable:
+    """Sorted, memory-mapped arrays of a single mapping table.
+
+    The file consists of the header followed by three arrays of equal
+    length: the numeric Wikidata ids (sorted, int64), the corresponding
+    numeric local ids (int64) and the has_all_claims flags (uint8).
+    """
+
+    def __init__(self, path: str):
+        self.count = 0
+        self.last_row_id = 0
+        self._mm = None
+        self._views = []
+        self.keys = self.values = self.flags = ()
+        if not os.path.isfile(path) or os.path.getsize(path) < HEADER.size:
+            return
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, self.last_row_id = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an id mapping snapshot")
+        view = memoryview(self._mm)
+        start = HEADER.size
+        size = 8 * self.count
+        self.keys = view[start:start + size].cast("q")
+        self.values = view[start + size:start + 2 * size].cast("q")
+        self.flags = view[start + 2 * size:start + 2 * size + self.count]
+        self._views = [self.keys, self.values, self.flags, view]
+
+    def get(self, wikidata_num: int):
+        pos = bisect_left(self.keys, wikidata_num)
+        if pos < self.count and self.keys[pos] == wikidata_num:
+            return self.values[pos], bool(self.flags[pos])
+        return None
+
+    def items(self):
+        for pos in range(self.count):
+            yield self.keys[pos], (self.values[pos], bool(self.flags[pos]))
+
+    def close(self):
+        if self._mm is not None:
+            self.keys = self.values = self.flags = ()
+            for view in self._views:
+                view.release()
+            self._views = []
+            self._mm.close()
+            self._mm = None
+
+
+class IdMappingSnapshot:
+    """Read-only snapshot of the Wikidata -> local id mapping tables.
+
+    The ``items`` and ``properties`` tables of the importer DB are exported
+    into one file each, holding sorted integer arrays that are memory-mapped
+    on load. Loading costs a few milliseconds regardless of the size of the
+    tables, and lookups are a binary search instead of a DB round trip.
+
+    Rows inserted into the tables after the export are pulled in with
+    :meth:`refresh`, and writes done by this process are recorded with
+    :meth:`record`; both are kept in an in-memory overlay that takes
+    precedence over the mapped arrays. :meth:`save` merges the overlay
+    into new snapshot files.
+
+    Since mappings are never removed and ``has_all_claims`` only ever
+    changes from False to True, a hit in the snapshot can be trusted,
+    whereas a miss or a False flag has to be confirmed against the DB.
+
+    Attributes:
+        directory (str): Directory containing the snapshot files.
+    """
+
+    def __init__(self, directory: str):
+        self.log = get_logger_safe(__name__)
+        self.directory = directory
+        self._tables = {}
+        self._overlay = {table: {} for table in TABLES}
+        self._last_row_id = {}
+        self._load()
+
+    def _path(self, table: str) -> str:
+        return os.path.join(self.directory, f"{table}.snapshot")
+
+    def _load(self):
+        for table in TABLES:
+            mapped = _MappedTable(self._path(table))
+            self._tables[table] = mapped
+            self._last_row_id[table] = mapped.last_row_id
+
+    @property
+    def is_empty(self) -> bool:
+        return not any(mapped.count for mapped in self._tables.values())
+
+    @property
+    def overlay_size(self) -> int:
+        """Number of mappings held in memory on top of the snapshot files."""
+        return sum(len(overlay) for overlay in self._overlay.values())
+
+    @staticmethod
+    def _split(wikidata_id: str):
+        table = "properties" if wikidata_id.startswith("P") else "items"
+        return table, int(wikidata_id[1:])
+
+    def get(self, wikidata_id: str):
+        """Look up a Wikidata id.
+
+        Args:
+            wikidata_id: Wikidata id (Q or P prefix)
+
+        Returns:
+            tuple or None: ``(local_id, has_all_claims)`` with a prefixed
+            local id, or None if the id is not contained in the snapshot.
+        """
+        table, num = self._split(wikidata_id)
+        result = self._overlay[table].get(num)
+        if result is None:
+            result = self._tables[table].get(num)
+            if result is None:
+                return None
+        return f"{wikidata_id[0]}{result[0]}", result[1]
+
+    def record(self, wikidata_id: str, local_id: str = None, has_all_claims: bool = False):
+        """Record a write made to the mapping tables by this process.
+
+        Args:
+            wikidata_id: Wikidata id (Q or P prefix)
+            local_id: Local id; if None, the already known local id is kept
+                and only has_all_claims is updated.
+            has_all_claims: Whether the entity has been imported with all claims
+        """
+        table, num = self._split(wikidata_id)
+        if local_id is None:
+            known = self.get(wikidata_id)
+            if known is None:
+                return
+            local_id = known[0]
+        self._overlay[table][num] = (int(local_id[1:]), bool(has_all_claims))
+
+    def refresh(self, engine):
+        """Pull rows inserted into the mapping tables since the last refresh.
+
+        Args:
+            engine: SQLAlchemy engine of the importer DB
+        """
+        new_rows = 0
+        for table, rows in self._read_tables(engine, self._last_row_id).items():
+            for row_id, wikidata_num, local_num, has_all_claims in rows:
+                self._overlay[table][wikidata_num] = (local_num, bool(has_all_claims))
+                self._last_row_id[table] = max(self._last_row_id[table], row_id)
+                new_rows += 1
+        self.log.debug(f"Refreshed id mapping snapshot with {new_rows} new rows")
+
+    @staticmethod
+    def _read_tables(engine, after=None):
+        """Read the mapping tables, optionally only rows with a higher row id.
+
+        Returns:
+            dict: ``{table: [(row_id, wikidata_id, local_id, has_all_claims)]}``
+        """
+        result = {}
+        with engine.connect() as connection:
+            for table_name in TABLES:
+                table = db.Table(table_name, db.MetaData(), autoload_with=engine)
+                sql = db.select(
+                    table.c.id,
+                    table.c.wikidata_id,
+                    table.c.local_id,
+                    table.c.has_all_claims,
+                )
+                if after and after.get(table_name):
+                    sql = sql.where(table.c.id > after[table_name])
+                result[table_name] = [
+                    tuple(row)
+                    for row in connection.execution_options(
+                        stream_results=True
+                    ).execute(sql)
+                ]
+        return result
+
+    @classmethod
+    def write(cls, directory: str, tables: dict):
+        """Write snapshot files from mapping rows.
+
+        Args:
+            directory: Target directory
+            tables: ``{table: iterable of (row_id, wikidata_id, local_id,
+                has_all_claims)}`` with numeric ids
+
+        Returns:
+            IdMappingSnapshot: The loaded snapshot.
+        """
+        os.makedirs(directory, exist_ok=True)
+        for table in TABLES:
+            rows = {}
+            last_row_id = 0
+            for row_id, wikidata_num, local_num, has_all_claims in tables.get(table, ()):
+                rows[wikidata_num] = (local_num, has_all_claims)
+                last_row_id = max(last_row_id, row_id)
+
+            keys = array("q", sorted(rows))
+            values = array("q", (rows[k][0] for k in keys))
+            flags = array("B", (1 if rows[k][1] else 0 for k in keys))
+
+            path = os.path.join(directory, f"{table}.snapshot")
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(HEADER.pack(MAGIC, len(keys), last_row_id))
+                keys.tofile(f)
+                values.tofile(f)
+                flags.tofile(f)
+            # Processes that mapped the old file keep reading it until reload
+            os.replace(tmp_path, path)
+        return cls(directory)
+
+    @classmethod
+    def export(cls, engine, directory: str):
+        """Export the mapping tables of the importer DB into a new snapshot.
+
+        Args:
+            engine: SQLAlchemy engine of the importer DB
+            directory: Target directory
+
+        Returns:
+            IdMappingSnapshot: The loaded snapshot.
+        """
+        return cls.write(directory, cls._read_tables(engine))
+
+    def save(self):
+        """Merge the overlay into new snapshot files and reload them."""
+        tables = {}
+        for table in TABLES:
+            rows = dict(self._tables[table].items())
+            rows.update(self._overlay[table])
+            last_row_id = self._last_row_id[table]
+            tables[table] = [
+                (last_row_id, wikidata_num, local_num, has_all_claims)
+                for wikidata_num, (local_num, has_all_claims) in rows.items()
+            ]
+        self.close()
+        IdMappingSnapshot.write(self.directory, tables)
+        self._overlay = {table: {} for table in TABLES}
+        self._load()
+
+    def close(self):
+        for mapped in self._tables.values():
+            mapped.close()
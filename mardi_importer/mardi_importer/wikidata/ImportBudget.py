@@ -0,0 +1,154 @@
+import os
+from dataclasses import dataclass, field
+from typing import Optional, Set
+
+# Reasons for which claims or claim values are skipped
+PROPERTY_NOT_ALLOWED = "property_not_allowed"
+CLAIM_LIMIT = "claim_limit"
+DEPENDENCY_BUDGET = "dependency_budget"
+
+
+@dataclass
+class ImportProfile:
+    """Limits applied when importing an entity from Wikidata with its claims.
+
+    Every claim value that is not mapped yet becomes a new local entity,
+    so heavily-linked entities (countries, universities, ...) can pull in
+    hundreds of entities the portal never uses. A profile restricts which
+    properties are imported, how many claims per property are kept and
+    how many new entities a single import may create.
+
+    Attributes:
+        name: Name of the profile
+        allowed_properties: Wikidata properties to import; None imports all
+        denied_properties: Wikidata properties never imported
+        max_new_dependencies: Maximum number of entities newly imported for
+            the claims of a single entity; None for no limit
+        max_claims_per_property: Maximum number of claims kept per property;
+            None for no limit
+    """
+
+    name: str
+    allowed_properties: Optional[Set[str]] = None
+    denied_properties: Set[str] = field(default_factory=set)
+    max_new_dependencies: Optional[int] = None
+    max_claims_per_property: Optional[int] = None
+
+    def allows_property(self, prop_id: str) -> bool:
+        if prop_id in self.denied_properties:
+            return False
+        return self.allowed_properties is None or prop_id in self.allowed_properties
+
+    @classmethod
+    def from_env(cls):
+        """Build the profile selected by ``WIKIDATA_IMPORT_PROFILE``.
+
+        Single limits of the profile can be overridden with
+        ``WIKIDATA_PROPERTY_ALLOWLIST``, ``WIKIDATA_PROPERTY_DENYLIST``
+        (comma-separated property ids), ``WIKIDATA_MAX_NEW_DEPENDENCIES``
+        and ``WIKIDATA_MAX_CLAIMS_PER_PROPERTY``.
+
+        Returns:
+            ImportProfile
+        """
+        name = os.environ.get("WIKIDATA_IMPORT_PROFILE", "full")
+        if name not in PROFILES:
+            raise ValueError(
+                f"Unknown Wikidata import profile {name}, expected one of {sorted(PROFILES)}"
+            )
+        base = PROFILES[name]
+        profile = cls(
+            name=name,
+            allowed_properties=base.allowed_properties,
+            denied_properties=set(base.denied_properties),
+            max_new_dependencies=base.max_new_dependencies,
+            max_claims_per_property=base.max_claims_per_property,
+        )
+
+        allowlist = os.environ.get("WIKIDATA_PROPERTY_ALLOWLIST")
+        if allowlist:
+            profile.allowed_properties = _split_ids(allowlist)
+        denylist = os.environ.get("WIKIDATA_PROPERTY_DENYLIST")
+        if denylist:
+            profile.denied_properties |= _split_ids(denylist)
+        max_new_dependencies = os.environ.get("WIKIDATA_MAX_NEW_DEPENDENCIES")
+        if max_new_dependencies:
+            profile.max_new_dependencies = int(max_new_dependencies)
+        max_claims = os.environ.get("WIKIDATA_MAX_CLAIMS_PER_PROPERTY")
+        if max_claims:
+            profile.max_claims_per_property = int(max_claims)
+        return profile
+
+
+def _split_ids(value: str) -> Set[str]:
+    return {wikidata_id.strip() for wikidata_id in value.split(",") if wikidata_id.strip()}
+
+
+PROFILES = {
+    # No limits, all claims are imported
+    "full": ImportProfile(name="full"),
+    # Bounded imports for synchronous requests
+    "compact": ImportProfile(
+        name="compact",
+        denied_properties={
+            "P47",  # shares border with
+            "P150",  # contains the administrative territorial entity
+            "P190",  # twinned administrative body
+            "P527",  # has part(s)
+            "P530",  # diplomatic relation
+            "P1343",  # described by source
+            "P2860",  # cites work
+            "P2936",  # language used
+        },
+        max_new_dependencies=100,
+        max_claims_per_property=20,
+    ),
+}
+
+
+class ImportBudget:
+    """Tracks the limits of an :class:`ImportProfile` during a single import.
+
+    Attributes:
+        profile (ImportProfile): The applied limits.
+        new_dependencies (int): Number of new entities fetched so far.
+        skipped (dict): ``{reason: {wikidata_id: count}}`` of the skipped
+            claims; for the dependency budget, the id of the value that
+            was not imported.
+    """
+
+    def __init__(self, profile: ImportProfile):
+        self.profile = profile
+        self.new_dependencies = 0
+        self.skipped = {}
+
+    def reserve_dependency(self, wikidata_id: str) -> bool:
+        """Account for a new entity to be fetched and imported.
+
+        Args:
+            wikidata_id: Wikidata id of the entity
+
+        Returns:
+            True if the entity can be imported, False if the budget is used up.
+        """
+        limit = self.profile.max_new_dependencies
+        if limit is not None and self.new_dependencies >= limit:
+            self.skip(wikidata_id, DEPENDENCY_BUDGET)
+            return False
+        self.new_dependencies += 1
+        return True
+
+    def limit_claims(self, prop_id: str, claim_list: list) -> list:
+        """Cut a list of claims to the maximum number of claims per property."""
+        limit = self.profile.max_claims_per_property
+        if limit is not None and len(claim_list) > limit:
+            self.skip(prop_id, CLAIM_LIMIT, len(claim_list) - limit)
+            return claim_list[:limit]
+        return claim_list
+
+    def skip(self, wikidata_id: str, reason: str, count: int = 1):
+        skipped = self.skipped.setdefault(reason, {})
+        skipped[wikidata_id] = skipped.get(wikidata_id, 0) + count
+
+    def report(self) -> dict:
+        return {reason: dict(skipped) for reason, skipped in self.skipped.items()}
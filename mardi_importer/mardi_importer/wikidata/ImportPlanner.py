@@ -0,0 +1,159 @@
+from mardi_importer.logger.logging_utils import get_logger_safe
+
+ENTITY_DATATYPES = ("wikibase-item", "wikibase-property")
+
+
+class ImportPlanner:
+    """Plans the import of a batch of Wikidata entities as a whole.
+
+    Importing entities one by one checks and fetches the dependencies
+    shared between them (properties, classes, units, ...) again for every
+    entity. The planner instead fetches all requested entities at once,
+    expands their dependencies once for the whole batch and imports them
+    in phases:
+
+    1. properties used in claims, qualifiers and references,
+    2. label-only value items (claim values, qualifier values, units),
+    3. the requested entities with all their claims.
+
+    Phases 1 and 2 are run by :meth:`prepare` with bulk requests to
+    Wikidata. Phase 3 is left to :meth:`WikidataImporter.import_entities`,
+    called once per requested entity so that callers can keep reporting a
+    status per entity; since all dependencies are already mapped and the
+    requested entities are prefetched, those calls no longer hit Wikidata
+    for anything but writes.
+
+    Attributes:
+        wdi (WikidataImporter): Importer used to fetch and create entities.
+    """
+
+    def __init__(self, wdi):
+        self.log = get_logger_safe(__name__)
+        self.wdi = wdi
+
+    def plan(self, id_list):
+        """Compute the import phases for a batch of Wikidata ids.
+
+        Args:
+            id_list: List of Wikidata ids (Q or P prefix)
+
+        Returns:
+            dict: ``{"properties": [...], "items": [...], "entities": [...]}``
+            holding the dependencies that are not mapped yet and the
+            requested entities that still need to be imported.
+        """
+        requested = []
+        for wikidata_id in dict.fromkeys(id_list):
+            if wikidata_id[:1] not in ("Q", "P"):
+                continue
+            if not self.wdi.query("has_all_claims", wikidata_id):
+                requested.append(wikidata_id)
+
+        # Known redirects are fetched under their target, known unimportable
+        # ids not at all
+        to_fetch = [self.wdi.resolve_cached_id(wikidata_id) for wikidata_id in requested]
+        entities = self.wdi.prefetch_entities([i for i in to_fetch if i])
+
+        entity_dependencies = {
+            wikidata_id: self.collect_dependencies(entity_json)
+            for wikidata_id, entity_json in entities.items()
+        }
+        mapped = set(requested)
+        mapped |= set(self.wdi.query_local_ids(set().union(*entity_dependencies.values())))
+
+        # Entities exceeding the dependency budget of the import profile are
+        # left to the per-entity import, which applies the budget in claim order
+        max_new = self.wdi.import_profile.max_new_dependencies
+        dependencies = set()
+        for wikidata_id, entity_deps in entity_dependencies.items():
+            new_deps = entity_deps - mapped
+            if max_new is not None and len(new_deps) > max_new:
+                self.log.info(
+                    f"{wikidata_id} depends on {len(new_deps)} new entities, "
+                    f"more than the budget of {max_new}"
+                )
+                continue
+            dependencies |= new_deps
+        dependencies = {
+            dependency for dependency in dependencies
+            if self.wdi.resolve_cached_id(dependency) == dependency
+        }
+
+        return {
+            "properties": sorted(d for d in dependencies if d.startswith("P")),
+            "items": sorted(d for d in dependencies if d.startswith("Q")),
+            "entities": requested,
+        }
+
+    def prepare(self, id_list):
+        """Import the dependencies of a batch of Wikidata ids in bulk.
+
+        Args:
+            id_list: List of Wikidata ids (Q or P prefix)
+
+        Returns:
+            dict: The executed plan, see :meth:`plan`.
+        """
+        plan = self.plan(id_list)
+        self.log.info(
+            f"Batch of {len(plan['entities'])} entities depends on "
+            f"{len(plan['properties'])} new properties and "
+            f"{len(plan['items'])} new items"
+        )
+        for phase in ("properties", "items"):
+            self.wdi.prefetch_entities(plan[phase], recurse=False)
+            for wikidata_id in plan[phase]:
+                try:
+                    self.wdi._import_claim_entities(wikidata_id)
+                except Exception as e:
+                    # Left to the per-entity import, which reports the error
+                    self.log.warning(f"Importing dependency {wikidata_id} failed: {e}")
+        return plan
+
+    def collect_dependencies(self, entity_json):
+        """Collect the ids of all entities referenced by the claims of an entity.
+
+        Mirrors the conversion done by :meth:`WikidataImporter._convert_claim_ids`:
+        properties of claims, qualifiers and references, their entity
+        values and the units of quantities, restricted to the properties and
+        number of claims allowed by the import profile.
+
+        Args:
+            entity_json: Raw Wikidata JSON of an entity
+
+        Returns:
+            set: Wikidata ids
+        """
+        profile = self.wdi.import_profile
+        dependencies = set()
+        for prop_id, claim_list in entity_json.get("claims", {}).items():
+            if prop_id in self.wdi.excluded_properties:
+                continue
+            if not profile.allows_property(prop_id):
+                continue
+            dependencies.add(prop_id)
+            for claim in claim_list[:profile.max_claims_per_property]:
+                snaks = [claim.get("mainsnak", {})]
+                for qualifier_snaks in claim.get("qualifiers", {}).values():
+                    snaks.extend(qualifier_snaks)
+                for reference in claim.get("references", []):
+                    for reference_snaks in reference.get("snaks", {}).values():
+                        snaks.extend(reference_snaks)
+                for snak in snaks:
+                    dependencies |= self._snak_dependencies(snak)
+        return dependencies
+
+    def _snak_dependencies(self, snak):
+        dependencies = set()
+        if "property" in snak:
+            dependencies.add(snak["property"])
+        datatype = snak.get("datatype")
+        value = snak.get("datavalue", {}).get("value")
+        if not value or datatype in self.wdi.excluded_datatypes:
+            return dependencies
+        if datatype in ENTITY_DATATYPES and isinstance(value, dict):
+            if value.get("id"):
+                dependencies.add(value["id"])
+        elif datatype == "quantity" and "www.wikidata.org/" in value.get("unit", ""):
+            dependencies.add(value["unit"].split("/")[-1])
+        return dependencies
@@ -0,0 +1,141 @@
+import threading
+import time
+
+import sqlalchemy as db
+from sqlalchemy.dialects.mysql import insert
+
+from mardi_importer.logger.logging_utils import get_logger_safe
+
+TABLE_NAME = "person_identifiers"
+# Identifier schemes
+ORCID = "orcid"
+ARXIV_AUTHOR = "arxiv_author"
+ZBMATH_AUTHOR = "zbmath_author"
+
+
+class PersonRegistry:
+    """Persistent mapping of person identifiers to local QIDs.
+
+    Each source resolves the people it imports by its own identifier:
+    ORCID iDs for Crossref, CRAN, Zenodo and polyDB authors, arXiv author
+    ids for arXiv authors and zbMATH author codes for zbMATH authors. The
+    registry stores every identifier that was resolved to or written on an
+    author item in the ``person_identifiers`` table of the importer DB, so
+    that every source, worker and later run finds the person without
+    searching the Wikibase again.
+
+    Sources consult the registry before searching and record the
+    identifiers of each author item they find, create or enrich.
+    Identifiers that were not found are not stored, since another source
+    may create the person at any time.
+
+    Attributes:
+        engine: SQLAlchemy engine of the importer DB
+    """
+
+    def __init__(self, engine):
+        self.log = get_logger_safe(__name__)
+        self.engine = engine
+        self._table = None
+        self._known = {}
+        self._lock = threading.Lock()
+
+    def create_table(self):
+        """Create the registry table in the importer DB if it does not exist."""
+        if db.inspect(self.engine).has_table(TABLE_NAME):
+            return
+        metadata = db.MetaData()
+        db.Table(
+            TABLE_NAME,
+            metadata,
+            db.Column("scheme", db.String(16), primary_key=True),
+            db.Column("identifier", db.String(128), primary_key=True),
+            db.Column("qid", db.String(32), nullable=False),
+            db.Column("updated_at", db.BigInteger, nullable=False),
+        )
+        metadata.create_all(self.engine)
+
+    def _get_table(self):
+        if self._table is None:
+            self._table = db.Table(TABLE_NAME, db.MetaData(), autoload_with=self.engine)
+        return self._table
+
+    def get(self, scheme: str, identifier: str):
+        """Look up the QID of a person identifier.
+
+        Args:
+            scheme: One of ``ORCID``, ``ARXIV_AUTHOR`` or ``ZBMATH_AUTHOR``
+            identifier: Identifier of the person
+
+        Returns:
+            str or None: Local QID, or None if the identifier is unknown.
+        """
+        if not identifier:
+            return None
+        return self.get_many(scheme, [identifier]).get(identifier)
+
+    def get_many(self, scheme: str, identifiers) -> dict:
+        """Look up the QIDs of several identifiers of a scheme at once.
+
+        Returns:
+            dict: QID by identifier for the known identifiers.
+        """
+        identifiers = [i for i in dict.fromkeys(identifiers) if i]
+        found = {}
+        with self._lock:
+            for identifier in identifiers:
+                if (scheme, identifier) in self._known:
+                    found[identifier] = self._known[(scheme, identifier)]
+        missing = [i for i in identifiers if i not in found]
+        if not missing:
+            return found
+
+        table = self._get_table()
+        sql = db.select(table.c.identifier, table.c.qid).where(
+            table.c.scheme == scheme, table.c.identifier.in_(missing)
+        )
+        with self.engine.connect() as connection:
+            rows = connection.execute(sql).fetchall()
+        with self._lock:
+            for identifier, qid in rows:
+                self._known[(scheme, identifier)] = qid
+                found[identifier] = qid
+        return found
+
+    def record(self, qid: str, **identifiers):
+        """Store the identifiers of a person item.
+
+        Args:
+            qid: Local QID of the person
+            **identifiers: Identifiers by scheme, e.g. ``orcid="0000-..."``;
+                empty values are skipped
+        """
+        identifiers = {
+            scheme: identifier for scheme, identifier in identifiers.items()
+            if identifier and self._known.get((scheme, identifier)) != qid
+        }
+        if not qid or not identifiers:
+            return
+        table = self._get_table()
+        updated_at = int(time.time())
+        # One upsert, so that workers recording the same person concurrently
+        # do not conflict
+        upsert = insert(table).values([
+            {"scheme": scheme, "identifier": identifier, "qid": qid, "updated_at": updated_at}
+            for scheme, identifier in identifiers.items()
+        ])
+        upsert = upsert.on_duplicate_key_update(
+            qid=upsert.inserted.qid,
+            updated_at=upsert.inserted.updated_at,
+        )
+        try:
+            with self.engine.connect() as connection:
+                connection.execute(upsert)
+                connection.commit()
+        except db.exc.SQLAlchemyError as e:
+            # The registry only saves searches, the person is still imported
+            self.log.warning(f"Could not store the identifiers of {qid} in the person registry: {e}")
+            return
+        with self._lock:
+            for scheme, identifier in identifiers.items():
+                self._known[(scheme, identifier)] = qid
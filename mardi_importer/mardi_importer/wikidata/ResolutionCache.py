@@ -0,0 +1,130 @@
+import time
+
+import sqlalchemy as db
+from sqlalchemy.dialects.mysql import insert
+
+from mardi_importer.logger.logging_utils import get_logger_safe
+
+TABLE_NAME = "resolution_cache"
+# Reasons why a Wikidata id does not resolve to an importable entity
+NO_LABELS = "no_labels"
+REDIRECT = "redirect"
+EXCLUDED_DATATYPE = "excluded_datatype"
+# Entries are re-checked against Wikidata after 30 days by default
+DEFAULT_TTL = 30 * 24 * 3600
+
+
+class ResolutionCache:
+    """Persistent cache of Wikidata ids that do not resolve to an entity
+    of their own.
+
+    Covers entities without labels in the configured languages (or that
+    do not exist anymore), redirected ids together with their target and
+    properties of excluded datatypes. Such ids are never stored in the
+    mapping tables, so without this cache they are fetched from Wikidata
+    again every time they are referenced.
+
+    Entries are stored in the ``resolution_cache`` table of the importer
+    DB, next to the mapping tables, and loaded into memory on first use.
+    Entries older than ``ttl`` seconds are ignored, so that entities that
+    gained labels or redirects that were undone are picked up again.
+
+    Attributes:
+        engine: SQLAlchemy engine of the importer DB
+        ttl (int): Time to live of the entries in seconds
+    """
+
+    def __init__(self, engine, ttl: int = DEFAULT_TTL):
+        self.log = get_logger_safe(__name__)
+        self.engine = engine
+        self.ttl = ttl
+        self._entries = None
+        self._table = None
+
+    def create_table(self):
+        """Create the cache table in the importer DB if it does not exist."""
+        if db.inspect(self.engine).has_table(TABLE_NAME):
+            return
+        metadata = db.MetaData()
+        db.Table(
+            TABLE_NAME,
+            metadata,
+            db.Column("wikidata_id", db.String(32), primary_key=True),
+            db.Column("reason", db.String(32), nullable=False),
+            db.Column("target", db.String(32), nullable=True),
+            db.Column("checked_at", db.BigInteger, nullable=False),
+        )
+        metadata.create_all(self.engine)
+
+    def _get_table(self):
+        if self._table is None:
+            self._table = db.Table(TABLE_NAME, db.MetaData(), autoload_with=self.engine)
+        return self._table
+
+    def _load(self):
+        """Load all entries that have not expired yet."""
+        table = self._get_table()
+        sql = db.select(
+            table.c.wikidata_id, table.c.reason, table.c.target, table.c.checked_at
+        ).where(table.c.checked_at >= int(time.time()) - self.ttl)
+        entries = {}
+        with self.engine.connect() as connection:
+            for wikidata_id, reason, target, checked_at in connection.execute(sql):
+                entries[wikidata_id] = (reason, target, checked_at)
+        self._entries = entries
+        self.log.debug(f"Loaded {len(entries)} entries of the resolution cache")
+
+    def get(self, wikidata_id: str):
+        """Look up a Wikidata id.
+
+        Args:
+            wikidata_id: Wikidata id (Q or P prefix)
+
+        Returns:
+            tuple or None: ``(reason, target)``, where target is the
+            redirect target for redirects and None otherwise, or None if
+            the id is not cached or the entry has expired.
+        """
+        if self._entries is None:
+            self._load()
+        entry = self._entries.get(wikidata_id)
+        if entry is None:
+            return None
+        reason, target, checked_at = entry
+        if checked_at < time.time() - self.ttl:
+            return None
+        return reason, target
+
+    def record(self, wikidata_id: str, reason: str, target: str = None):
+        """Store that a Wikidata id does not resolve to an entity of its own.
+
+        Args:
+            wikidata_id: Wikidata id (Q or P prefix)
+            reason: One of ``NO_LABELS``, ``REDIRECT`` or ``EXCLUDED_DATATYPE``
+            target: Target id of a redirect
+        """
+        checked_at = int(time.time())
+        table = self._get_table()
+        # Replaces expired entries and entries written by other processes
+        # in one statement, so that concurrent workers do not conflict
+        upsert = insert(table).values(
+            wikidata_id=wikidata_id,
+            reason=reason,
+            target=target,
+            checked_at=checked_at,
+        )
+        upsert = upsert.on_duplicate_key_update(
+            reason=upsert.inserted.reason,
+            target=upsert.inserted.target,
+            checked_at=upsert.inserted.checked_at,
+        )
+        try:
+            with self.engine.connect() as connection:
+                connection.execute(upsert)
+                connection.commit()
+        except db.exc.SQLAlchemyError as e:
+            # The import does not depend on the cache, the id is only
+            # resolved again by the next process
+            self.log.warning(f"Could not store {wikidata_id} in the resolution cache: {e}")
+        if self._entries is not None:
+            self._entries[wikidata_id] = (reason, target, checked_at)
@@ -0,0 +1,226 @@
+import json
+import mmap
+import os
+import re
+import struct
+import threading
+from array import array
+from bisect import bisect_left
+
+from mardi_importer.logger.logging_utils import get_logger_safe
+
+# Entity ids appear right at the start of every line in Wikidata dumps,
+# e.g. {"type":"item","id":"Q42",...}, so a regex on the line head avoids
+# parsing the whole entity while building the index.
+ENTITY_ID_PATTERN = re.compile(rb'"id"\s*:\s*"([QP]\d+)"')
+INDEX_SUFFIX = ".idx"
+COMPRESSED_SUFFIXES = (".bz2", ".gz")
+# Header: magic/version and number of indexed entities
+HEADER = struct.Struct("<8sQ")
+MAGIC = b"MRDIDMP1"
+
+
+def _index_key(entity_id: str) -> int:
+    """Numeric key of an entity id; items and properties are interleaved."""
+    return 2 * int(entity_id[1:]) + (entity_id[0] == "P")
+
+
+class _DumpIndex:
+    """Sorted, memory-mapped ``id -> offset`` index of a dump.
+
+    The file consists of the header followed by two arrays of equal
+    length: the keys of the entity ids (sorted, int64) and the byte
+    offsets of their lines in the dump (int64).
+    """
+
+    def __init__(self, path: str):
+        self._mm = None
+        self._views = []
+        self.keys = self.offsets = ()
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < HEADER.size:
+                raise ValueError(f"{path} is not a Wikidata dump index")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count = HEADER.unpack_from(self._mm, 0)
+        size = 8 * self.count
+        if magic != MAGIC or len(self._mm) != HEADER.size + 2 * size:
+            self.close()
+            raise ValueError(f"{path} is not a Wikidata dump index")
+        view = memoryview(self._mm)
+        start = HEADER.size
+        self.keys = view[start:start + size].cast("q")
+        self.offsets = view[start + size:start + 2 * size].cast("q")
+        self._views = [self.keys, self.offsets, view]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def get(self, entity_id: str):
+        key = _index_key(entity_id)
+        pos = bisect_left(self.keys, key)
+        if pos < self.count and self.keys[pos] == key:
+            return self.offsets[pos]
+        return None
+
+    @staticmethod
+    def write(path: str, offsets: dict):
+        """Write an index file from a ``{key: offset}`` mapping."""
+        keys = array("q", sorted(offsets))
+        values = array("q", (offsets[key] for key in keys))
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(keys)))
+            keys.tofile(f)
+            values.tofile(f)
+        os.replace(tmp_path, path)
+
+    def close(self):
+        if self._mm is not None:
+            self.keys = self.offsets = ()
+            for view in self._views:
+                view.release()
+            self._views = []
+            self._mm.close()
+            self._mm = None
+
+
+class WikidataDumpReader:
+    """Random access to entities stored in a local Wikidata JSON dump.
+
+    Supports the official ``latest-all.json`` dumps as well as pre-filtered
+    slices. The file is expected to contain one entity per line (the
+    surrounding ``[``/``]`` lines and trailing commas of the official dumps
+    are tolerated). Compressed dumps are rejected: they cannot be read at
+    an offset without decompressing everything before it, so they have to
+    be decompressed beforehand (e.g. ``lbzip2 -d latest-all.json.bz2``).
+
+    On first use the dump is streamed once to build an ``id -> offset``
+    index, which is stored next to the dump (``<dump>.idx``) as sorted
+    arrays and reused by later processes as long as the dump has not been
+    modified. The index is memory-mapped, so loading it takes the same
+    time regardless of the size of the dump, and a lookup is a binary
+    search followed by a single read at the offset.
+
+    Attributes:
+        path (str): Path to the dump file.
+    """
+
+    def __init__(self, path: str):
+        if path.endswith(COMPRESSED_SUFFIXES):
+            raise ValueError(
+                f"Compressed Wikidata dumps are not supported, "
+                f"decompress {path} first"
+            )
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"Wikidata dump not found: {path}")
+        self.log = get_logger_safe(__name__)
+        self.path = path
+        self._index = None
+        self._handle = None
+        self._lock = threading.Lock()
+
+    def _open(self):
+        return open(self.path, "rb")
+
+    @property
+    def index_path(self) -> str:
+        return self.path + INDEX_SUFFIX
+
+    def _load_index(self) -> bool:
+        """Load a previously stored index if it is not older than the dump.
+
+        Returns:
+            True if the index could be loaded, False otherwise.
+        """
+        if not os.path.isfile(self.index_path):
+            return False
+        if os.path.getmtime(self.index_path) < os.path.getmtime(self.path):
+            return False
+        try:
+            self._index = _DumpIndex(self.index_path)
+        except ValueError as e:
+            self.log.warning(f"Rebuilding dump index: {e}")
+            return False
+        return True
+
+    def build_index(self) -> _DumpIndex:
+        """Load the ``id -> offset`` index, streaming the dump once to
+        build it if there is no up-to-date index next to the dump.
+
+        Returns:
+            The memory-mapped index.
+        """
+        with self._lock:
+            if self._index is not None:
+                return self._index
+            if self._load_index():
+                self.log.debug(
+                    f"Loaded index with {len(self._index)} entities for {self.path}"
+                )
+                return self._index
+
+            self.log.info(f"Building entity index for Wikidata dump {self.path}")
+            offsets = {}
+            with self._open() as f:
+                offset = 0
+                for line in f:
+                    match = ENTITY_ID_PATTERN.search(line, 0, 256)
+                    if match:
+                        offsets[_index_key(match.group(1).decode())] = offset
+                    offset += len(line)
+            _DumpIndex.write(self.index_path, offsets)
+            self._index = _DumpIndex(self.index_path)
+            self.log.info(f"Indexed {len(self._index)} entities in {self.path}")
+            return self._index
+
+    def __contains__(self, entity_id: str) -> bool:
+        return self.build_index().get(entity_id) is not None
+
+    @staticmethod
+    def _parse_line(line: bytes):
+        line = line.strip()
+        if line.endswith(b","):
+            line = line[:-1]
+        if not line or line in (b"[", b"]"):
+            return None
+        return json.loads(line)
+
+    def get(self, entity_id: str):
+        """Return the raw JSON of an entity from the dump.
+
+        Args:
+            entity_id: Wikidata ID (Q or P prefix).
+
+        Returns:
+            dict or None: The entity JSON, or None if it is not in the dump.
+        """
+        offset = self.build_index().get(entity_id)
+        if offset is None:
+            return None
+        with self._lock:
+            if self._handle is None:
+                self._handle = self._open()
+            self._handle.seek(offset)
+            line = self._handle.readline()
+        return self._parse_line(line)
+
+    def iter_entities(self):
+        """Stream all entities of the dump in file order.
+
+        Yields:
+            dict: The JSON of each entity.
+        """
+        with self._open() as f:
+            for line in f:
+                entity = self._parse_line(line)
+                if entity is not None:
+                    yield entity
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+            if self._index is not None:
+                self._index.close()
+                self._index = None
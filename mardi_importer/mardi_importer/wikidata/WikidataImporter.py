@@ -1,11 +1,18 @@
+import copy
+import functools
 import os
+from contextlib import contextmanager
 import requests
 import sqlalchemy as db
 import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 
 from mardiclient import MardiClient
 from wikibaseintegrator.models import Claim, Claims, Qualifiers, Reference, Sitelinks
+from wikibaseintegrator import wbi_helpers
 from wikibaseintegrator.wbi_config import config as wbi_config
 from wikibaseintegrator.wbi_enums import ActionIfExists
 from wikibaseintegrator.datatypes import (
@@ -29,15 +36,74 @@ from wikibaseintegrator.datatypes import (
 )
 
 from mardi_importer.logger.logging_utils import get_logger_safe
+from mardi_importer.wikidata.EntityCache import (
+    DEFAULT_MAX_AGE,
+    DEFAULT_MAX_BYTES,
+    EntityCache,
+)
+from mardi_importer.wikidata.IdMappingSnapshot import IdMappingSnapshot
+from mardi_importer.wikidata.ImportBudget import (
+    PROPERTY_NOT_ALLOWED,
+    ImportBudget,
+    ImportProfile,
+)
+from mardi_importer.wikidata.ImportPlanner import ImportPlanner
+from mardi_importer.wikidata.PersonRegistry import PersonRegistry
+from mardi_importer.wikidata.ResolutionCache import (
+    DEFAULT_TTL,
+    EXCLUDED_DATATYPE,
+    NO_LABELS,
+    REDIRECT,
+    ResolutionCache,
+)
+from mardi_importer.wikidata.WikidataDumpReader import WikidataDumpReader
 from wikibaseintegrator.wbi_exceptions import ModificationFailed
 from wikibaseintegrator.wbi_login import LoginError
 
 WIKIDATA_API_URL = "https://www.wikidata.org/w/api.php"
+# Maximum number of ids per wbgetentities request
+WBGETENTITIES_LIMIT = 50
+# Defaults for concurrent entity fetches in update_entities
+DEFAULT_FETCH_WORKERS = 4
+DEFAULT_REQUEST_TIMEOUT = 60
+# Retries of failed connections of requests with a timeout, and seconds
+# between them; the helper's defaults retry for hours
+FETCH_MAX_RETRIES = 3
+FETCH_RETRY_AFTER = 5
+# Seconds to wait for another worker creating the same entity
+DEFAULT_LOCK_TIMEOUT = 300
+# Mappings read on top of the id snapshot before it is written anew
+DEFAULT_SNAPSHOT_MAX_OVERLAY = 100000
+
+
+def _import_call(method):
+    """Mark a public import method of WikidataImporter.
+
+    Each call that is not nested in another import call of the same thread
+    starts with an empty ``skipped_claims`` report, so that the reports do
+    not accumulate in long-running workers.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        state = self._import_state
+        depth = getattr(state, "depth", 0)
+        if depth == 0:
+            state.skipped_claims = {}
+        state.depth = depth + 1
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            state.depth = depth
+    return wrapper
 
 
 class WikidataImporter:
     _instance = None
     _initialized = False
+    _executor = None
+    _executor_lock = threading.Lock()
+    # Per-thread state of the current import call, see _import_call
+    _import_state = threading.local()
 
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
@@ -82,8 +148,26 @@ class WikidataImporter:
         """Initialize database connections and Wikidata-specific configurations."""
         self.engine = self._create_engine()
         self.mw_engine = self._create_engine(mediawiki=True)
+        self._tables = {}
         self.create_db_table()
 
+        # Ids that do not resolve to an importable entity of their own
+        self.resolution_cache = ResolutionCache(
+            self.engine,
+            ttl=int(os.environ.get("WIKIDATA_RESOLUTION_CACHE_TTL", DEFAULT_TTL)),
+        )
+        self.resolution_cache.create_table()
+
+        # Person identifiers resolved by any source
+        self.person_registry = PersonRegistry(self.engine)
+        self.person_registry.create_table()
+
+        # Optional memory-mapped snapshot of the id mapping tables
+        self.id_snapshot = None
+        snapshot_dir = os.environ.get("WIKIDATA_ID_SNAPSHOT_DIR")
+        if snapshot_dir:
+            self.load_id_snapshot(snapshot_dir)
+
         # local id of properties for linking to wikidata PID/QID
         self.wikidata_PID = self._init_wikidata_PID()
         self.wikidata_QID = self._init_wikidata_QID()
@@ -113,6 +197,64 @@ class WikidataImporter:
             "entity-schema",
         ]
 
+        # Limits for importing entities with their claims
+        self.import_profile = ImportProfile.from_env()
+        # Concurrency limit and per-request timeout for Wikidata fetches
+        self.fetch_workers = int(
+            os.environ.get("WIKIDATA_FETCH_WORKERS", DEFAULT_FETCH_WORKERS)
+        )
+        self.request_timeout = int(
+            os.environ.get("WIKIDATA_REQUEST_TIMEOUT", DEFAULT_REQUEST_TIMEOUT)
+        )
+
+        # Wait for entities being created by other workers
+        self.lock_timeout = int(
+            os.environ.get("WIKIDATA_LOCK_TIMEOUT", DEFAULT_LOCK_TIMEOUT)
+        )
+
+        # Raw entity JSON fetched in bulk for the current batch
+        self._prefetched = {}
+
+        # Optional on-disk cache of entity JSON shared by the processes of a node
+        self.entity_cache = None
+        cache_dir = os.environ.get("WIKIDATA_ENTITY_CACHE_DIR")
+        if cache_dir:
+            self.entity_cache = EntityCache(
+                cache_dir,
+                max_bytes=int(
+                    os.environ.get("WIKIDATA_ENTITY_CACHE_MAX_MB", DEFAULT_MAX_BYTES // 2**20)
+                ) * 2**20,
+                max_age=int(
+                    os.environ.get("WIKIDATA_ENTITY_CACHE_MAX_AGE", DEFAULT_MAX_AGE)
+                ),
+            )
+
+        # Optional local dump used instead of the Wikidata API
+        self.dump = None
+        dump_path = os.environ.get("WIKIDATA_DUMP_PATH")
+        if dump_path:
+            self.use_dump(dump_path)
+
+    def use_dump(self, path):
+        """Read entities from a local Wikidata JSON dump instead of the API.
+
+        Entities that are not contained in the dump (e.g. when using a
+        pre-filtered slice) are still retrieved from the Wikidata API.
+
+        Args:
+            path: Path to an uncompressed ``.json`` dump with one entity
+                per line. ``None`` disables dump usage.
+
+        Raises:
+            ValueError: If the dump is compressed.
+        """
+        if self.dump is not None:
+            self.dump.close()
+            self.dump = None
+        if path:
+            self.log.info(f"Using local Wikidata dump {path} as entity source")
+            self.dump = WikidataDumpReader(path)
+
     def _create_engine(self, mediawiki=False):
         """
         Creates SQLalchemy engine
@@ -138,6 +280,54 @@ class WikidataImporter:
                 pool_recycle=1800,
             )
 
+    def _get_executor(self):
+        """Return the thread pool shared by all Wikidata fetches of the process."""
+        with WikidataImporter._executor_lock:
+            if WikidataImporter._executor is None:
+                WikidataImporter._executor = ThreadPoolExecutor(
+                    max_workers=self.fetch_workers,
+                    thread_name_prefix="wikidata-fetch",
+                )
+        return WikidataImporter._executor
+
+    def load_id_snapshot(self, directory):
+        """Serve id lookups from a memory-mapped snapshot of the mapping tables.
+
+        The snapshot is exported from the importer DB if the directory does
+        not contain one yet; otherwise it is loaded and refreshed with the
+        rows inserted since it was written. Once more than
+        ``WIKIDATA_ID_SNAPSHOT_MAX_OVERLAY`` rows have to be refreshed, the
+        merged mappings are written to new snapshot files, so that later
+        processes do not read them from the DB again.
+
+        Args:
+            directory: Directory of the snapshot files
+        """
+        snapshot = IdMappingSnapshot(directory)
+        if snapshot.is_empty:
+            self.log.info(f"Exporting id mapping snapshot to {directory}")
+            snapshot.close()
+            snapshot = IdMappingSnapshot.export(self.engine, directory)
+        else:
+            snapshot.refresh(self.engine)
+            max_overlay = int(
+                os.environ.get("WIKIDATA_ID_SNAPSHOT_MAX_OVERLAY", DEFAULT_SNAPSHOT_MAX_OVERLAY)
+            )
+            if snapshot.overlay_size > max_overlay:
+                self.log.info(
+                    f"Saving id mapping snapshot with {snapshot.overlay_size} new rows to {directory}"
+                )
+                snapshot.save()
+        self.id_snapshot = snapshot
+
+    def _get_table(self, table_name):
+        """Return the reflected mapping table, reflecting it only once."""
+        table = self._tables.get(table_name)
+        if table is None:
+            table = db.Table(table_name, db.MetaData(), autoload_with=self.engine)
+            self._tables[table_name] = table
+        return table
+
     def create_id_list_from_file(self, file):
         """Function for creating a list of ids
         from a while where each id is in a new line
@@ -174,12 +364,20 @@ class WikidataImporter:
                             "id", db.Integer, primary_key=True, autoincrement=True
                         ),
                         db.Column(
-                            "wikidata_id", db.Integer, nullable=False, index=True
+                            "wikidata_id",
+                            db.Integer,
+                            nullable=False,
+                            index=True,
+                            unique=True,
                         ),
                         db.Column("local_id", db.Integer, nullable=False, index=True),
                         db.Column("has_all_claims", db.Boolean(), nullable=False),
+                        db.Column("lastrevid", db.BigInteger, nullable=True),
                     )
                     metadata.create_all(self.engine)
+                else:
+                    self._add_lastrevid_column(connection, "items")
+                    self._add_unique_wikidata_id(connection, "items")
                 if not db.inspect(self.engine).has_table("properties"):
                     properties_table = db.Table(
                         "properties",
@@ -188,14 +386,91 @@ class WikidataImporter:
                             "id", db.Integer, primary_key=True, autoincrement=True
                         ),
                         db.Column(
-                            "wikidata_id", db.Integer, nullable=False, index=True
+                            "wikidata_id",
+                            db.Integer,
+                            nullable=False,
+                            index=True,
+                            unique=True,
                         ),
                         db.Column("local_id", db.Integer, nullable=False, index=True),
                         db.Column("has_all_claims", db.Boolean(), nullable=False),
+                        db.Column("lastrevid", db.BigInteger, nullable=True),
                     )
                     metadata.create_all(self.engine)
+                else:
+                    self._add_lastrevid_column(connection, "properties")
+                    self._add_unique_wikidata_id(connection, "properties")
+
+    def _add_lastrevid_column(self, connection, table_name):
+        """Add the lastrevid column to mapping tables created before it existed."""
+        columns = [c["name"] for c in db.inspect(self.engine).get_columns(table_name)]
+        if "lastrevid" not in columns:
+            self.log.info(f"Adding lastrevid column to mapping table {table_name}")
+            connection.execute(
+                db.text(f"ALTER TABLE {table_name} ADD COLUMN lastrevid BIGINT NULL")
+            )
+            connection.commit()
+
+    def _add_unique_wikidata_id(self, connection, table_name):
+        """Make wikidata_id unique in mapping tables created without the constraint.
+
+        Fails with a warning if the table already contains duplicates,
+        which have to be merged manually first.
+        """
+        for index in db.inspect(self.engine).get_indexes(table_name):
+            if index["unique"] and index["column_names"] == ["wikidata_id"]:
+                return
+        self.log.info(f"Adding unique constraint on wikidata_id to mapping table {table_name}")
+        try:
+            connection.execute(
+                db.text(
+                    f"CREATE UNIQUE INDEX uq_{table_name}_wikidata_id "
+                    f"ON {table_name} (wikidata_id)"
+                )
+            )
+            connection.commit()
+        except db.exc.DBAPIError as e:
+            connection.rollback()
+            self.log.warning(
+                f"Could not make wikidata_id unique in {table_name}, "
+                f"the table contains duplicate mappings: {e}"
+            )
+
+    @contextmanager
+    def _entity_lock(self, wikidata_id):
+        """Hold a DB-level lock while creating the local entity of a Wikidata id.
+
+        Uses a MariaDB advisory lock (``GET_LOCK``), so that importer
+        processes on different hosts sharing the importer DB do not create
+        the same entity twice: a second worker waits until the first one has
+        written the mapping and can then look it up. The lock is bound to
+        the connection and released when leaving the context.
+
+        Args:
+            wikidata_id: Wikidata id (Q or P prefix)
+
+        Raises:
+            TimeoutError: If the lock is not acquired within ``lock_timeout``
+                seconds.
+        """
+        name = f"mardi_importer:wikidata:{wikidata_id}"
+        with self.engine.connect() as connection:
+            acquired = connection.execute(
+                db.text("SELECT GET_LOCK(:name, :timeout)"),
+                {"name": name, "timeout": self.lock_timeout},
+            ).scalar()
+            if acquired != 1:
+                raise TimeoutError(
+                    f"Timeout while waiting for another worker importing {wikidata_id}"
+                )
+            try:
+                yield
+            finally:
+                connection.execute(
+                    db.text("SELECT RELEASE_LOCK(:name)"), {"name": name}
+                )
 
-    def insert_id_in_db(self, wikidata_id, local_id, has_all_claims):
+    def insert_id_in_db(self, wikidata_id, local_id, has_all_claims, lastrevid=None):
         """
         Insert wikidata_id, local_id and has_all_claims into mapping table.
 
@@ -204,50 +479,64 @@ class WikidataImporter:
             local_id: local Wikibase id
             has_all_claims: Boolean indicating whether the entity has been
                 imported with all claims or no claims (i.e. no recurse)
+            lastrevid: Wikidata revision id of the imported entity
 
         Returns:
             None
         """
-        metadata = db.MetaData()
-
         table_name = "items"
         if wikidata_id.startswith("P"):
             table_name = "properties"
 
-        table = db.Table(table_name, metadata, autoload_with=self.engine)
+        table = self._get_table(table_name)
 
         ins = table.insert().values(
             wikidata_id=wikidata_id[1:],
             local_id=local_id[1:],
             has_all_claims=has_all_claims,
+            lastrevid=lastrevid,
         )
 
-        with self.engine.connect() as connection:
-            connection.execute(ins)
-            connection.commit()
+        try:
+            with self.engine.connect() as connection:
+                connection.execute(ins)
+                connection.commit()
+        except db.exc.IntegrityError:
+            # Only possible for writes not guarded by _entity_lock
+            self.log.warning(
+                f"{wikidata_id} has already been mapped by another worker, "
+                f"local entity {local_id} is a duplicate"
+            )
+            return
+
+        if self.id_snapshot is not None:
+            self.id_snapshot.record(wikidata_id, local_id, has_all_claims)
 
-    def update_has_all_claims(self, wikidata_id):
+    def update_has_all_claims(self, wikidata_id, lastrevid=None):
         """
         Set the has_all_claims property in the wb_id_mapping table
         to True for the given wikidata_id.
 
         Args:
             wikidata_id: Wikidata id to be updated.
+            lastrevid: Wikidata revision id the local entity has been
+                synchronised with.
 
         Returns:
             None
         """
-        metadata = db.MetaData()
-
         table_name = "items"
         if wikidata_id.startswith("P"):
             table_name = "properties"
 
-        table = db.Table(table_name, metadata, autoload_with=self.engine)
+        table = self._get_table(table_name)
 
+        values = {"has_all_claims": True}
+        if lastrevid:
+            values["lastrevid"] = lastrevid
         ins = (
             table.update()
-            .values(has_all_claims=True)
+            .values(**values)
             .where(table.c.wikidata_id == wikidata_id[1:])
         )
 
@@ -255,6 +544,9 @@ class WikidataImporter:
             connection.execute(ins)
             connection.commit()
 
+        if self.id_snapshot is not None:
+            self.id_snapshot.record(wikidata_id, has_all_claims=True)
+
     def _init_wikidata_PID(self):
         """
         Searches the wikidata PID property ID to link
@@ -291,6 +583,16 @@ class WikidataImporter:
         wikidata_QID = prop.exists()
         return wikidata_QID or prop.write(login=self.api.login, as_new=True).id
 
+    @property
+    def skipped_claims(self):
+        """Claims skipped due to the limits of the import profile in the
+        last import call of the current thread, by requested Wikidata id."""
+        state = self._import_state
+        if not hasattr(state, "skipped_claims"):
+            state.skipped_claims = {}
+        return state.skipped_claims
+
+    @_import_call
     def import_entities(self, id_list=None, filename="", recurse=True):
         """Function for importing entities from wikidata
         into the local instance.
@@ -326,8 +628,17 @@ class WikidataImporter:
                 continue
 
             self.log.debug(f"importing entity {wikidata_id}")
+            requested_id = wikidata_id
 
             has_all_claims = self.query("has_all_claims", wikidata_id)
+            if not has_all_claims:
+                resolved_id = self.resolve_cached_id(wikidata_id)
+                if not resolved_id:
+                    continue
+                if resolved_id != wikidata_id:
+                    wikidata_id = resolved_id
+                    has_all_claims = self.query("has_all_claims", wikidata_id)
+
             if not has_all_claims:
                 self.log.debug("has_all_claims is False")
                 # API call
@@ -337,6 +648,7 @@ class WikidataImporter:
                     self.log.debug(
                         f"No labels for entity with id {wikidata_id}, skipping"
                     )
+                    self.resolution_cache.record(wikidata_id, NO_LABELS)
                     continue
 
                 if (
@@ -344,10 +656,12 @@ class WikidataImporter:
                     and entity.datatype.value in self.excluded_datatypes
                 ):
                     self.log.debug(f"Warning: Lexemes not supported. Property skipped")
+                    self.resolution_cache.record(wikidata_id, EXCLUDED_DATATYPE)
                     continue
 
                 # Check if there is an internal ID redirection in Wikidata
                 if wikidata_id != entity.id:
+                    self.resolution_cache.record(wikidata_id, REDIRECT, entity.id)
                     wikidata_id = entity.id
                     has_all_claims = self.query("has_all_claims", wikidata_id)
                     if has_all_claims:
@@ -356,54 +670,71 @@ class WikidataImporter:
                         )
                         continue
 
+                # Wikidata revision, before writing replaces it by the local one
+                lastrevid = entity.lastrevid
+
                 if recurse:
-                    self._convert_claim_ids(entity)
+                    self._convert_claim_ids(entity, requested_id)
 
                 entity = self._add_wikidata_ID_claim(entity, wikidata_id)
 
-                local_id = entity.exists()
-                if not local_id:
-                    local_id = self.query("local_id", wikidata_id)
+                # Serialised across workers, so that an entity is only created once
+                with self._entity_lock(wikidata_id):
+                    # Another worker may have imported the entity in the meantime
+                    if self.query("has_all_claims", wikidata_id):
+                        imported_entities[wikidata_id] = self.query(
+                            "local_id", wikidata_id
+                        )
+                        continue
 
-                if local_id:
-                    self.log.debug(
-                        f"Found local id {local_id} for wikidata id {wikidata_id}. Updating..."
-                    )
-                    # Update existing entity
-                    if entity.type == "item":
-                        local_entity = self.api.item.get(entity_id=local_id)
-                    elif entity.type == "property":
-                        local_entity = self.api.property.get(entity_id=local_id)
-                    # replace descriptions
-                    local_entity.descriptions = entity.descriptions
-                    # add new claims if they are different from old claims
-                    local_entity.claims.add(
-                        entity.claims,
-                        ActionIfExists.APPEND_OR_REPLACE,
-                    )
-                    local_entity.write(login=self.api.login)
-                    if self.query("local_id", wikidata_id) and recurse:
-                        self.update_has_all_claims(wikidata_id)
-                    else:
-                        self.insert_id_in_db(
-                            wikidata_id, local_id, has_all_claims=recurse
+                    local_id = entity.exists()
+                    if not local_id:
+                        local_id = self.query("local_id", wikidata_id)
+
+                    if local_id:
+                        self.log.debug(
+                            f"Found local id {local_id} for wikidata id {wikidata_id}. Updating..."
                         )
-                else:
-                    self.log.debug(
-                        f"No local id found. Creating item for wikidata id {wikidata_id} with data: {entity}"
-                    )
-                    # Create entity
-                    try:
-                        local_id = entity.write(login=self.api.login, as_new=True).id
-                    except ModificationFailed as e:
-                        self.log.error(
-                            f"Creating item for wikidata id {wikidata_id} failed! Returned local_id: {local_id}"
+                        # Update existing entity
+                        if entity.type == "item":
+                            local_entity = self.api.item.get(entity_id=local_id)
+                        elif entity.type == "property":
+                            local_entity = self.api.property.get(entity_id=local_id)
+                        # replace descriptions
+                        local_entity.descriptions = entity.descriptions
+                        # add new claims if they are different from old claims
+                        local_entity.claims.add(
+                            entity.claims,
+                            ActionIfExists.APPEND_OR_REPLACE,
                         )
+                        local_entity.write(login=self.api.login)
+                        if self.query("local_id", wikidata_id):
+                            if recurse:
+                                self.update_has_all_claims(wikidata_id, lastrevid)
+                        else:
+                            self.insert_id_in_db(
+                                wikidata_id, local_id, has_all_claims=recurse,
+                                lastrevid=lastrevid,
+                            )
+                    else:
+                        self.log.debug(
+                            f"No local id found. Creating item for wikidata id {wikidata_id} with data: {entity}"
+                        )
+                        # Create entity
+                        try:
+                            local_id = entity.write(login=self.api.login, as_new=True).id
+                        except ModificationFailed as e:
+                            self.log.error(
+                                f"Creating item for wikidata id {wikidata_id} failed! Returned local_id: {local_id}"
+                            )
 
-                    self.log.debug(
-                        f"Inserting new item with id {local_id} for wikidata id {wikidata_id} into database"
-                    )
-                    self.insert_id_in_db(wikidata_id, local_id, has_all_claims=recurse)
+                        self.log.debug(
+                            f"Inserting new item with id {local_id} for wikidata id {wikidata_id} into database"
+                        )
+                        self.insert_id_in_db(
+                            wikidata_id, local_id, has_all_claims=recurse,
+                            lastrevid=lastrevid,
+                        )
 
             if has_all_claims:
                 imported_entities[wikidata_id] = self.query("local_id", wikidata_id)
@@ -416,6 +747,261 @@ class WikidataImporter:
             return list(imported_entities.values())[0]
         return imported_entities
 
+    def import_missing_entities(self, id_list):
+        """Import the entities of a list that are not imported with all
+        their claims yet, as a single prepared batch.
+
+        Args:
+            id_list: List of Wikidata ids
+
+        Returns:
+            list: The ids that have been imported.
+        """
+        id_list = list(dict.fromkeys(id_list))
+        imported = self.query_local_ids(id_list, has_all_claims=True)
+        pending = [wikidata_id for wikidata_id in id_list if wikidata_id not in imported]
+        if not pending:
+            return []
+        self.log.info(f"Importing {len(pending)} missing Wikidata entities")
+        self.prepare_batch(pending)
+        try:
+            self.import_entities(id_list=pending)
+        finally:
+            self.clear_prefetched()
+        return pending
+
+    def prepare_batch(self, id_list):
+        """Prepare the import of a batch of entities.
+
+        Fetches all entities of the batch at once and imports the
+        dependencies shared between them in bulk (see
+        :class:`ImportPlanner`), so that the subsequent calls to
+        :meth:`import_entities` for each entity only have to write the
+        entity itself. Data prefetched for a previous batch is discarded.
+
+        Args:
+            id_list: List of Wikidata ids to be imported.
+
+        Returns:
+            dict: The executed import plan.
+        """
+        self.clear_prefetched()
+        if isinstance(id_list, str):
+            id_list = [id_list]
+        return ImportPlanner(self).prepare(id_list)
+
+    def clear_prefetched(self):
+        """Discard entity data prefetched for a batch."""
+        self._prefetched = {}
+
+    def prefetch_entities(self, id_list, recurse=True):
+        """Fetch the raw JSON of several Wikidata entities at once.
+
+        Entities are read from the local dump or the entity cache if
+        available, and otherwise requested from the Wikidata API in chunks
+        of up to 50 ids. The results are kept for
+        :meth:`_get_wikidata_information` until :meth:`clear_prefetched`
+        is called.
+
+        Args:
+            id_list: List of Wikidata ids (Q or P prefix)
+            recurse: Whether the claims are needed
+
+        Returns:
+            dict: ``{wikidata_id: entity_json}`` for all existing entities.
+        """
+        entities = {}
+        to_fetch = []
+        for wikidata_id in dict.fromkeys(id_list):
+            entity_json = self._get_prefetched(wikidata_id, recurse)
+            if entity_json:
+                entities[wikidata_id] = entity_json
+                continue
+            if self.dump is not None:
+                entity_json = self.dump.get(wikidata_id)
+                if entity_json:
+                    entities[wikidata_id] = entity_json
+                    continue
+            to_fetch.append(wikidata_id)
+
+        cached = self._read_entity_cache(to_fetch, recurse)
+        entities.update(cached)
+        to_fetch = [wikidata_id for wikidata_id in to_fetch if wikidata_id not in cached]
+
+        for i in range(0, len(to_fetch), WBGETENTITIES_LIMIT):
+            chunk = to_fetch[i:i + WBGETENTITIES_LIMIT]
+            self.log.debug(
+                "Calling Wikidata API: url=%s wbgetentities for %d ids",
+                WIKIDATA_API_URL, len(chunk),
+            )
+            fetched = self._wbgetentities(chunk, recurse)
+            self._write_entity_cache(fetched, recurse)
+            entities.update(fetched)
+
+        self._prefetched.update(entities)
+        return entities
+
+    def _get_prefetched(self, wikidata_id, recurse):
+        """Return prefetched entity JSON, if it contains what is needed."""
+        entity_json = self._prefetched.get(wikidata_id)
+        if entity_json and (not recurse or "claims" in entity_json):
+            return entity_json
+        return None
+
+    def _entity_cache_variants(self, recurse):
+        """Variants of cached entity JSON that contain what is needed.
+
+        Returns:
+            list: The variant fetched for ``recurse`` first, then the ones
+            that contain it.
+        """
+        languages = "all" if self.languages == "all" else ".".join(sorted(self.languages))
+        variants = [f"claims-{languages}"]
+        if not recurse:
+            variants.insert(0, f"labels-{languages}")
+        return variants
+
+    def _read_entity_cache(self, id_list, recurse):
+        """Read entities of unchanged revisions from the entity cache.
+
+        Entries validated less than ``max_age`` seconds ago are used as
+        they are. The revisions of older entries are checked with a single
+        lightweight request per 50 ids, and unchanged ones are used and
+        marked as validated.
+
+        Args:
+            id_list: List of Wikidata ids (Q or P prefix)
+            recurse: Whether the claims are needed
+
+        Returns:
+            dict: ``{wikidata_id: entity_json}`` for the cached entities.
+        """
+        if self.entity_cache is None or not id_list:
+            return {}
+        variants = self._entity_cache_variants(recurse)
+        current, stale = {}, {}
+        for wikidata_id in id_list:
+            entry = self.entity_cache.lookup(wikidata_id, variants)
+            if entry is None:
+                continue
+            lastrevid, path, age = entry
+            if age <= self.entity_cache.max_age:
+                current[wikidata_id] = path
+            else:
+                stale[wikidata_id] = (lastrevid, path)
+
+        if stale:
+            try:
+                revisions = self._get_wikidata_revisions(list(stale))
+            except Exception as e:
+                self.log.warning(f"Checking revisions of cached entities failed: {e}")
+                revisions = {}
+            for wikidata_id, (lastrevid, path) in stale.items():
+                if revisions.get(wikidata_id) == lastrevid:
+                    self.entity_cache.touch(path)
+                    current[wikidata_id] = path
+
+        entities = {}
+        for wikidata_id, path in current.items():
+            entity_json = self.entity_cache.read(path)
+            if entity_json is not None:
+                entities[wikidata_id] = entity_json
+        return entities
+
+    def _write_entity_cache(self, entities, recurse):
+        """Store entities fetched from Wikidata in the entity cache."""
+        if self.entity_cache is None:
+            return
+        variant = self._entity_cache_variants(recurse)[0]
+        for wikidata_id, entity_json in entities.items():
+            self.entity_cache.store(wikidata_id, variant, entity_json)
+
+    def _wbgetentities(self, id_list, recurse=True, timeout=None):
+        """Request entities from the Wikidata API with a single wbgetentities call.
+
+        Only the configured languages are requested, sitelinks are never
+        requested and claims only when ``recurse`` is set, which keeps
+        label-only requests to a small fraction of the full entity.
+
+        Args:
+            id_list: Up to 50 Wikidata ids (Q or P prefix)
+            recurse: Whether to request the claims
+            timeout: Timeout in seconds for the HTTP request (optional);
+                requests with a timeout are retried at most
+                ``FETCH_MAX_RETRIES`` times
+
+        Returns:
+            dict: ``{wikidata_id: entity_json}`` keyed by the requested ids,
+            also for redirected entities. Missing entities are left out.
+        """
+        props = ["info", "labels", "descriptions", "aliases", "datatype"]
+        if recurse:
+            props.append("claims")
+        data = {
+            "action": "wbgetentities",
+            "ids": "|".join(id_list),
+            "props": "|".join(props),
+            "format": "json",
+        }
+        if self.languages != "all":
+            data["languages"] = "|".join(self.languages)
+
+        kwargs = {}
+        if timeout:
+            kwargs = {
+                "timeout": timeout,
+                "max_retries": FETCH_MAX_RETRIES,
+                "retry_after": FETCH_RETRY_AFTER,
+            }
+        response = wbi_helpers.mediawiki_api_call_helper(
+            data=data,
+            mediawiki_api_url=WIKIDATA_API_URL,
+            allow_anonymous=True,
+            **kwargs,
+        )
+        return {
+            wikidata_id: entity_json
+            for wikidata_id, entity_json in response.get("entities", {}).items()
+            if "missing" not in entity_json
+        }
+
+    def query_local_ids(self, id_list, has_all_claims=False):
+        """Look up the local ids of several Wikidata ids at once.
+
+        Args:
+            id_list: Iterable of Wikidata ids (Q or P prefix)
+            has_all_claims: Only return entities imported with all claims
+
+        Returns:
+            dict: ``{wikidata_id: local_id}`` for all mapped ids.
+        """
+        local_ids = {}
+        pending = {"items": [], "properties": []}
+        for wikidata_id in id_list:
+            if self.id_snapshot is not None:
+                cached = self.id_snapshot.get(wikidata_id)
+                if cached and (cached[1] or not has_all_claims):
+                    local_ids[wikidata_id] = cached[0]
+                    continue
+            table_name = "properties" if wikidata_id.startswith("P") else "items"
+            pending[table_name].append(int(wikidata_id[1:]))
+
+        for table_name, numbers in pending.items():
+            if not numbers:
+                continue
+            prefix = "P" if table_name == "properties" else "Q"
+            table = self._get_table(table_name)
+            sql = db.select(table.c.wikidata_id, table.c.local_id).where(
+                table.c.wikidata_id.in_(numbers)
+            )
+            if has_all_claims:
+                sql = sql.where(table.c.has_all_claims == True)
+            with self.engine.connect() as connection:
+                for wikidata_num, local_num in connection.execute(sql):
+                    local_ids[f"{prefix}{wikidata_num}"] = f"{prefix}{local_num}"
+        return local_ids
+
+    @_import_call
     def overwrite_entity(self, wikidata_id, local_id):
         """Function for completing an already existing local entity
         with its statements from wikidata.
@@ -434,6 +1020,7 @@ class WikidataImporter:
             )
 
         self.log.debug(f"Overwriting entity {local_id}")
+        requested_id = wikidata_id
 
         has_all_claims = self.query("has_all_claims", wikidata_id)
         if has_all_claims:
@@ -450,7 +1037,8 @@ class WikidataImporter:
                     if has_all_claims:
                         return self.query("local_id", wikidata_id)
 
-                self._convert_claim_ids(entity)
+                lastrevid = entity.lastrevid
+                self._convert_claim_ids(entity, requested_id)
                 entity = self._add_wikidata_ID_claim(entity, wikidata_id)
 
                 # Retrieve existing entity
@@ -467,13 +1055,18 @@ class WikidataImporter:
                 )
                 local_entity.write(login=self.api.login)
                 if self.query("local_id", wikidata_id):
-                    self.update_has_all_claims(wikidata_id)
+                    self.update_has_all_claims(wikidata_id, lastrevid)
                 else:
-                    self.insert_id_in_db(wikidata_id, local_id, has_all_claims=True)
+                    self.insert_id_in_db(
+                        wikidata_id, local_id, has_all_claims=True, lastrevid=lastrevid
+                    )
 
             return local_id
 
-    def update_entities(self, id_list, label=False, description=False, timeout=86400):
+    @_import_call
+    def update_entities(
+        self, id_list, label=False, description=False, timeout=86400, concurrency=None
+    ):
         """Synchronise local MaRDI entities with their current Wikidata state.
 
         For each Wikidata ID in ``id_list``, fetches the latest data from
@@ -481,6 +1074,10 @@ class WikidataImporter:
         If no local entity exists yet, the entity is imported from scratch via
         :meth:`import_entities`.  Lexeme IDs (``L``-prefixed) are skipped.
 
+        Entities whose Wikidata revision has not changed since they were last
+        imported or updated with all claims are skipped; their revisions are
+        checked with a single lightweight request for the whole ``id_list``.
+
         The write step is retried up to three times (30 s apart) on
         :class:`~wikibaseintegrator.wbi_exceptions.ModificationFailed` before
         re-raising.
@@ -490,7 +1087,13 @@ class WikidataImporter:
                 IDs (``Q``- or ``P``-prefixed) to update.
             label (bool): Reserved for future use; currently unused.
             description (bool): Reserved for future use; currently unused.
-            timeout (int): Timeout in seconds. Defaults to 24 hours (86400s)
+            timeout (int): Timeout in seconds for fetching each entity.
+                Defaults to 24 hours (86400s)
+            concurrency (int): Number of entities fetched ahead of the one
+                being written. Defaults to ``WIKIDATA_FETCH_WORKERS`` (4).
+                The fetches run on the pool shared by all Wikidata fetches
+                of the process, so at most ``WIKIDATA_FETCH_WORKERS`` of
+                them run at the same time.
 
         Returns:
             str | dict[str, str]: The local MaRDI ID when ``id_list`` contains
@@ -504,10 +1107,18 @@ class WikidataImporter:
         """
         updated_entities = {}
 
+        # Updates always need the current state of the entities
+        self.clear_prefetched()
+
         # Ensure id_list is a list
         if isinstance(id_list, str):
             id_list = [id_list]
 
+        unchanged = self.get_unchanged_entities(
+            [wikidata_id for wikidata_id in id_list if not wikidata_id.startswith("L")]
+        )
+
+        to_fetch = []
         for wikidata_id in id_list:
             # Skip Lexeme IDs
             if wikidata_id.startswith("L"):
@@ -516,86 +1127,221 @@ class WikidataImporter:
                 )
                 continue
 
-            self.log.debug(f"Updating local entity from wikidata {wikidata_id}")
+            if wikidata_id in unchanged:
+                self.log.debug(
+                    f"{wikidata_id} unchanged on Wikidata since last sync, skipping"
+                )
+                updated_entities[wikidata_id] = unchanged[wikidata_id]
+                continue
 
-            self.log.debug(f"Reading from Wikidata (with {timeout}s timeout)...")
+            to_fetch.append(wikidata_id)
+
+        # Fetch up to `concurrency` entities ahead on the shared pool while
+        # the fetched ones are written sequentially. A fetch given up on
+        # keeps its worker until its requests time out after request_timeout.
+        executor = self._get_executor()
+        request_timeout = min(timeout, self.request_timeout)
+        pending_ids = iter(to_fetch)
+        fetches = deque()
+
+        def _submit_next():
+            wikidata_id = next(pending_ids, None)
+            if wikidata_id is not None:
+                # Updates need the current revision, never a cached one
+                future = executor.submit(
+                    self._get_wikidata_information,
+                    wikidata_id, True, request_timeout, False,
+                )
+                fetches.append((wikidata_id, future))
 
-            # Run the Wikidata API call in a daemon thread so the process can
-            # exit cleanly if the thread is abandoned. result_holder and
-            # exc_holder are single-element lists used to pass the return value
-            # or exception back to the main thread after join().
-            result_holder = [None]
-            exc_holder = [None]
+        for _ in range(max(1, concurrency or self.fetch_workers)):
+            _submit_next()
 
-            def _fetch():
-                try:
-                    result_holder[0] = self._get_wikidata_information(wikidata_id, True)
-                except Exception as e:
-                    exc_holder[0] = e
+        try:
+            while fetches:
+                wikidata_id, future = fetches.popleft()
+                _submit_next()
 
-            t = threading.Thread(target=_fetch, daemon=True)
-            t.start()
-            t.join(timeout)
+                self.log.debug(f"Updating local entity from wikidata {wikidata_id}")
 
-            if t.is_alive():
-                self.log.error(
-                    f"Timeout while fetching {wikidata_id} from Wikidata — skipping"
-                )
-                continue
-
-            if exc_holder[0] is not None:
-                raise exc_holder[0]
+                self.log.debug(f"Reading from Wikidata (with {timeout}s timeout)...")
 
-            entity = result_holder[0]
+                try:
+                    entity = future.result(timeout=timeout)
+                except FutureTimeoutError:
+                    self.log.error(
+                        f"Timeout while fetching {wikidata_id} from Wikidata — skipping"
+                    )
+                    continue
 
-            if not entity:
-                self.log.debug(f"No labels for entity with id {wikidata_id}, skipping")
-                continue
+                if not entity:
+                    self.log.debug(f"No labels for entity with id {wikidata_id}, skipping")
+                    continue
 
-            if (
-                entity.type == "property"
-                and entity.datatype.value in self.excluded_datatypes
-            ):
-                self.log.warning(f"Warning: Lexemes not supported. Property skipped.")
-                continue
+                if (
+                    entity.type == "property"
+                    and entity.datatype.value in self.excluded_datatypes
+                ):
+                    self.log.warning(f"Warning: Lexemes not supported. Property skipped.")
+                    continue
 
-            self.log.debug("Getting local QID ...")
-            mardi_id = self.query("local_id", wikidata_id)
-
-            self.log.debug(f"Processing (updating) local item: {mardi_id}")
-            if mardi_id:
-                mardi_item = self.api.item.get(entity_id=mardi_id)
-                entity = self._convert_claim_ids(entity)
-                mardi_item.add_claims(entity.claims)
-                for attempt in range(3):
-                    try:
-                        mardi_item = mardi_item.write()
-                        break
-                    except ModificationFailed:
-                        if attempt < 2:
-                            self.log.warning(
-                                "write() failed for %s (attempt %d/3) — retrying in 30s",
-                                wikidata_id, attempt + 1
-                            )
-                            time.sleep(30)
-                        else:
-                            raise 
-                self.update_has_all_claims(wikidata_id)
-                updated_entities[wikidata_id] = mardi_id
-            else:
-                imported_id = self.import_entities(wikidata_id)
-                updated_entities[wikidata_id] = imported_id
+                self.log.debug("Getting local QID ...")
+                mardi_id = self.query("local_id", wikidata_id)
+
+                self.log.debug(f"Processing (updating) local item: {mardi_id}")
+                if mardi_id:
+                    lastrevid = entity.lastrevid
+                    mardi_item = self.api.item.get(entity_id=mardi_id)
+                    entity = self._convert_claim_ids(entity, wikidata_id)
+                    mardi_item.add_claims(entity.claims)
+                    for attempt in range(3):
+                        try:
+                            mardi_item = mardi_item.write()
+                            break
+                        except ModificationFailed:
+                            if attempt < 2:
+                                self.log.warning(
+                                    "write() failed for %s (attempt %d/3) — retrying in 30s",
+                                    wikidata_id, attempt + 1
+                                )
+                                time.sleep(30)
+                            else:
+                                raise 
+                    self.update_has_all_claims(wikidata_id, lastrevid)
+                    updated_entities[wikidata_id] = mardi_id
+                else:
+                    imported_id = self.import_entities(wikidata_id)
+                    updated_entities[wikidata_id] = imported_id
+        finally:
+            # Drop fetches that are no longer needed after an error
+            for _, pending in fetches:
+                pending.cancel()
 
         if len(updated_entities) == 1:
             return list(updated_entities.values())[0]
         return updated_entities
 
-    def _import_claim_entities(self, wikidata_id):
+    def get_unchanged_entities(self, id_list):
+        """Find the entities that have not changed on Wikidata since their
+        last import or update with all claims.
+
+        Compares the revision ids stored in the mapping tables with the
+        current ones, which are requested from Wikidata with ``props=info``
+        in chunks of up to 50 ids.
+
+        Args:
+            id_list: List of Wikidata ids (Q or P prefix)
+
+        Returns:
+            dict: ``{wikidata_id: local_id}`` for all unchanged entities.
+        """
+        synced = self._query_synced_revisions(id_list)
+        if not synced:
+            return {}
+
+        try:
+            current = self._get_wikidata_revisions(list(synced))
+        except Exception as e:
+            self.log.warning(f"Checking Wikidata revisions failed: {e}")
+            return {}
+
+        return {
+            wikidata_id: local_id
+            for wikidata_id, (local_id, lastrevid) in synced.items()
+            if current.get(wikidata_id) == lastrevid
+        }
+
+    def _get_wikidata_revisions(self, id_list):
+        """Retrieve the current revision ids of several Wikidata entities.
+
+        Redirected and missing entities are not included in the result.
+
+        Args:
+            id_list: List of Wikidata ids (Q or P prefix)
+
+        Returns:
+            dict: ``{wikidata_id: lastrevid}``
+        """
+        revisions = {}
+        for i in range(0, len(id_list), WBGETENTITIES_LIMIT):
+            chunk = id_list[i:i + WBGETENTITIES_LIMIT]
+            response = wbi_helpers.mediawiki_api_call_helper(
+                data={
+                    "action": "wbgetentities",
+                    "ids": "|".join(chunk),
+                    "props": "info",
+                    "format": "json",
+                },
+                mediawiki_api_url=WIKIDATA_API_URL,
+                allow_anonymous=True,
+            )
+            for wikidata_id, info in response.get("entities", {}).items():
+                if "missing" in info or info.get("id") != wikidata_id:
+                    continue
+                revisions[wikidata_id] = info.get("lastrevid")
+        return revisions
+
+    def _query_synced_revisions(self, id_list):
+        """Look up the stored revision ids of entities imported with all claims.
+
+        Args:
+            id_list: List of Wikidata ids (Q or P prefix)
+
+        Returns:
+            dict: ``{wikidata_id: (local_id, lastrevid)}``
+        """
+        synced = {}
+        numbers = {"items": [], "properties": []}
+        for wikidata_id in id_list:
+            table_name = "properties" if wikidata_id.startswith("P") else "items"
+            numbers[table_name].append(int(wikidata_id[1:]))
+
+        for table_name, table_numbers in numbers.items():
+            if not table_numbers:
+                continue
+            prefix = "P" if table_name == "properties" else "Q"
+            table = self._get_table(table_name)
+            sql = db.select(
+                table.c.wikidata_id, table.c.local_id, table.c.lastrevid
+            ).where(
+                table.c.wikidata_id.in_(table_numbers),
+                table.c.has_all_claims == True,
+                table.c.lastrevid.is_not(None),
+            )
+            with self.engine.connect() as connection:
+                for wikidata_num, local_num, lastrevid in connection.execute(sql):
+                    synced[f"{prefix}{wikidata_num}"] = (f"{prefix}{local_num}", lastrevid)
+        return synced
+
+    def resolve_cached_id(self, wikidata_id):
+        """Apply the resolution cache to a Wikidata id.
+
+        Args:
+            wikidata_id: Wikidata id (Q or P prefix)
+
+        Returns:
+            str or None: The id itself, the redirect target for redirected
+            ids, or None if the id is known not to resolve to an importable
+            entity (no labels, excluded datatype).
+        """
+        resolution = self.resolution_cache.get(wikidata_id)
+        if resolution is None:
+            return wikidata_id
+        reason, target = resolution
+        if reason == REDIRECT:
+            self.log.debug(f"{wikidata_id} is redirected to {target}")
+            return target
+        self.log.debug(f"Skipping {wikidata_id}: cached as {reason}")
+        return None
+
+    def _import_claim_entities(self, wikidata_id, budget=None):
         """Function for importing entities that are mentioned
         in claims from wikidata to the local wikibase instance
 
         Args:
             wikidata_id(str): id of the entity to be imported
+            budget(ImportBudget): dependency budget of the entity whose
+                claims are converted, None for no limit
 
         Returns:
             local id or None, if the entity had no labels
@@ -604,9 +1350,22 @@ class WikidataImporter:
         if local_id:
             return local_id
 
+        resolved_id = self.resolve_cached_id(wikidata_id)
+        if not resolved_id:
+            return None
+        if resolved_id != wikidata_id:
+            wikidata_id = resolved_id
+            local_id = self.query("local_id", wikidata_id)
+            if local_id:
+                return local_id
+
+        if budget is not None and not budget.reserve_dependency(wikidata_id):
+            return None
+
         entity = self._get_wikidata_information(wikidata_id)
 
         if not entity:
+            self.resolution_cache.record(wikidata_id, NO_LABELS)
             return None
 
         # Check for unsupported property datatypes
@@ -614,10 +1373,12 @@ class WikidataImporter:
             entity.type == "property"
             and entity.datatype.value in self.excluded_datatypes
         ):
+            self.resolution_cache.record(wikidata_id, EXCLUDED_DATATYPE)
             return None
 
         # Handle potential ID redirection
         elif wikidata_id != entity.id:
+            self.resolution_cache.record(wikidata_id, REDIRECT, entity.id)
             wikidata_id = entity.id
             local_id = self.query("local_id", wikidata_id)
             if local_id:
@@ -629,29 +1390,44 @@ class WikidataImporter:
         if local_id:
             return local_id
 
-        local_id = entity.exists()
-        if local_id:
-            new_entity = (
-                self.api.item if local_id.startswith("Q") else self.api.property
-            ).get(entity_id=local_id)
-            new_entity.descriptions = entity.descriptions
-            entity = new_entity
-            entity = self._add_wikidata_ID_claim(entity, wikidata_id)
-            local_id = entity.write(login=self.api.login).id
-            as_new = False
-        else:
-            entity = self._add_wikidata_ID_claim(entity, wikidata_id)
-            local_id = entity.write(login=self.api.login, as_new=True).id
+        lastrevid = entity.lastrevid
+        with self._entity_lock(wikidata_id):
+            # Another worker may have imported the entity in the meantime
+            local_id = self.query("local_id", wikidata_id)
+            if local_id:
+                return local_id
+
+            local_id = entity.exists()
+            if local_id:
+                new_entity = (
+                    self.api.item if local_id.startswith("Q") else self.api.property
+                ).get(entity_id=local_id)
+                new_entity.descriptions = entity.descriptions
+                entity = new_entity
+                entity = self._add_wikidata_ID_claim(entity, wikidata_id)
+                local_id = entity.write(login=self.api.login).id
+                as_new = False
+            else:
+                entity = self._add_wikidata_ID_claim(entity, wikidata_id)
+                local_id = entity.write(login=self.api.login, as_new=True).id
 
-        self.insert_id_in_db(wikidata_id, local_id, has_all_claims=False)
+            self.insert_id_in_db(
+                wikidata_id, local_id, has_all_claims=False, lastrevid=lastrevid
+            )
         return local_id
 
-    def _get_wikidata_information(self, wikidata_id, recurse=False):
+    def _get_wikidata_information(
+        self, wikidata_id, recurse=False, timeout=None, cached=True
+    ):
         """Retrieves Wikidata information for a given entity ID.
 
         Args:
             wikidata_id: Wikidata ID of the desired entity (Q or P prefix)
             recurse: Whether to import claims (defaults to False)
+            timeout: Timeout in seconds for the HTTP request (optional)
+            cached: Whether the entity may be read from the local dump or
+                the entity cache (defaults to True); updates need the
+                current state from the API
 
         Returns:
             WikibaseEntity if the entity has labels in desired languages, None otherwise
@@ -668,11 +1444,47 @@ class WikidataImporter:
                 f"Invalid ID format: {wikidata_id}. Must start with Q or P"
             )
 
-        # Get entity
-        params = {"entity_id": wikidata_id, "mediawiki_api_url": WIKIDATA_API_URL}
-        self.log.debug("Calling Wikidata API: url=%s entity_id=%s", WIKIDATA_API_URL, wikidata_id)
-        entity = (self.api.item if prefix == "Q" else self.api.property).get(**params)
+        entity_json = self._get_prefetched(wikidata_id, recurse)
+        if entity_json:
+            # Copied, since the claim conversion modifies the JSON in place
+            entity_json = copy.deepcopy(entity_json)
+        elif cached and self.dump is not None:
+            entity_json = self.dump.get(wikidata_id)
+            if entity_json:
+                self.log.debug("Reading %s from local Wikidata dump", wikidata_id)
+
+        if not entity_json and cached:
+            entity_json = self._read_entity_cache([wikidata_id], recurse).get(wikidata_id)
+
+        if not entity_json:
+            self.log.debug("Calling Wikidata API: url=%s entity_id=%s", WIKIDATA_API_URL, wikidata_id)
+            fetched = self._wbgetentities([wikidata_id], recurse, timeout)
+            self._write_entity_cache(fetched, recurse)
+            entity_json = fetched.get(wikidata_id)
+            if not entity_json:
+                self.log.warning(f"Entity {wikidata_id} not found in Wikidata")
+                return None
+
+        # Parts that were not requested are missing from the response
+        for key in ("labels", "descriptions", "aliases", "claims", "sitelinks"):
+            entity_json.setdefault(key, {})
+        entity = (
+            self.api.item if prefix == "Q" else self.api.property
+        ).new().from_json(entity_json)
+
+        return self._filter_entity(entity, recurse)
+
+    def _filter_entity(self, entity, recurse=False):
+        """Restrict an entity retrieved from Wikidata to the configured
+        languages and drop the parts that are not imported.
+
+        Args:
+            entity: WikibaseEntity retrieved from Wikidata
+            recurse: Whether to keep the claims
 
+        Returns:
+            WikibaseEntity if the entity has labels in desired languages, None otherwise
+        """
         if self.languages != "all":
             # Filter labels for desired languages
             entity.labels.values = {
@@ -711,16 +1523,34 @@ class WikidataImporter:
 
         return entity
 
-    def _convert_claim_ids(self, entity):
+    def _convert_claim_ids(self, entity, requested_id=None):
         """Function for in-place conversion of wikidata
         ids found in claims into local ids
 
+        The claims are restricted according to the import profile; claims
+        skipped due to its limits are logged and kept in
+        ``skipped_claims`` under the requested Wikidata id.
+
         Args:
             entity
+            requested_id: Wikidata id the entity was requested by, which
+                differs from the id of redirected entities; defaults to
+                the id of the entity
 
         Returns:
             entity
         """
+        budget = ImportBudget(self.import_profile)
+        self._convert_claims(entity, budget)
+
+        report = budget.report()
+        if report:
+            self.log.info(f"Skipped claims of {entity.id} ({self.import_profile.name} profile): {report}")
+            self.skipped_claims[requested_id or entity.id] = report
+        return entity
+
+    def _convert_claims(self, entity, budget):
+        """Convert the claims of an entity within the limits of ``budget``."""
         entity_names = [
             "wikibase-item",
             "wikibase-property",
@@ -731,61 +1561,68 @@ class WikidataImporter:
         # where str is the property id
         for prop_id, claim_list in claims.items():
             local_claim_list = []
-            if prop_id not in self.excluded_properties:
-                local_prop_id = self._import_claim_entities(wikidata_id=prop_id)
-                if not local_prop_id:
-                    self.log.warning("Warning: local id skipped")
-                    continue
-                for c in claim_list:
-                    c_dict = c.get_json()
-                    if c_dict["mainsnak"]["datatype"] in entity_names:
-                        if "datavalue" in c_dict["mainsnak"]:
-                            local_mainsnak_id = self._import_claim_entities(
-                                wikidata_id=c_dict["mainsnak"]["datavalue"]["value"][
-                                    "id"
-                                ],
-                            )
-                            if not local_mainsnak_id:
-                                continue
-                            c_dict["mainsnak"]["datavalue"]["value"]["id"] = (
-                                local_mainsnak_id
-                            )
-                            c_dict["mainsnak"]["datavalue"]["value"]["numeric-id"] = (
-                                int(local_mainsnak_id[1:])
-                            )
-                            c_dict["mainsnak"]["property"] = local_prop_id
-                            # to avoid problem with missing reference hash
-                            if "references" in c_dict:
-                                c_dict.pop("references")
-                            new_c = Claim().from_json(c_dict)
-                            new_c.id = None
-                        else:
+            if prop_id in self.excluded_properties:
+                continue
+            if not self.import_profile.allows_property(prop_id):
+                budget.skip(prop_id, PROPERTY_NOT_ALLOWED, len(claim_list))
+                continue
+            claim_list = budget.limit_claims(prop_id, claim_list)
+            local_prop_id = self._import_claim_entities(wikidata_id=prop_id, budget=budget)
+            if not local_prop_id:
+                self.log.warning("Warning: local id skipped")
+                continue
+            for c in claim_list:
+                c_dict = c.get_json()
+                if c_dict["mainsnak"]["datatype"] in entity_names:
+                    if "datavalue" in c_dict["mainsnak"]:
+                        local_mainsnak_id = self._import_claim_entities(
+                            wikidata_id=c_dict["mainsnak"]["datavalue"]["value"][
+                                "id"
+                            ],
+                            budget=budget,
+                        )
+                        if not local_mainsnak_id:
                             continue
-                    elif c_dict["mainsnak"]["datatype"] in self.excluded_datatypes:
-                        continue
-                    else:
-                        self._convert_entity_links(snak=c_dict["mainsnak"])
-                        new_c = c
-                        new_c.mainsnak.property_number = local_prop_id
+                        c_dict["mainsnak"]["datavalue"]["value"]["id"] = (
+                            local_mainsnak_id
+                        )
+                        c_dict["mainsnak"]["datavalue"]["value"]["numeric-id"] = (
+                            int(local_mainsnak_id[1:])
+                        )
+                        c_dict["mainsnak"]["property"] = local_prop_id
+                        # to avoid problem with missing reference hash
+                        if "references" in c_dict:
+                            c_dict.pop("references")
+                        new_c = Claim().from_json(c_dict)
                         new_c.id = None
-                    # get reference details
-                    new_references = self._get_references(c)
-                    if new_references:
-                        new_c.references.references = new_references
-                    # get qualifier details
-                    new_qualifiers = self._get_qualifiers(c)
-                    new_c.qualifiers = new_qualifiers
-                    local_claim_list.append(new_c)
-                new_claims[local_prop_id] = local_claim_list
+                    else:
+                        continue
+                elif c_dict["mainsnak"]["datatype"] in self.excluded_datatypes:
+                    continue
+                else:
+                    self._convert_entity_links(snak=c_dict["mainsnak"], budget=budget)
+                    new_c = c
+                    new_c.mainsnak.property_number = local_prop_id
+                    new_c.id = None
+                # get reference details
+                new_references = self._get_references(c, budget)
+                if new_references:
+                    new_c.references.references = new_references
+                # get qualifier details
+                new_qualifiers = self._get_qualifiers(c, budget)
+                new_c.qualifiers = new_qualifiers
+                local_claim_list.append(new_c)
+            new_claims[local_prop_id] = local_claim_list
         entity.claims.claims = new_claims
         return entity
 
-    def _get_references(self, claim):
+    def _get_references(self, claim, budget=None):
         """Function for creating references from wikidata references
         and in place adding them to the claim
 
         Args:
             claim: a wikibaseintegrator claim
+            budget: ImportBudget of the entity, see _import_claim_entities
 
         Returns:
             List with references, can also be an empty list
@@ -805,7 +1642,7 @@ class WikidataImporter:
             for prop_id, snak_list in snak_dict["snaks"].items():
                 new_snak_list = []
                 new_prop_id = self._import_claim_entities(
-                    wikidata_id=prop_id,
+                    wikidata_id=prop_id, budget=budget,
                 )
                 if not new_prop_id:
                     continue
@@ -815,6 +1652,7 @@ class WikidataImporter:
                             continue
                         new_snak_id = self._import_claim_entities(
                             wikidata_id=snak["datavalue"]["value"]["id"],
+                            budget=budget,
                         )
                         if not new_snak_id:
                             continue
@@ -824,7 +1662,7 @@ class WikidataImporter:
                         continue
                     else:
                         self._convert_entity_links(
-                            snak=snak,
+                            snak=snak, budget=budget,
                         )
                     snak["property"] = new_prop_id
                     new_snak_list.append(snak)
@@ -837,12 +1675,13 @@ class WikidataImporter:
             new_ref_list.append(r.from_json(json_data=complete_new_snak_dict))
         return new_ref_list
 
-    def _get_qualifiers(self, claim):
+    def _get_qualifiers(self, claim, budget=None):
         """Function for creating qualifiers from wikidata qualifiers
         and in place adding them to the claim
 
         Args:
             claim: a wikibaseintegrator claim
+            budget: ImportBudget of the entity, see _import_claim_entities
 
         Returns:
             Qualifiers object, can also be an empty object
@@ -854,7 +1693,7 @@ class WikidataImporter:
         qual_dict = claim.qualifiers.get_json()
         new_qual_dict = {}
         for qual_id, qual_list in qual_dict.items():
-            new_qual_id = self._import_claim_entities(wikidata_id=qual_id)
+            new_qual_id = self._import_claim_entities(wikidata_id=qual_id, budget=budget)
             if not new_qual_id:
                 continue
             new_qual_list = []
@@ -864,6 +1703,7 @@ class WikidataImporter:
                         continue
                     new_qual_val_id = self._import_claim_entities(
                         wikidata_id=qual_val["datavalue"]["value"]["id"],
+                        budget=budget,
                     )
                     if not new_qual_val_id:
                         continue
@@ -875,7 +1715,7 @@ class WikidataImporter:
                     continue
                 else:
                     self._convert_entity_links(
-                        snak=qual_val,
+                        snak=qual_val, budget=budget,
                     )
                 qual_val["property"] = new_qual_id
                 new_qual_list.append(qual_val)
@@ -884,13 +1724,14 @@ class WikidataImporter:
         qualifiers = q.from_json(json_data=new_qual_dict)
         return qualifiers
 
-    def _convert_entity_links(self, snak):
+    def _convert_entity_links(self, snak, budget=None):
         """Function for in-place conversion of unit for quantity
         and globe for globecoordinate to a link to the local entity
         instead of a link to the wikidata entity.
 
         Args:
             snak: a wikibaseintegrator snak
+            budget: ImportBudget of the entity, see _import_claim_entities
 
         Returns:
             None
@@ -914,7 +1755,7 @@ class WikidataImporter:
         if "www.wikidata.org/" in link_string:
             uid = link_string.split("/")[-1]
             local_id = self._import_claim_entities(
-                wikidata_id=uid,
+                wikidata_id=uid, budget=budget,
             )
             data[key_string] = (
                 f"{self.wikibase_scheme}://{self.wikibase_host}/entity/{local_id}"
@@ -955,13 +1796,20 @@ class WikidataImporter:
             str or boolean: for local_id returns the local ID if it exists,
                 otherwise None. For has_all_claims, a boolean is returned.
         """
-        metadata = db.MetaData()
+        if parameter in ["local_id", "has_all_claims"] and self.id_snapshot is not None:
+            # Snapshot hits are final; misses are confirmed against the DB
+            cached = self.id_snapshot.get(wikidata_id)
+            if cached:
+                if parameter == "local_id":
+                    return cached[0]
+                if cached[1]:
+                    return True
 
         table_name = "items"
         if wikidata_id.startswith("P"):
             table_name = "properties"
 
-        table = db.Table(table_name, metadata, autoload_with=self.engine)
+        table = self._get_table(table_name)
 
         if parameter in ["local_id", "has_all_claims"]:
             sql = db.select(table.columns[parameter]).where(
@@ -1 +1,8 @@
-from .WikidataImporter import WikidataImporter
\ No newline at end of file
+from .WikidataImporter import WikidataImporter
+from .WikidataDumpReader import WikidataDumpReader
+from .IdMappingSnapshot import IdMappingSnapshot
+from .ImportPlanner import ImportPlanner
+from .ResolutionCache import ResolutionCache
+from .PersonRegistry import PersonRegistry
+from .ImportBudget import ImportBudget, ImportProfile
+from .EntityCache import EntityCache
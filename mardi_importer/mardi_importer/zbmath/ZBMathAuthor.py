@@ -1,5 +1,7 @@
 from wikibaseintegrator.wbi_helpers import execute_sparql_query, merge_items
 from mardi_importer import Importer
+from mardi_importer.wikidata import WikidataImporter
+from mardi_importer.wikidata.PersonRegistry import ZBMATH_AUTHOR
 
 class ZBMathAuthor:
     """
@@ -45,6 +47,10 @@ class ZBMathAuthor:
             #         "wd:Q5", "wdt:P1556", self.zbmath_author_id
             #     )
             # else:
+            registry = WikidataImporter().person_registry
+            self.QID = registry.get(ZBMATH_AUTHOR, self.zbmath_author_id)
+            if self.QID:
+                return item
             QID_list = self.api.search_entity_by_value(
                 "wdt:P1556", self.zbmath_author_id
             )
@@ -54,6 +60,7 @@ class ZBMathAuthor:
                 # should not be more than one
                 self.QID = QID_list[0]
                 print(f"Id for empty author found, QID {self.QID}")
+                registry.record(self.QID, **{ZBMATH_AUTHOR: self.zbmath_author_id})
             if self.QID:
                 return item
             else:
@@ -66,6 +73,9 @@ class ZBMathAuthor:
             return self.QID
         print(f"Creating author {self.name}")
         author_id = self.item.write().id
+        WikidataImporter().person_registry.record(
+            author_id, **{ZBMATH_AUTHOR: self.zbmath_author_id}
+        )
         return author_id
 
     def update(self):
@@ -1,50 +1,6 @@
 from .misc import search_item_by_property
 from mardi_importer import Importer
-
-license_dict = {
-    "http://arxiv.org/licenses/nonexclusive-distrib/1.0/": "Q6830561",
-    "https://arxiv.org/licenses/nonexclusive-distrib/1.0/": "Q6830561",
-    "https://creativecommons.org": "Q56978",
-    "https://creativecommons.org/": "Q56978",
-    "https://creativecommons.org/Licenses/by-nc-nd/4.0/": "Q6830565",
-    "https://creativecommons.org/Licenses/by/4.0/": "Q57056",
-    "https://creativecommons.org/licences/by/4.0/": "Q57056",
-    "https://creativecommons.org/licenses/": "Q56978",
-    "https://creativecommons.org/licenses/by-nc-by/4.0/": "Q57074",  # malformed, likely CC BY-NC 4.0
-    "https://creativecommons.org/licenses/by-nc-nd/3.0/": "Q6830563",
-    "https://creativecommons.org/licenses/by-nc-nd/4.0/": "Q6830565",
-    "https://creativecommons.org/licenses/by-nc-sa/3.0/": "Q57076",
-    "https://creativecommons.org/licenses/by-nc-sa/4.0/": "Q57078",
-    "https://creativecommons.org/licenses/by-nc/2.0/": "Q6830583",
-    "https://creativecommons.org/licenses/by-nc/2.5/": "Q6830578",  # Q26874140 not in portal
-    "https://creativecommons.org/licenses/by-nc/2/": "Q6830583",  # malformed, likely CC BY-NC 2.0
-    "https://creativecommons.org/licenses/by-nc/3.0/": "Q57072",
-    "https://creativecommons.org/licenses/by-nc/4.0/": "Q57074",
-    "https://creativecommons.org/licenses/by-nd/3.0/": "Q6830595",
-    "https://creativecommons.org/licenses/by-nd/4.0/": "Q6830589",
-    "https://creativecommons.org/licenses/by-sa/3.0/": "Q57029",
-    "https://creativecommons.org/licenses/by-sa/4.0/": "Q57038",
-    "https://creativecommons.org/licenses/by/1.0/": "Q6830600",
-    "https://creativecommons.org/licenses/by/2.0/": "Q6830597",
-    "https://creativecommons.org/licenses/by/2/": "Q6830597",  # malformed, likely CC BY 2.0
-    "https://creativecommons.org/licenses/by/3.0/": "Q57050",
-    "https://creativecommons.org/licenses/by/4.0/": "Q57056",
-    "https://creativecommons.org/licenses/by/4.0/legalcode": "Q57056",
-    "https://creativecommons.org/licenses/by/4/": "Q57056",  # malformed, likely CC BY 4.0
-    "https://creativecommons.org/licenses/by/4:0/": "Q57056",  # malformed, likely CC BY 4.0
-    "https://creativecommons.org/licenses/by/nc/4.0/": "Q57074",  # malformed, likely CC BY-NC 4.0
-    "https://creativecommons.org/licenses/ny/4.0/": "Q57056",  # malformed, likely CC BY 4.0
-    "https://creativecommons.org/publicdomain/mark/1.0/": "Q56990",
-    "https://creativecommons.org/publicdomain/zero/1.0/": "Q56468",
-    "http://creativecommons.org/publicdomain/zero/1.0/": "Q56468",
-    "http://creativecommons.org/licenses/by/4.0/": "Q57056",
-    "http://creativecommons.org/licenses/by/3.0/": "Q57050",
-    "http://creativecommons.org/licenses/by-nc-sa/3.0/": "Q57076",
-    "http://creativecommons.org/licenses/publicdomain/": "Q56990",
-    "http://creativecommons.org/licenses/by-sa/4.0/": "Q57038",
-    "http://creativecommons.org/licenses/by-nc-nd/4.0/": "Q6830565",
-    "http://creativecommons.org/licenses/by-nc-sa/4.0/": "Q57078",
-}
+from mardi_importer.utils.LicenseResolver import LicenseResolver
 
 
 class ZBMathPublication:
@@ -205,7 +161,7 @@ class ZBMathPublication:
         if self.licenses:
             license_claims = []
             for l in self.licenses:
-                license_qid = license_dict.get(l)
+                license_qid = LicenseResolver.zbmath_license(l)
                 if not license_qid:
                     continue
                 claim = self.api.get_claim("P163", license_qid)
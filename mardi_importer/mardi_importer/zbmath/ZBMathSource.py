@@ -12,21 +12,34 @@ from requests.exceptions import HTTPError, ContentDecodingError, ChunkedEncoding
 from urllib3.exceptions import IncompleteRead, ProtocolError
 from sickle import Sickle
 import pandas as pd
-import requests
 from time import sleep
 from ast import literal_eval
 
 from mardi_importer.base import ADataSource
+from mardi_importer.utils.HttpClient import HttpClient
+from mardi_importer.utils.LocalEntityFetcher import LocalEntityFetcher
 from .ZBMathPublication import ZBMathPublication
 from .ZBMathConfigParser import ZBMathConfigParser
 from .ZBMathAuthor import ZBMathAuthor
 from .ZBMathJournal import ZBMathJournal
 from .misc import get_tag, get_info_from_doi
 
+# Properties and items used in the import, by their key in label_id_dict
+LABEL_IDS = {
+    "de_number_prop": ("zbMATH DE Number", "property"),
+    "keyword_prop": ("zbMATH Keywords", "property"),
+    "review_prop": ("review text", "property"),
+    "mardi_profile_type_prop": ("MaRDI profile type", "property"),
+    "mardi_publication_profile_item": ("MaRDI publication profile", "item"),
+    "mardi_person_profile_item": ("MaRDI person profile", "item"),
+}
+
 
 class ZBMathSource(ADataSource):
     """Reads data from zb math API."""
 
+    setup_snapshot_version = 1
+
     def __init__(
         self,
         user,
@@ -45,6 +58,11 @@ class ZBMathSource(ADataSource):
         # load the list of swMath software
         # software_df = pd.read_csv(path)
         # self.software_list = software_df['Software'].tolist()
+
+        # The source is a singleton: later constructions in the same
+        # process reuse the authenticated instance and its setup results
+        if self.__class__ in ADataSource._initialized:
+            return
         super().__init__(user, password)
 
         conf_path = "/config/import_config.config"
@@ -84,7 +102,6 @@ class ZBMathSource(ADataSource):
         self.internal_tags = ["author_id", "source", "classifications", "links"]
         self.existing_authors = {}
         self.existing_journals = {}
-        self.setup()
 
     def setup(self):
         """Create all necessary properties and entities for zbMath"""
@@ -95,19 +112,34 @@ class ZBMathSource(ADataSource):
         # Create new required local entities
         # self.create_local_entities("/new_entities.json")
 
-        self.label_id_dict = {}
-        self.label_id_dict["de_number_prop"] = self.api.get_local_id_by_label( #de_number_prop
-            "zbMATH DE Number", "property"
-        )
-        self.label_id_dict["keyword_prop"] = self.api.get_local_id_by_label( #keyword_prop
-            "zbMATH Keywords", "property"
-        )
-        self.label_id_dict["review_prop"] = self.api.get_local_id_by_label("review text", "property")
-        self.label_id_dict["mardi_profile_type_prop"] = self.api.get_local_id_by_label("MaRDI profile type", "property")
-        self.label_id_dict["mardi_publication_profile_item"] = self.api.get_local_id_by_label(
-            "MaRDI publication profile", "item"
-        )[0]
-        self.label_id_dict["mardi_person_profile_item"] = self.api.get_local_id_by_label("MaRDI person profile", "item")[0]
+        self.resolve_label_ids()
+
+    def setup_snapshot(self):
+        # Labels not found are looked up again when restoring
+        return {"label_id_dict": {
+            key: local_id for key, local_id in self.label_id_dict.items() if local_id
+        }}
+
+    def restore_setup(self, data):
+        self.resolve_label_ids(data["label_id_dict"])
+
+    def resolve_label_ids(self, resolved=None):
+        """Look up the local ids of the properties and items used in the import.
+
+        Args:
+            resolved (dict): Local ids looked up before, which are not
+                looked up again
+        """
+        self.label_id_dict = {
+            key: local_id for key, local_id in (resolved or {}).items() if local_id
+        }
+        for key, (label, entity_type) in LABEL_IDS.items():
+            if key in self.label_id_dict:
+                continue
+            local_id = self.api.get_local_id_by_label(label, entity_type)
+            if entity_type == "item":
+                local_id = local_id[0] if local_id else None
+            self.label_id_dict[key] = local_id
 
     def pull(self):
         #self.write_subset_dump(file=)
@@ -141,7 +173,7 @@ class ZBMathSource(ADataSource):
                 retries = 0
                 while retries <= max_retries:
                     try:
-                        response = requests.get(url + de)
+                        response = HttpClient.get(url + de)
                         if response.status_code == 200:
                             data=response.json()
                             if not data["result"]:
@@ -196,7 +228,7 @@ class ZBMathSource(ADataSource):
                 params = {"start_after": start_after,
                             "results_per_request": 100}
                 try:
-                    response = requests.get(url, params=params, timeout=300)
+                    response = HttpClient.get(url, params=params, timeout=300)
                     if response.status_code == 200:
                         retries = 0
                         data=response.json()
@@ -768,33 +800,34 @@ class ZBMathSource(ADataSource):
                         if publication.is_arxiv():
                             print(f"Publication {document_title} is arXiv article")
                             arxiv_id = publication.zbl_id.split(":")[-1]
-                            arxiv_item = self.arxiv_exists(arxiv_id)
-                            if arxiv_item:
+                            arxiv_qid = self.arxiv_exists(arxiv_id)
+                            if arxiv_qid:
                                 print(f"arXiv Publication {document_title} already exists")
-                                changed = False
-                                label = str(arxiv_item.labels.get('en'))
-                                if not label:
-                                    if publication.title:
-                                        arxiv_item.labels.set(language='en', value=publication.title)
-                                        changed = True
+                                # One request for the label and the statements; the
+                                # item is only built when it has to be edited
+                                current = LocalEntityFetcher(self.api).fetch(
+                                    [arxiv_qid], ["P226", "P16"]
+                                ).get(arxiv_qid) or {"label": None, "claims": {}}
+                                set_label = not current["label"] and publication.title
                                 #add msc if they are not already there
-                                if not 'P226' in arxiv_item.claims.get_json().keys():
-                                    if publication.classifications:
+                                add_msc = not current["claims"].get("P226") and publication.classifications
+                                add_authors = not current["claims"].get("P16") and publication.authors
+                                if set_label or add_msc or add_authors:
+                                    arxiv_item = self.api.item.get(entity_id=arxiv_qid)
+                                    if set_label:
+                                        arxiv_item.labels.set(language='en', value=publication.title)
+                                    if add_msc:
                                         classification_claims = []
                                         for c in publication.classifications:
                                             claim = self.api.get_claim("P226", c)
                                             classification_claims.append(claim)
                                         arxiv_item.add_claims(classification_claims)
-                                        changed = True
-                                if not 'P16' in arxiv_item.claims.get_json().keys():
-                                    if publication.authors:
+                                    if add_authors:
                                         author_claims = []
                                         for author in publication.authors:
                                             claim = self.api.get_claim("wdt:P50", author)
                                             author_claims.append(claim)
                                         arxiv_item.add_claims(author_claims)
-                                        changed=True
-                                if changed:
                                     arxiv_item.write()
                             else:
                                 print(f"arXiv Publication {document_title} is new")
@@ -848,9 +881,7 @@ class ZBMathSource(ADataSource):
         arxiv_qid = self.api.search_entity_by_value("P21", arxiv_id)
         if not arxiv_qid:
             return None
-        arxiv_qid = arxiv_qid[0]
-        arxiv_item = self.api.item.get(entity_id=arxiv_qid)
-        return arxiv_item
+        return arxiv_qid[0]
 
     def get_de_number(self, xml_record):
         """
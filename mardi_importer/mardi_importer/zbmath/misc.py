@@ -1,9 +1,10 @@
 from habanero import Crossref
 from requests.exceptions import HTTPError
-import requests
 import pandas as pd
 import os
 
+from mardi_importer.utils.HttpClient import HttpClient
+
 
 def search_item_by_property(property_id,value):
     """
@@ -26,7 +27,7 @@ def search_item_by_property(property_id,value):
         "format": "json"
     }
     
-    response = requests.get(base_url, params=params)
+    response = HttpClient.get(base_url, params=params)
     # Raise an exception if the request was unsuccessful
     response.raise_for_status()
     
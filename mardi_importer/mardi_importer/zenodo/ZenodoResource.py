@@ -2,10 +2,12 @@ from mardiclient import MardiClient
 from mardi_importer import Importer
 from mardi_importer.wikidata import WikidataImporter
 from mardi_importer.utils import Author
+from mardi_importer.utils.HttpClient import HttpClient
+from mardi_importer.utils.LicenseResolver import LicenseResolver
 from .Community import Community
 from .Project import Project
 
-import urllib.request, json, re
+import re
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 
@@ -48,11 +50,8 @@ class ZenodoResource:
             self.api = Importer.get_api("zenodo")
         if self.wdi is None:
             self.wdi = WikidataImporter()
-        with urllib.request.urlopen(
-            f"https://zenodo.org/api/records/{self.zenodo_id}"
-        ) as url:
-            json_data = json.load(url)
-            self.metadata = json_data["metadata"]
+        json_data = HttpClient.get_json(f"https://zenodo.org/api/records/{self.zenodo_id}")
+        self.metadata = json_data["metadata"]
         if self.metadata:
             self.title = self.metadata["title"]
 
@@ -66,19 +65,7 @@ class ZenodoResource:
             # Get authors.
             item = self.api.item.get(self.QID)
             author_QID = item.get_value("wdt:P50") or []
-            for QID in author_QID:
-                author_item = self.api.item.get(entity_id=QID)
-                name = str(author_item.labels.get("en"))
-                orcid = author_item.get_value("wdt:P496")
-                orcid = orcid[0] if orcid else None
-                aliases = []
-                if author_item.aliases.get("en"):
-                    for alias in author_item.aliases.get("en"):
-                        aliases.append(str(alias))
-                author = author_factory(
-                    self.api, name=name, orcid=orcid, _aliases=aliases, _QID=QID
-                )
-                self._authors.append(author)
+            self._authors += author_factory.from_items(self.api, author_QID)
             return self.QID
 
     @property
@@ -229,14 +216,9 @@ class ZenodoResource:
         )
         new_item = self.api.item.get(entity_id=zenodo_id)
 
-        if self.license["id"] == "cc-by-4.0":
-            new_item.add_claim("wdt:P275", "wd:Q20007257")
-        elif self.license["id"] == "cc-by-sa-4.0":
-            new_item.add_claim("wdt:P275", "wd:Q18199165")
-        elif self.license["id"] == "cc-by-nc-sa-4.0":
-            new_item.add_claim("wdt:P275", "wd:Q42553662")
-        elif self.license["id"] == "mit-license":
-            new_item.add_claim("wdt:P275", "wd:Q334661")
+        license_QID = LicenseResolver.zenodo_license(self.license["id"])
+        if license_QID:
+            new_item.add_claim("wdt:P275", license_QID)
 
         return new_item.write()
 
@@ -295,14 +277,9 @@ class ZenodoResource:
 
         # License
         if self.license:
-            if self.license["id"] == "cc-by-4.0":
-                item.add_claim("wdt:P275", "wd:Q20007257", action=update_claim)
-            elif self.license["id"] == "cc-by-sa-4.0":
-                item.add_claim("wdt:P275", "wd:Q18199165", action=update_claim)
-            elif self.license["id"] == "cc-by-nc-sa-4.0":
-                item.add_claim("wdt:P275", "wd:Q42553662", action=update_claim)
-            elif self.license["id"] == "mit-license":
-                item.add_claim("wdt:P275", "wd:Q334661", action=update_claim)
+            license_QID = LicenseResolver.zenodo_license(self.license["id"])
+            if license_QID:
+                item.add_claim("wdt:P275", license_QID, action=update_claim)
 
         if self.version:
             if self.resource_type:
@@ -359,6 +336,7 @@ class ZenodoResource:
             Author claims to be added (P50 entity claims and/or P2093 string claims).
         """
         claims = []
+        Author.resolve_orcids(self.authors)
         for author in self.authors:
             if author.orcid or author.QID:
                 if not author.QID:
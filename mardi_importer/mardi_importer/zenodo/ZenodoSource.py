@@ -5,6 +5,7 @@ import time
 import pandas as pd
 
 from mardi_importer.base import ADataSource
+from mardi_importer.utils.HttpClient import HttpClient
 from .ZenodoResource import ZenodoResource
 from typing import List
 
@@ -68,7 +69,7 @@ class ZenodoSource(ADataSource):
     def get_with_retries(url, params, retries=5, base_wait=3):
         for attempt in range(retries):
             try:
-                response = requests.get(url, params=params, timeout=10)
+                response = HttpClient.get(url, params=params, timeout=10)
 
                 if response.status_code == 429:
                     wait_time = base_wait * (2 ** attempt)
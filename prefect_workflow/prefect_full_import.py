@@ -87,6 +87,24 @@ def _load_progress(step: str) -> dict | None:
     return checkpoint.get("step_progress", {}).get(step)
 
 
+# ── Source helper ────────────────────────────────────────────────────────────
+
+_zbmath = None
+
+
+def _zbmath_source() -> ZBMathSource:
+    """Return the zbMath source shared by all tasks of the worker process.
+
+    The source logs in and restores its setup results (see
+    ZBMathSource.setup_snapshot) only once per process.
+    """
+    global _zbmath
+    if _zbmath is None:
+        password = Secret.load("importer-zbmath-password").get()
+        _zbmath = ZBMathSource(user="zbMATH-Importer", password=password)
+    return _zbmath
+
+
 # ── Test tasks ──────────────────────────────────────────
 
 @task(name="write_test")
@@ -165,9 +183,7 @@ def download_raw_dump(start_after: Optional[str] = None) -> str:
 
     log = get_run_logger()
 
-    user = "zbMATH-Importer"
-    password = Secret.load("importer-zbmath-password").get()
-    source = ZBMathSource(user=user, password=password)
+    source = _zbmath_source()
     source.out_dir = DATA_DIR + "/"
 
     progress = _load_progress("download_raw_dump")
@@ -205,9 +221,7 @@ def convert_raw_to_processed(raw_dump_path: str) -> str:
 
     log = get_run_logger()
 
-    user = "zbMATH-Importer"
-    password = Secret.load("importer-zbmath-password").get()
-    source = ZBMathSource(user=user, password=password)
+    source = _zbmath_source()
     source.out_dir = DATA_DIR + "/"
 
     progress = _load_progress("convert_raw_to_processed")
@@ -293,10 +307,7 @@ def push_zbmath(dump_path: str, label: str = "") -> str:
     log.info("Pushing zbMath data (%s) from %s", label, dump_path)
 
 
-    user = "zbMATH-Importer"
-    password = Secret.load("importer-zbmath-password").get()
-
-    source = ZBMathSource(user=user, password=password)
+    source = _zbmath_source()
     source.processed_dump_path = dump_path
     step_key = f"push_zbmath_{label}"
     progress = _load_progress(step_key)
@@ -323,9 +334,7 @@ def run_references(dump_path: str, label: str = "") -> str:
     log = get_run_logger()
     log.info("Running reference pass (%s) for %s", label, dump_path)
 
-    user = "zbMATH-Importer"
-    password = Secret.load("importer-zbmath-password").get()
-    source = ZBMathSource(user=user, password=password)
+    source = _zbmath_source()
 
     step_key = f"run_references_{label}"
     progress = _load_progress(step_key)
@@ -44,19 +44,18 @@ def import_doi_batch(dois: List[str]) -> Dict[str, Any]:
     all_ok = True
     log.debug("Registered sources: %s", ", ".join(Importer._sources.keys()))
 
-    # The following "create_source" calls trigger the respective source setups,
-    # which imports required Wikidata entities into the local Wikibase.
+    # Creating the sources triggers the respective source setups, which
+    # import required Wikidata entities into the local Wikibase.
     # See e.g. ArxivSource.py -> setup()
-    # Note: This can take a while.
+    # The Wikidata entities of all sources are imported once, as a single
+    # batch, and the sources are then created concurrently; this can still
+    # take a while.
 
-    log.debug("Creating source handler arxiv")
-    arxiv = Importer.create_source("arxiv")
-
-    log.debug("Creating source handler zenode")
-    zenodo = Importer.create_source("zenodo")
-
-    log.debug("Creating source handler crossref")
-    crossref = Importer.create_source("crossref")
+    log.debug("Creating source handlers arxiv, zenodo, crossref")
+    sources = Importer.create_sources(["arxiv", "zenodo", "crossref"])
+    arxiv = sources["arxiv"]
+    zenodo = sources["zenodo"]
+    crossref = sources["crossref"]
 
     log.debug("Creating source handlers done")
 
@@ -201,6 +200,13 @@ def import_wikidata_batch(qids: List[str]) -> Dict[str, Any]:
 
     log.info("Starting batch import for Wikidata items: %s", ", ".join(qids))
 
+    # Import the dependencies shared by the whole batch once and in bulk;
+    # failures are reported per QID by the imports below.
+    try:
+        wdi.prepare_batch(qids)
+    except Exception as e:
+        log.warning("Preparing wikidata batch failed: %s", e, exc_info=True)
+
     for q in qids:
         try:
             imported_q = wdi.import_entities(q)
@@ -218,6 +224,9 @@ def import_wikidata_batch(qids: List[str]) -> Dict[str, Any]:
                 "qid": imported_q,
                 "status": status,
             }
+            skipped_claims = wdi.skipped_claims.pop(q, None)
+            if skipped_claims:
+                results[q]["skipped_claims"] = skipped_claims
 
             if not ok:
                 all_ok = False
@@ -230,6 +239,7 @@ def import_wikidata_batch(qids: List[str]) -> Dict[str, Any]:
                 "error": str(e),
             }
             all_ok = False
+    wdi.clear_prefetched()
 
     return {
         "qids": qids,
@@ -10,7 +10,6 @@ import requests
 from mardiclient import MardiClient
 
 from mardi_importer import Importer
-from mardi_importer.cran.RPackage import RPackage
 from mardi_importer.wikidata import WikidataImporter
 from services.item_schemas import resolve_typed_item
 
@@ -19,7 +18,6 @@ DEFAULT_WORKFLOW_NAME = "mardi-importer/prefect-mardi-importer"
 
 log = logging.getLogger(__name__)
 
-
 def normalize_list(value: Any) -> list[str]:
     """Normalize a value into a list of non-empty strings.
 
@@ -360,6 +358,13 @@ def import_wikidata_sync(qids: list[str], languages=None) -> tuple[dict, bool]:
     results: dict[str, dict] = {}
     all_ok = True
 
+    # Import the dependencies shared by the whole batch once and in bulk;
+    # failures are reported per QID by the imports below.
+    try:
+        wdi.prepare_batch(qids)
+    except Exception as exc:
+        log.warning("preparing wikidata batch failed: %s", exc, exc_info=True)
+
     for qid in qids:
         try:
             imported_q = wdi.import_entities(qid)
@@ -372,12 +377,16 @@ def import_wikidata_sync(qids: list[str], languages=None) -> tuple[dict, bool]:
                 status = "success"
                 ok = True
             results[qid] = {"qid": imported_q, "status": status}
+            skipped_claims = wdi.skipped_claims.pop(qid, None)
+            if skipped_claims:
+                results[qid]["skipped_claims"] = skipped_claims
             if not ok:
                 all_ok = False
         except Exception as exc:
             log.error("importing wikidata failed: %s", exc, exc_info=True)
             results[qid] = {"qid": None, "status": "error", "error": str(exc)}
             all_ok = False
+    wdi.clear_prefetched()
 
     payload = {
         "qids": qids,
@@ -397,6 +406,10 @@ def import_cran_sync(packages: list[str]) -> tuple[dict, bool]:
     Returns:
         Tuple of payload and overall success flag.
     """
+    # Imported here, since the CRAN package module pulls in pandas and
+    # the arxiv, crossref and zenodo sources
+    from mardi_importer.cran.RPackage import RPackage
+
     results: dict[str, dict] = {}
     all_ok = True
     cran = Importer.create_source("cran")
@@ -755,9 +768,10 @@ def import_doi_sync(dois: list[str]) -> tuple[dict, bool]:
     doi_list = [doi.upper() for doi in dois]
     results: dict[str, dict] = {}
     all_ok = True
-    arxiv = Importer.create_source("arxiv")
-    zenodo = Importer.create_source("zenodo")
-    crossref = Importer.create_source("crossref")
+    sources = Importer.create_sources(["arxiv", "zenodo", "crossref"])
+    arxiv = sources["arxiv"]
+    zenodo = sources["zenodo"]
+    crossref = sources["crossref"]
 
     for doi in doi_list:
         log.info("Importing for doi %s", doi)
@@ -0,0 +1,83 @@
+import importlib.util
+import sys
+import types
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+AUTHOR_PATH = REPO_ROOT / "mardi_importer" / "mardi_importer" / "utils" / "Author.py"
+
+
+def _module(name, **attributes):
+    module = types.ModuleType(name)
+    for key, value in attributes.items():
+        setattr(module, key, value)
+    return module
+
+
+def _load_author():
+    fakes = {
+        "mardiclient": _module("mardiclient", MardiClient=object, MardiItem=object),
+        "mardi_importer.wikidata": _module("mardi_importer.wikidata", WikidataImporter=MagicMock),
+        "mardi_importer.wikidata.PersonRegistry": _module(
+            "mardi_importer.wikidata.PersonRegistry", ORCID="orcid", ARXIV_AUTHOR="arxiv_author"
+        ),
+        "mardi_importer.utils.AuthorChangeSet": _module(
+            "mardi_importer.utils.AuthorChangeSet", AuthorChangeSet=MagicMock
+        ),
+        "mardi_importer.utils.AuthorIndex": _module(
+            "mardi_importer.utils.AuthorIndex", AuthorIndex=MagicMock()
+        ),
+        "mardi_importer.utils.LocalEntityFetcher": _module(
+            "mardi_importer.utils.LocalEntityFetcher", LocalEntityFetcher=MagicMock
+        ),
+        "mardi_importer.utils.OrcidResolver": _module(
+            "mardi_importer.utils.OrcidResolver", OrcidResolver=MagicMock
+        ),
+        "mardi_importer.utils.ParsedName": _module(
+            "mardi_importer.utils.ParsedName",
+            ParsedName=MagicMock(capitalize=lambda name: name),
+        ),
+        "nameparser.config": _module("nameparser.config", CONSTANTS=MagicMock()),
+    }
+    spec = importlib.util.spec_from_file_location("author_under_test", AUTHOR_PATH)
+    module = importlib.util.module_from_spec(spec)
+    with patch.dict(sys.modules, fakes):
+        spec.loader.exec_module(module)
+    return module.Author
+
+
+Author = _load_author()
+
+
+class TestAuthorQID(unittest.TestCase):
+    def setUp(self) -> None:
+        self.api = MagicMock()
+        self.api.search_entity_by_value.return_value = []
+        self.wdi = MagicMock()
+        self.wdi.person_registry.get.return_value = None
+
+    def test_unresolved_author_is_looked_up_once(self) -> None:
+        author = Author(self.api, name="Ada Lovelace", orcid="0000-0001", wdi=self.wdi)
+
+        for _ in range(3):
+            self.assertIsNone(author.QID)
+
+        self.assertEqual(self.wdi.person_registry.get.call_count, 2)
+        self.api.search_entity_by_value.assert_called_once_with("wdt:P496", "0000-0001")
+
+    def test_registry_hit_skips_the_search(self) -> None:
+        self.wdi.person_registry.get.side_effect = lambda scheme, identifier: (
+            "Q7" if scheme == "arxiv_author" else None
+        )
+        author = Author(self.api, name="Ada Lovelace", arxiv_id="lovelace_a_1", wdi=self.wdi)
+
+        self.assertEqual(author.QID, "Q7")
+        self.assertEqual(author.QID, "Q7")
+        self.api.search_entity_by_value.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
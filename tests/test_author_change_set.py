@@ -0,0 +1,105 @@
+import importlib.util
+import sys
+import types
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CHANGE_SET_PATH = REPO_ROOT / "mardi_importer" / "mardi_importer" / "utils" / "AuthorChangeSet.py"
+
+
+class FakeFetcher:
+    """Reads the claims of the fake items of a test."""
+
+    def __init__(self, api):
+        self.api = api
+
+    def fetch_claims(self, entity_ids, properties):
+        return {
+            qid: {prop: self.api.item.get(entity_id=qid).get_value(prop) for prop in properties}
+            for qid in entity_ids
+        }
+
+
+def _load_change_set():
+    fetcher_module = types.ModuleType("mardi_importer.utils.LocalEntityFetcher")
+    fetcher_module.LocalEntityFetcher = FakeFetcher
+    spec = importlib.util.spec_from_file_location("author_change_set_under_test", CHANGE_SET_PATH)
+    module = importlib.util.module_from_spec(spec)
+    with patch.dict(sys.modules, {"mardi_importer.utils.LocalEntityFetcher": fetcher_module}):
+        spec.loader.exec_module(module)
+    return module.AuthorChangeSet
+
+
+AuthorChangeSet = _load_change_set()
+
+
+def _item(label, aliases=(), values=None):
+    item = MagicMock()
+    item.labels.get.return_value = label
+    item.aliases.get.return_value = list(aliases)
+    item.get_value.side_effect = lambda prop: (values or {}).get(prop, [])
+    return item
+
+
+class TestAuthorChangeSet(unittest.TestCase):
+    def setUp(self) -> None:
+        self.api = MagicMock()
+        self.items = {}
+        self.api.item.get.side_effect = lambda entity_id: self.items[entity_id]
+        self.changes = AuthorChangeSet(self.api)
+
+    def test_edits_are_combined_into_one_write_per_item(self) -> None:
+        self.items["Q1"] = _item("J. Doe")
+        self.changes.relabel("Q1", "Jane Doe", ["J. Doe"])
+        self.changes.relabel("Q1", "Jane Alice Doe", ["J. Doe", "Jane Doe"])
+        self.changes.add_claim("Q1", "wdt:P496", "0000-0001", if_missing=True)
+        self.changes.add_claim("Q1", "wdt:P4594", "doe_j_1", if_missing=True)
+
+        self.assertEqual(self.changes.flush(), 1)
+
+        item = self.items["Q1"]
+        self.api.item.get.assert_called_with(entity_id="Q1")
+        item.labels.set.assert_called_once_with(language="en", value="Jane Alice Doe")
+        item.aliases.set.assert_called_once_with(language="en", values=["J. Doe", "Jane Doe"])
+        self.assertEqual(item.add_claim.call_count, 2)
+        item.write.assert_called_once()
+
+    def test_unchanged_items_are_not_written(self) -> None:
+        self.items["Q2"] = _item("Jane Doe", ["J. Doe"], values={"wdt:P496": ["0000-0001"]})
+        self.changes.relabel("Q2", "Jane Doe", ["J. Doe"])
+        self.changes.add_claim("Q2", "wdt:P496", "0000-0001", if_missing=True)
+
+        self.assertEqual(self.changes.flush(), 0)
+
+        self.items["Q2"].write.assert_not_called()
+
+    def test_items_with_present_claims_are_not_fetched(self) -> None:
+        self.items["Q4"] = _item("Jane Doe", values={"wdt:P496": ["0000-0001"]})
+        self.items["Q5"] = _item("John Doe")
+        self.changes.add_claim("Q4", "wdt:P496", "0000-0001", if_missing=True)
+        self.changes.add_claim("Q5", "wdt:P496", "0000-0002", if_missing=True)
+        self.api.item.get.reset_mock()
+
+        with patch.object(FakeFetcher, "fetch_claims", return_value={
+            "Q4": {"wdt:P496": ["0000-0001"]}, "Q5": {"wdt:P496": []},
+        }) as fetch_claims:
+            self.assertEqual(self.changes.flush(), 1)
+
+        fetch_claims.assert_called_once()
+        self.api.item.get.assert_called_once_with(entity_id="Q5")
+        self.items["Q4"].write.assert_not_called()
+
+    def test_flush_clears_pending_edits(self) -> None:
+        self.items["Q3"] = _item("Jane Doe")
+        self.changes.add_claim("Q3", "wdt:P108", "Q9")
+        self.changes.flush()
+
+        self.assertEqual(self.changes.flush(), 0)
+        self.items["Q3"].write.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
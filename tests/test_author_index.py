@@ -0,0 +1,211 @@
+import importlib.util
+import os
+import sys
+import time
+import types
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+UTILS_PATH = REPO_ROOT / "mardi_importer" / "mardi_importer" / "utils"
+# Seconds allowed for normalizing one benchmark pool
+NORMALIZATION_TIME_BUDGET = float(os.environ.get("MARDI_NAME_BENCHMARK_BUDGET", "2.0"))
+
+
+class FakeHumanName:
+    """Splits "First Last" names; enough for the matching rules."""
+
+    parsed = 0
+
+    def __init__(self, name):
+        FakeHumanName.parsed += 1
+        parts = name.split()
+        self.first = parts[0] if len(parts) > 1 else ""
+        self.middle = " ".join(parts[1:-1])
+        self.last = parts[-1] if parts else ""
+        self.capitalized = name
+
+    def capitalize(self, force=False):
+        self.capitalized = " ".join(part.capitalize() for part in self.capitalized.split())
+
+    def __str__(self):
+        return self.capitalized
+
+
+def _load_utils_module(name, modules):
+    spec = importlib.util.spec_from_file_location(f"{name}_under_test", UTILS_PATH / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    with patch.dict(sys.modules, modules):
+        spec.loader.exec_module(module)
+    return module
+
+
+def _load_author_index():
+    nameparser = types.ModuleType("nameparser")
+    nameparser.HumanName = FakeHumanName
+    parsed_name = _load_utils_module("ParsedName", {"nameparser": nameparser})
+    author_index = _load_utils_module(
+        "AuthorIndex", {"mardi_importer.utils.ParsedName": parsed_name}
+    )
+    return author_index.AuthorIndex, parsed_name.ParsedName
+
+
+AuthorIndex, ParsedName = _load_author_index()
+
+
+class FakeAuthor:
+    def __init__(self, name, orcid=None):
+        self.name = name
+        self.orcid = orcid
+        self.merged = [name]
+
+    def __add__(self, other):
+        longest = max(self.name, other.name, key=len)
+        merged = FakeAuthor(longest, self.orcid or other.orcid)
+        merged.merged = self.merged + other.merged
+        return merged
+
+    def __eq__(self, other):
+        # Reference implementation: the pairwise comparison of Author.__eq__
+        if self.orcid and self.orcid == other.orcid:
+            return True
+        return AuthorIndex.names_match(
+            AuthorIndex.parse(self.name), AuthorIndex.parse(other.name)
+        )
+
+
+def _pairwise_disambiguate(authors):
+    """The former quadratic disambiguation, used as reference."""
+    disambiguated = []
+    for author in authors:
+        if author not in disambiguated:
+            disambiguated.append(author)
+        else:
+            index = disambiguated.index(author)
+            disambiguated[index] += author
+    return disambiguated
+
+
+class TestAuthorIndex(unittest.TestCase):
+    def test_names_match_rules(self) -> None:
+        match = AuthorIndex.names_match
+        self.assertTrue(match(("Jane", "Doe"), ("Jane", "Doe")))
+        self.assertTrue(match(("Jean-Luc", "Picard"), ("jeanluc", "PICARD")))
+        self.assertTrue(match(("J.", "Doe"), ("Jane", "Doe")))
+        self.assertTrue(match(("Jane", "Doe"), ("J.", "Doe")))
+        self.assertTrue(match(("Jane", "D."), ("Jane", "Doe")))
+        self.assertFalse(match(("Jane", "Doe"), ("John", "Doe")))
+        self.assertFalse(match(("J.", "Doe"), ("", "Doe")))
+
+    def test_disambiguate_merges_by_orcid_and_name(self) -> None:
+        authors = [
+            FakeAuthor("Jane Doe"),
+            FakeAuthor("John Smith", orcid="0000-0001"),
+            FakeAuthor("J. Doe"),
+            FakeAuthor("Johnny Smithers", orcid="0000-0001"),
+            FakeAuthor("Ada Lovelace"),
+            FakeAuthor("Ada L."),
+        ]
+
+        disambiguated = AuthorIndex.disambiguate(authors)
+
+        self.assertEqual(
+            [author.merged for author in disambiguated],
+            [
+                ["Jane Doe", "J. Doe"],
+                ["John Smith", "Johnny Smithers"],
+                ["Ada Lovelace", "Ada L."],
+            ],
+        )
+
+    def test_disambiguate_matches_pairwise_comparison(self) -> None:
+        names = [
+            "Jane Doe", "J. Doe", "Jane D.", "jane doe", "John Doe", "Jo Doe",
+            "Anne-Marie Curie", "AnneMarie Curie", "A. Curie", "Anne C.",
+            "Pierre Curie", "P. Curie", "Doe", "", "R Core",
+        ]
+        authors = [FakeAuthor(name) for name in names * 3]
+        reference = [FakeAuthor(name) for name in names * 3]
+
+        self.assertEqual(
+            [author.merged for author in AuthorIndex.disambiguate(authors)],
+            [author.merged for author in _pairwise_disambiguate(reference)],
+        )
+
+    def test_disambiguate_parses_each_name_once(self) -> None:
+        authors = [FakeAuthor(f"First{i} Last{i}") for i in range(500)]
+        ParsedName.cache_clear()
+        FakeHumanName.parsed = 0
+
+        disambiguated = AuthorIndex.disambiguate(authors)
+
+        self.assertEqual(len(disambiguated), 500)
+        self.assertEqual(FakeHumanName.parsed, 500)
+
+
+class TestParsedName(unittest.TestCase):
+    def setUp(self) -> None:
+        ParsedName.cache_clear()
+        FakeHumanName.parsed = 0
+
+    def test_names_are_parsed_once(self) -> None:
+        for _ in range(3):
+            parsed = ParsedName.parse("Jane Alice Doe")
+            self.assertEqual(ParsedName.capitalize("jane doe"), "Jane Doe")
+
+        self.assertEqual(parsed, ("Jane", "Alice", "Doe"))
+        self.assertEqual(parsed.last, "Doe")
+        self.assertEqual(FakeHumanName.parsed, 2)
+
+    def test_merge_keeps_longest_parts(self) -> None:
+        self.assertEqual(ParsedName.merge("J. Alice Doe", "Jane Doe"), "Jane Alice Doe")
+        self.assertEqual(ParsedName.merge("Doe", "Jane Doe"), "Jane Doe")
+
+
+class TestAuthorNormalizationBenchmark(unittest.TestCase):
+    """Micro-benchmark of author normalization with memoized names.
+
+    Replays the author pools of an author-heavy CRAN package and of a polyDB
+    collection: every author is capitalized on construction, compared while
+    disambiguating and merged with its duplicates.
+    """
+
+    def _normalize(self, names):
+        authors = [FakeAuthor(ParsedName.capitalize(name)) for name in names]
+        disambiguated = AuthorIndex.disambiguate(authors)
+        for author in disambiguated:
+            for name in author.merged:
+                ParsedName.merge(author.name, name)
+        return disambiguated
+
+    def _assert_parsed_once(self, names, expected_authors):
+        ParsedName.cache_clear()
+        FakeHumanName.parsed = 0
+
+        start = time.perf_counter()
+        disambiguated = self._normalize(names)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(len(disambiguated), expected_authors)
+        # Each distinct name is capitalized once and its capitalized form parsed once
+        self.assertLessEqual(FakeHumanName.parsed, 2 * len(set(names)))
+        self.assertLess(elapsed, NORMALIZATION_TIME_BUDGET)
+
+    def test_cran_package_authors(self) -> None:
+        # About 150 contributors, listed with full and abbreviated names
+        # in the DESCRIPTION author fields and the package metadata
+        names = []
+        for i in range(150):
+            names += [f"author{i} middle{i} surname{i}", f"A. surname{i}", f"Author{i} Surname{i}"]
+        self._assert_parsed_once(names * 4, 150)
+
+    def test_polydb_collection_authors(self) -> None:
+        # A collection of 2000 polytopes shared among 40 authors
+        names = [f"Contributor{i % 40} Collection{i % 40}" for i in range(2000)]
+        self._assert_parsed_once(names, 40)
+
+
+if __name__ == "__main__":
+    unittest.main()
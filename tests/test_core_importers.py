@@ -1,9 +1,13 @@
+import json
 import unittest
-from unittest.mock import patch, Mock, MagicMock, mock_open
+from unittest.mock import patch, Mock, MagicMock
 import os
 import sys
+import tempfile
+import threading
 import types
 import logging
+from pathlib import Path
 
 from tests.prefect_stub import install_prefect_stub
 
@@ -53,6 +57,10 @@ def _install_mardi_importer_inner_stub() -> None:
             cls._apis[name] = getattr(source, "api", None)
             return source
 
+        @classmethod
+        def create_sources(cls, names):
+            return {name: cls.create_source(name) for name in dict.fromkeys(names)}
+
         @classmethod
         def get_api(cls, *_args, **_kwargs):
             return Mock()
@@ -147,6 +155,9 @@ def _install_sqlalchemy_stub() -> None:
 
     sqlalchemy_module = types.ModuleType("sqlalchemy")
     schema_module = types.ModuleType("sqlalchemy.schema")
+    exc_module = types.ModuleType("sqlalchemy.exc")
+    dialects_module = types.ModuleType("sqlalchemy.dialects")
+    mysql_module = types.ModuleType("sqlalchemy.dialects.mysql")
 
     class MetaData:
         def create_all(self, *_args, **_kwargs):
@@ -172,6 +183,16 @@ def _install_sqlalchemy_stub() -> None:
     class Integer:
         pass
 
+    class BigInteger:
+        pass
+
+    class String:
+        def __init__(self, *_args, **_kwargs):
+            pass
+
+    class Text:
+        pass
+
     class Boolean:
         def __init__(self, *_args, **_kwargs):
             pass
@@ -182,19 +203,44 @@ def _install_sqlalchemy_stub() -> None:
     def inspect(*_args, **_kwargs):
         return Mock(has_table=Mock(return_value=False))
 
+    def text(sql):
+        return sql
+
+    class SQLAlchemyError(Exception):
+        pass
+
+    class IntegrityError(SQLAlchemyError):
+        pass
+
+    def insert(*_args, **_kwargs):
+        return MagicMock()
+
     schema_module.MetaData = MetaData
+    exc_module.SQLAlchemyError = SQLAlchemyError
+    exc_module.IntegrityError = IntegrityError
+    mysql_module.insert = insert
+    dialects_module.mysql = mysql_module
 
     sqlalchemy_module.MetaData = MetaData
     sqlalchemy_module.Table = Table
     sqlalchemy_module.Column = Column
     sqlalchemy_module.Integer = Integer
+    sqlalchemy_module.BigInteger = BigInteger
+    sqlalchemy_module.String = String
+    sqlalchemy_module.Text = Text
     sqlalchemy_module.Boolean = Boolean
     sqlalchemy_module.create_engine = create_engine
     sqlalchemy_module.inspect = inspect
+    sqlalchemy_module.text = text
     sqlalchemy_module.schema = schema_module
+    sqlalchemy_module.exc = exc_module
+    sqlalchemy_module.dialects = dialects_module
 
     sys.modules["sqlalchemy"] = sqlalchemy_module
     sys.modules["sqlalchemy.schema"] = schema_module
+    sys.modules["sqlalchemy.exc"] = exc_module
+    sys.modules["sqlalchemy.dialects"] = dialects_module
+    sys.modules["sqlalchemy.dialects.mysql"] = mysql_module
 
 
 _install_sqlalchemy_stub()
@@ -381,6 +427,7 @@ def _install_requests_stub() -> None:
 
     requests_module = types.ModuleType("requests")
     exceptions_module = types.ModuleType("requests.exceptions")
+    adapters_module = types.ModuleType("requests.adapters")
 
     class HTTPError(Exception):
         pass
@@ -400,10 +447,33 @@ def _install_requests_stub() -> None:
     def post(*_args, **_kwargs):
         return Mock()
 
+    class Session:
+        def __init__(self):
+            self.adapters = {}
+
+        def mount(self, prefix, adapter):
+            self.adapters[prefix] = adapter
+
+        def request(self, *_args, **_kwargs):
+            return Mock(text="", content=b"", status_code=200)
+
+    class HTTPAdapter:
+        def __init__(self, *_args, **_kwargs):
+            pass
+
+    class Retry:
+        def __init__(self, *_args, **_kwargs):
+            pass
+
     requests_module.get = get
     requests_module.post = post
+    requests_module.Session = Session
+    requests_module.Response = Mock
     requests_module.HTTPError = HTTPError
     requests_module.exceptions = exceptions_module
+    requests_module.adapters = adapters_module
+    adapters_module.HTTPAdapter = HTTPAdapter
+    adapters_module.Retry = Retry
     exceptions_module.HTTPError = HTTPError
     exceptions_module.RequestException = RequestException
     exceptions_module.ContentDecodingError = ContentDecodingError
@@ -411,6 +481,7 @@ def _install_requests_stub() -> None:
 
     sys.modules["requests"] = requests_module
     sys.modules["requests.exceptions"] = exceptions_module
+    sys.modules["requests.adapters"] = adapters_module
 
 
 _install_requests_stub()
@@ -608,6 +679,10 @@ def _install_mardi_utils_stub() -> None:
 
     utils_module.Author = Author
     utils_module.__all__ = ["Author"]
+    # Helper modules without dependencies are imported from the checkout
+    utils_module.__path__ = [
+        str(Path(__file__).resolve().parents[1] / "mardi_importer" / "mardi_importer" / "utils")
+    ]
     author_module.Author = Author
 
     sys.modules["mardi_importer.utils"] = utils_module
@@ -657,6 +732,18 @@ WikidataImporterModule = importlib.import_module(
     "mardi_importer.mardi_importer.wikidata.WikidataImporter"
 )
 
+
+def _load_importer_module():
+    # The Importer of the package is replaced by the stub above
+    path = Path(__file__).resolve().parents[1] / "mardi_importer" / "mardi_importer" / "importer.py"
+    spec = importlib.util.spec_from_file_location("importer_under_test", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+ImporterModule = _load_importer_module()
+
 # Mock external dependencies (environment variables)
 MOCK_ENV_VARS = {
     "WIKIDATA_USER": "test_wd_user",
@@ -800,8 +887,8 @@ class TestCoreImporters(unittest.TestCase):
         mock_config.return_value = Mock(login=Mock())
 
         # Setup mocks for Mardiclient and its internal methods
-        mock_item_get = Mock()
-        mock_item_get.return_value = Mock(
+        mock_item_new = Mock()
+        mock_item_new.return_value.from_json.return_value = Mock(
             labels=Mock(values={"en": "Test Item", "de": "Test Gegenstand"}),
             descriptions=Mock(values={"en": "A test item"}),
             aliases=Mock(aliases={}),
@@ -817,7 +904,7 @@ class TestCoreImporters(unittest.TestCase):
         mock_property_obj.get.return_value = Mock()
 
         mock_mardi_client_instance = Mock(
-            item=Mock(get=mock_item_get),
+            item=Mock(new=mock_item_new),
             property=mock_property_obj,
             login=mock_config.return_value.login,  # Use the mocked Clientlogin from _config
         )
@@ -839,6 +926,12 @@ class TestCoreImporters(unittest.TestCase):
             mock_inspect.return_value.has_table.return_value = (
                 True  # Assume tables exist
             )
+            mock_inspect.return_value.get_columns.return_value = [
+                {"name": "lastrevid"}
+            ]
+            mock_inspect.return_value.get_indexes.return_value = [
+                {"unique": True, "column_names": ["wikidata_id"]}
+            ]
 
             # Reset singleton instance for proper re-initialization
             WikidataImporter._instance = None
@@ -847,11 +940,26 @@ class TestCoreImporters(unittest.TestCase):
             importer = WikidataImporter(languages=["en"])
 
             # Test with a valid QID
-            entity = importer._get_wikidata_information("Q123", recurse=False)
-
-            mock_item_get.assert_called_once_with(
-                entity_id="Q123", mediawiki_api_url="https://www.wikidata.org/w/api.php"
+            with patch.object(
+                WikidataImporterModule.wbi_helpers,
+                "mediawiki_api_call_helper",
+                create=True,
+                return_value={"entities": {"Q123": {"type": "item", "id": "Q123"}}},
+            ) as mock_api_call:
+                entity = importer._get_wikidata_information("Q123", recurse=False)
+
+            mock_api_call.assert_called_once_with(
+                data={
+                    "action": "wbgetentities",
+                    "ids": "Q123",
+                    "props": "info|labels|descriptions|aliases|datatype",
+                    "format": "json",
+                    "languages": "en",
+                },
+                mediawiki_api_url="https://www.wikidata.org/w/api.php",
+                allow_anonymous=True,
             )
+            mock_item_new.return_value.from_json.assert_called_once()
             self.assertEqual(entity.labels.values["en"], "Test Item")
             self.assertNotIn("de", entity.labels.values)  # Language filtering
             self.assertEqual(entity.descriptions.values["en"], "A test item")
@@ -865,6 +973,273 @@ class TestCoreImporters(unittest.TestCase):
                 importer._get_wikidata_information("X123")
 
 
+class TestSetupState(unittest.TestCase):
+    def test_content_hash_follows_setup_files(self) -> None:
+        SetupState = ADataSourceModule.SetupState
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "wikidata_entities.txt")
+            missing = os.path.join(tmpdir, "new_entities.json")
+            with open(path, "w") as f:
+                f.write("Q1\n")
+            first = SetupState.content_hash([path, missing])
+            self.assertEqual(first, SetupState.content_hash([missing, path]))
+
+            with open(path, "a") as f:
+                f.write("Q2\n")
+            self.assertNotEqual(first, SetupState.content_hash([path, missing]))
+
+    def test_mark_complete_is_a_single_upsert(self) -> None:
+        SetupStateModule = sys.modules[ADataSourceModule.SetupState.__module__]
+        state = SetupStateModule.SetupState(engine=MagicMock())
+        state._table = MagicMock()
+        connection = state.engine.connect.return_value.__enter__.return_value
+
+        with patch.object(SetupStateModule, "insert") as insert:
+            state.mark_complete("zbmath", "abc", {"local_entities": {}})
+
+        insert.return_value.values.assert_called_once()
+        upsert = insert.return_value.values.return_value.on_duplicate_key_update.return_value
+        connection.execute.assert_called_once_with(upsert)
+
+
+class TestCreateSources(unittest.TestCase):
+    def setUp(self) -> None:
+        self.Importer = ImporterModule.Importer
+        self.names = ["arxiv", "zenodo"]
+        for name in self.names:
+            self.Importer._sources.setdefault(name, Mock())
+
+    def test_sources_are_created_concurrently_after_shared_import(self) -> None:
+        both_started = threading.Barrier(2, timeout=5)
+
+        def create_source(name):
+            # Fails with BrokenBarrierError unless both run at the same time
+            both_started.wait()
+            return f"source {name}"
+
+        with patch.object(self.Importer, "_import_setup_entities", return_value=True), \
+                patch.object(self.Importer, "create_source", side_effect=create_source):
+            sources = self.Importer.create_sources(self.names)
+
+        self.assertEqual(sources, {"arxiv": "source arxiv", "zenodo": "source zenodo"})
+
+    def test_sources_are_created_sequentially_after_failed_import(self) -> None:
+        threads = []
+
+        def create_source(name):
+            threads.append(threading.current_thread())
+            return name
+
+        with patch.object(self.Importer, "_import_setup_entities", return_value=False), \
+                patch.object(self.Importer, "create_source", side_effect=create_source):
+            self.Importer.create_sources(self.names)
+
+        self.assertEqual(threads, [threading.current_thread()] * 2)
+
+
+class TestLabelIdCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.LabelIdCache = ADataSourceModule.LabelIdCache
+        self.LabelIdCache.clear()
+        self.addCleanup(self.LabelIdCache.clear)
+        self.resolve = Mock(side_effect=lambda label, entity_type: {
+            ("description", "property"): "P3",
+            ("scientific project", "item"): ["Q5"],
+        }.get((label, entity_type)))
+
+    def test_lookups_are_shared_between_clients(self) -> None:
+        first = self.LabelIdCache.install(Mock(get_local_id_by_label=self.resolve))
+        second = self.LabelIdCache.install(Mock(get_local_id_by_label=self.resolve))
+        self.LabelIdCache.install(first)
+
+        for _ in range(3):
+            self.assertEqual(first.get_local_id_by_label("description", "property"), "P3")
+            self.assertEqual(second.get_local_id_by_label("description", "property"), "P3")
+        items = first.get_local_id_by_label("scientific project", "item")
+        items.append("Q6")
+
+        self.assertEqual(second.get_local_id_by_label("scientific project", "item"), ["Q5"])
+        self.assertEqual(self.resolve.call_count, 2)
+
+    def test_missing_labels_are_not_cached(self) -> None:
+        api = self.LabelIdCache.install(Mock(get_local_id_by_label=self.resolve))
+
+        self.assertIsNone(api.get_local_id_by_label("imports", "property"))
+        self.assertIsNone(api.get_local_id_by_label("imports", "property"))
+        api.get_local_id_by_label("description", "property")
+        self.LabelIdCache.clear()
+        api.get_local_id_by_label("description", "property")
+
+        self.assertEqual(self.resolve.call_count, 4)
+
+
+class TestSetupSnapshot(unittest.TestCase):
+    class SnapshotSource(ADataSourceModule.ADataSource):
+        setup_snapshot_version = 2
+
+        def setup(self):
+            self.setup_calls = getattr(self, "setup_calls", 0) + 1
+            self.label_ids = {"review_prop": "P7"}
+
+        def setup_snapshot(self):
+            return {"label_ids": self.label_ids}
+
+        def restore_setup(self, data):
+            self.label_ids = data["label_ids"]
+
+        def pull(self):
+            pass
+
+        def push(self):
+            pass
+
+    def setUp(self) -> None:
+        patchers = [
+            patch.object(ADataSourceModule, "MardiClient"),
+            patch.object(ADataSourceModule, "WikidataImporter"),
+            patch.object(ADataSourceModule, "SetupState"),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.setup_state = ADataSourceModule.SetupState.return_value
+        ADataSourceModule.ADataSource._setup_state = None
+        self.addCleanup(setattr, ADataSourceModule.ADataSource, "_setup_state", None)
+        ADataSourceModule.ADataSource._instances.pop(self.SnapshotSource, None)
+        ADataSourceModule.ADataSource._initialized.discard(self.SnapshotSource)
+        ADataSourceModule.ADataSource._setup_complete.discard(self.SnapshotSource)
+
+    def test_setup_stores_snapshot(self) -> None:
+        self.setup_state.is_complete.return_value = False
+
+        source = self.SnapshotSource(user="user", password="pass")
+
+        self.assertEqual(source.setup_calls, 1)
+        self.setup_state.mark_complete.assert_called_once_with(
+            "SnapshotSource",
+            unittest.mock.ANY,
+            snapshot={"version": 2, "data": {"label_ids": {"review_prop": "P7"}}},
+        )
+
+    def test_snapshot_restored_instead_of_setup(self) -> None:
+        self.setup_state.is_complete.return_value = True
+        self.setup_state.load_snapshot.return_value = {
+            "version": 2,
+            "data": {"label_ids": {"review_prop": "P9"}},
+        }
+
+        source = self.SnapshotSource(user="user", password="pass")
+
+        self.assertFalse(hasattr(source, "setup_calls"))
+        self.assertEqual(source.label_ids, {"review_prop": "P9"})
+        self.setup_state.mark_complete.assert_not_called()
+
+    def test_outdated_snapshot_reruns_setup(self) -> None:
+        self.setup_state.is_complete.return_value = True
+        self.setup_state.load_snapshot.return_value = {"version": 1, "data": {}}
+
+        source = self.SnapshotSource(user="user", password="pass")
+
+        self.assertEqual(source.setup_calls, 1)
+        self.setup_state.mark_complete.assert_called_once()
+
+    def _write_entities_file(self, tmpdir):
+        with open(os.path.join(tmpdir, "new_entities.json"), "w") as f:
+            json.dump({
+                "properties": [
+                    {"label": "imports", "description": "imports", "datatype": "wikibase-item"},
+                ],
+                "items": [
+                    {"label": "License A", "description": "first"},
+                    {"label": "License B", "description": "second"},
+                ],
+            }, f)
+
+    def _restored_source(self, local_entities):
+        self.setup_state.is_complete.return_value = True
+        self.setup_state.load_snapshot.return_value = {
+            "version": 2,
+            "data": {"label_ids": {}},
+            "local_entities": local_entities,
+        }
+        return self.SnapshotSource(user="user", password="pass")
+
+    @patch.dict("os.environ", {"SPARQL_ENDPOINT_URL": "http://sparql"})
+    def test_create_local_entities_writes_only_missing(self) -> None:
+        source = self._restored_source({})
+        new_item = source.api.item.new.return_value
+        new_item.exists.return_value = None
+        new_item.write.return_value.id = "Q9"
+        bindings = [
+            {"entity": {"value": "http://wiki/entity/P5"}, "label": {"value": "imports"}},
+            {
+                "entity": {"value": "http://wiki/entity/Q7"},
+                "label": {"value": "License A"},
+                "description": {"value": "first"},
+            },
+        ]
+
+        with tempfile.TemporaryDirectory() as tmpdir, patch.object(
+            ADataSourceModule.wbi_helpers, "execute_sparql_query", create=True,
+            return_value={"results": {"bindings": bindings}},
+        ) as sparql:
+            self._write_entities_file(tmpdir)
+            source.filepath = tmpdir
+            source.create_local_entities("/new_entities.json")
+
+        sparql.assert_called_once()
+        source.api.property.new.assert_not_called()
+        new_item.write.assert_called_once()
+        self.assertEqual(source.local_entities, {
+            "property|imports": "P5",
+            "item|License A|first": "Q7",
+            "item|License B|second": "Q9",
+        })
+
+    def test_create_local_entities_uses_cached_ids(self) -> None:
+        cached = {
+            "property|imports": "P5",
+            "item|License A|first": "Q7",
+            "item|License B|second": "Q9",
+        }
+        source = self._restored_source(cached)
+
+        with tempfile.TemporaryDirectory() as tmpdir, patch.object(
+            ADataSourceModule.wbi_helpers, "execute_sparql_query", create=True
+        ) as sparql:
+            self._write_entities_file(tmpdir)
+            source.filepath = tmpdir
+            source.create_local_entities("/new_entities.json")
+
+        sparql.assert_not_called()
+        source.api.item.new.assert_not_called()
+        self.assertEqual(source.local_entities, cached)
+
+    @patch.dict("os.environ", {"SPARQL_ENDPOINT_URL": "http://sparql"})
+    def test_create_local_entities_ignores_ids_of_other_setup_files(self) -> None:
+        source = self._restored_source({"property|imports": "P5"})
+        # Only the snapshot of a previous version of the files is stored
+        self.setup_state.load_snapshot.side_effect = (
+            lambda name, content_hash=None: None if content_hash else {
+                "local_entities": {"property|imports": "P5"}
+            }
+        )
+        source.api.property.new.return_value.exists.return_value = "P6"
+        source.api.item.new.return_value.exists.return_value = "Q8"
+
+        with tempfile.TemporaryDirectory() as tmpdir, patch.object(
+            ADataSourceModule.wbi_helpers, "execute_sparql_query", create=True,
+            return_value={"results": {"bindings": []}},
+        ) as sparql:
+            self._write_entities_file(tmpdir)
+            source.filepath = tmpdir
+            source.create_local_entities("/new_entities.json")
+
+        sparql.assert_called_once()
+        self.assertIn("imports", sparql.call_args.kwargs["query"])
+        self.assertEqual(source.local_entities["property|imports"], "P6")
+
+
 class TestArxivSource(unittest.TestCase):
     def setUp(self) -> None:
         self.patcher_env = patch.dict("os.environ", MOCK_ENV_VARS)
@@ -887,14 +1262,10 @@ class TestArxivSource(unittest.TestCase):
     @patch.object(ADataSourceModule, "MardiClient")
     @patch.object(ADataSourceModule, "WikidataImporter")
     @patch.object(ArxivPublication, "__post_init__", return_value=None)
-    @patch("os.path.exists", return_value=False)  # To ensure setup() is called
-    @patch("os.makedirs")
-    @patch("builtins.open", new_callable=mock_open)  # Use mock_open
+    @patch.object(ADataSourceModule, "SetupState")
     def test_arxiv_source_init_and_setup(
         self,
-        mock_open,
-        mock_makedirs,
-        mock_path_exists,
+        mock_setup_state,
         mock_arxiv_post_init,
         mock_wikidata_importer,
         mock_mardi_client,
@@ -918,6 +1289,9 @@ class TestArxivSource(unittest.TestCase):
         ArxivSource._instances = {}
         ArxivSource._initialized = set()
         ArxivSource._setup_complete = set()
+        ADataSourceModule.ADataSource._setup_state = None
+        mock_setup_state.return_value.is_complete.return_value = False  # Setup not run yet
+        mock_wdi_instance.create_id_list_from_file.return_value = ["Q1", "Q2"]
 
         arxiv_source = ArxivSource(
             user=MOCK_ENV_VARS["ARXIV_USER"], password=MOCK_ENV_VARS["ARXIV_PASS"]
@@ -931,11 +1305,11 @@ class TestArxivSource(unittest.TestCase):
             wikibase_url=MOCK_ENV_VARS["WIKIBASE_URL"],
             importer_api_url=MOCK_ENV_VARS["IMPORTER_API_URL"],
         )
-        mock_wdi_instance.import_entities.assert_called_once_with(
-            filename=arxiv_source.filepath + "/wikidata_entities.txt"
+        mock_wdi_instance.create_id_list_from_file.assert_called_once_with(
+            arxiv_source.filepath + "/wikidata_entities.txt"
         )
-        self.assertTrue(mock_makedirs.called)
-        mock_open.assert_called_once()
+        mock_wdi_instance.import_missing_entities.assert_called_once_with(["Q1", "Q2"])
+        mock_setup_state.return_value.mark_complete.assert_called_once()
 
         # Test new_publication
         arxiv_publication = arxiv_source.new_publication("1234.56789")
@@ -967,14 +1341,10 @@ class TestCrossrefSource(unittest.TestCase):
     @patch.object(ADataSourceModule, "MardiClient")
     @patch.object(ADataSourceModule, "WikidataImporter")
     @patch.object(CrossrefPublication, "__post_init__", return_value=None)
-    @patch("os.path.exists", return_value=False)  # To ensure setup() is called
-    @patch("os.makedirs")
-    @patch("builtins.open", new_callable=mock_open)  # Use mock_open
+    @patch.object(ADataSourceModule, "SetupState")
     def test_crossref_source_init_and_setup(
         self,
-        mock_open,
-        mock_makedirs,
-        mock_path_exists,
+        mock_setup_state,
         mock_crossref_post_init,
         mock_wikidata_importer,
         mock_mardi_client,
@@ -996,6 +1366,9 @@ class TestCrossrefSource(unittest.TestCase):
         CrossrefSource._instances = {}
         CrossrefSource._initialized = set()
         CrossrefSource._setup_complete = set()
+        ADataSourceModule.ADataSource._setup_state = None
+        mock_setup_state.return_value.is_complete.return_value = False  # Setup not run yet
+        mock_wdi_instance.create_id_list_from_file.return_value = ["Q1", "Q2"]
 
         crossref_source = CrossrefSource(
             user=MOCK_ENV_VARS["CROSSREF_USER"], password=MOCK_ENV_VARS["CROSSREF_PASS"]
@@ -1009,11 +1382,11 @@ class TestCrossrefSource(unittest.TestCase):
             wikibase_url=MOCK_ENV_VARS["WIKIBASE_URL"],
             importer_api_url=MOCK_ENV_VARS["IMPORTER_API_URL"],
         )
-        mock_wdi_instance.import_entities.assert_called_once_with(
-            filename=crossref_source.filepath + "/wikidata_entities.txt"
+        mock_wdi_instance.create_id_list_from_file.assert_called_once_with(
+            crossref_source.filepath + "/wikidata_entities.txt"
         )
-        self.assertTrue(mock_makedirs.called)
-        mock_open.assert_called_once()
+        mock_wdi_instance.import_missing_entities.assert_called_once_with(["Q1", "Q2"])
+        mock_setup_state.return_value.mark_complete.assert_called_once()
 
         # Test new_publication
         crossref_publication = crossref_source.new_publication("10.1000/xyz123")
@@ -1044,14 +1417,10 @@ class TestZenodoSource(unittest.TestCase):
     @patch.object(ADataSourceModule, "WikidataImporter")
     @patch.object(ZenodoResource, "__post_init__", return_value=None)
     @patch.object(ADataSourceModule.ADataSource, "create_local_entities")
-    @patch("os.path.exists", return_value=False)  # To ensure setup() is called
-    @patch("os.makedirs")
-    @patch("builtins.open", new_callable=mock_open)  # Use mock_open
+    @patch.object(ADataSourceModule, "SetupState")
     def test_zenodo_source_init_and_setup(
         self,
-        mock_open,
-        mock_makedirs,
-        mock_path_exists,
+        mock_setup_state,
         mock_create_local_entities,
         mock_zenodo_post_init,
         mock_wikidata_importer,
@@ -1074,6 +1443,9 @@ class TestZenodoSource(unittest.TestCase):
         ZenodoSource._instances = {}
         ZenodoSource._initialized = set()
         ZenodoSource._setup_complete = set()
+        ADataSourceModule.ADataSource._setup_state = None
+        mock_setup_state.return_value.is_complete.return_value = False  # Setup not run yet
+        mock_wdi_instance.create_id_list_from_file.return_value = ["Q1", "Q2"]
 
         zenodo_source = ZenodoSource(
             user=MOCK_ENV_VARS["ZENODO_USER"], password=MOCK_ENV_VARS["ZENODO_PASS"]
@@ -1087,12 +1459,12 @@ class TestZenodoSource(unittest.TestCase):
             wikibase_url=MOCK_ENV_VARS["WIKIBASE_URL"],
             importer_api_url=MOCK_ENV_VARS["IMPORTER_API_URL"],
         )
-        mock_wdi_instance.import_entities.assert_called_once_with(
-            filename=zenodo_source.filepath + "/wikidata_entities.txt"
+        mock_wdi_instance.create_id_list_from_file.assert_called_once_with(
+            zenodo_source.filepath + "/wikidata_entities.txt"
         )
+        mock_wdi_instance.import_missing_entities.assert_called_once_with(["Q1", "Q2"])
         mock_create_local_entities.assert_called_once_with("/new_entities.json")
-        self.assertTrue(mock_makedirs.called)
-        mock_open.assert_called_once()
+        mock_setup_state.return_value.mark_complete.assert_called_once()
 
         # Test new_resource
         zenodo_resource = zenodo_source.new_resource("123456")
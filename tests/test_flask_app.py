@@ -310,7 +310,9 @@ class TestFlaskApp(unittest.TestCase):
             "services.import_service.Importer.create_source",
             return_value=cran_source,
         ):
-            with patch("services.import_service.RPackage", return_value=software):
+            rpackage_module = types.ModuleType("mardi_importer.cran.RPackage")
+            rpackage_module.RPackage = Mock(return_value=software)
+            with patch.dict(sys.modules, {"mardi_importer.cran.RPackage": rpackage_module}):
                 response, status = import_cran()
 
         self.assertEqual(status, 200)
@@ -0,0 +1,129 @@
+import importlib.util
+import sys
+import types
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+HTTP_CLIENT_PATH = REPO_ROOT / "mardi_importer" / "mardi_importer" / "utils" / "HttpClient.py"
+
+
+class FakeSession:
+    def __init__(self):
+        self.adapters = {}
+        self.responses = []
+        self.calls = []
+
+    def mount(self, prefix, adapter):
+        self.adapters[prefix] = adapter
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+class FakeAdapter:
+    def __init__(self, pool_connections=None, pool_maxsize=None, max_retries=None):
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.poolmanager = Mock(pools={})
+
+
+class FakeRetry:
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+
+def _load_http_client_module():
+    requests = types.ModuleType("requests")
+    requests.Session = FakeSession
+    requests.Response = Mock
+    adapters = types.ModuleType("requests.adapters")
+    adapters.HTTPAdapter = FakeAdapter
+    adapters.Retry = FakeRetry
+    requests.adapters = adapters
+    logging_utils = types.ModuleType("mardi_importer.logger.logging_utils")
+    logging_utils.get_logger_safe = lambda _name: Mock()
+
+    spec = importlib.util.spec_from_file_location("http_client_under_test", HTTP_CLIENT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    with patch.dict(sys.modules, {
+        "requests": requests,
+        "requests.adapters": adapters,
+        "mardi_importer.logger.logging_utils": logging_utils,
+    }):
+        spec.loader.exec_module(module)
+    return module
+
+
+HttpClientModule = _load_http_client_module()
+HttpClient = HttpClientModule.HttpClient
+
+
+class TestHttpClient(unittest.TestCase):
+    def setUp(self) -> None:
+        HttpClient._session = None
+        HttpClient._stats.clear()
+
+    def test_session_is_shared_and_configured_from_environment(self) -> None:
+        with patch.dict("os.environ", {"HTTP_RETRIES": "5", "HTTP_POOL_SIZE": "4"}):
+            session = HttpClient.session()
+
+        self.assertIs(HttpClient.session(), session)
+        adapter = session.adapters["https://"]
+        self.assertIs(session.adapters["http://"], adapter)
+        self.assertEqual(adapter.pool_maxsize, 4)
+        self.assertEqual(adapter.max_retries.kwargs["total"], 5)
+
+    def test_default_timeout_is_applied(self) -> None:
+        session = HttpClient.session()
+        session.responses = [Mock(status_code=200), Mock(status_code=200)]
+
+        with patch.dict("os.environ", {"HTTP_TIMEOUT": "7"}):
+            HttpClient.get("https://zbmath.org/", params={"q": "x"})
+        HttpClient.get("https://zbmath.org/", timeout=300)
+
+        self.assertEqual(session.calls[0][2], {"params": {"q": "x"}, "timeout": 7.0})
+        self.assertEqual(session.calls[1][2]["timeout"], 300)
+
+    def test_stats_per_host(self) -> None:
+        session = HttpClient.session()
+        session.responses = [
+            Mock(status_code=200),
+            Mock(status_code=503),
+            ConnectionError("reset"),
+            Mock(status_code=200),
+        ]
+        pool = Mock(host="zenodo.org", port=443, num_connections=1)
+        session.adapters["https://"].poolmanager.pools = {"key": pool}
+
+        HttpClient.get("https://zenodo.org/api/records/1")
+        HttpClient.get("https://zenodo.org/api/records/2")
+        with self.assertRaises(ConnectionError):
+            HttpClient.get("https://zenodo.org/api/records/3")
+        HttpClient.get("https://cran.r-project.org/web/packages/")
+
+        stats = HttpClient.stats()
+        self.assertEqual(stats["zenodo.org"]["requests"], 3)
+        self.assertEqual(stats["zenodo.org"]["errors"], 2)
+        self.assertEqual(stats["zenodo.org"]["connections"], 1)
+        self.assertEqual(stats["cran.r-project.org"]["errors"], 0)
+        self.assertEqual(stats["cran.r-project.org"]["connections"], 0)
+        self.assertGreaterEqual(stats["zenodo.org"]["max_time"], stats["zenodo.org"]["mean_time"])
+
+    def test_get_json_raises_on_error_status(self) -> None:
+        response = Mock(status_code=404)
+        response.raise_for_status.side_effect = RuntimeError("404")
+        HttpClient.session().responses = [response]
+
+        with self.assertRaises(RuntimeError):
+            HttpClient.get_json("https://zenodo.org/api/records/0")
+
+
+if __name__ == "__main__":
+    unittest.main()
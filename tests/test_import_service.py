@@ -290,9 +290,10 @@ class TestImportService(unittest.TestCase):
                 "services.import_service.Importer.create_source",
                 return_value=cran_source,
             ):
-                with patch(
-                    "services.import_service.RPackage",
-                    side_effect=rpackage_side_effect,
+                rpackage_module = types.ModuleType("mardi_importer.cran.RPackage")
+                rpackage_module.RPackage = Mock(side_effect=rpackage_side_effect)
+                with patch.dict(
+                    sys.modules, {"mardi_importer.cran.RPackage": rpackage_module}
                 ):
                     payload, all_ok = import_service.import_cran_sync(
                         ["dplyr", "ggplot2", "badpkg"]
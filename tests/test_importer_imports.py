@@ -1,3 +1,5 @@
+import os
+import subprocess
 import sys
 import unittest
 from pathlib import Path
@@ -5,6 +7,11 @@ from pathlib import Path
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 
+# Cold import budget of the package in seconds
+IMPORT_TIME_BUDGET = float(os.environ.get("MARDI_IMPORT_TIME_BUDGET", "3.0"))
+# Dependencies of single sources that must not be loaded by importing the package
+SOURCE_DEPENDENCIES = ("pandas", "habanero", "feedparser", "sickle", "bs4")
+
 
 def _install_wbi_helpers_stub() -> None:
     import types
@@ -76,5 +83,34 @@ class TestImporterImports(unittest.TestCase):
         self.assertTrue(hasattr(WikidataImporter, "__name__"))
 
 
+class TestImportTime(unittest.TestCase):
+    """Benchmarks the cold import of the package in a fresh interpreter."""
+
+    def test_import_time_within_budget(self) -> None:
+        code = (
+            "import sys, time\n"
+            "start = time.perf_counter()\n"
+            "from mardi_importer import Importer\n"
+            "Importer._sources\n"
+            "print(time.perf_counter() - start)\n"
+            f"print(','.join(m for m in {SOURCE_DEPENDENCIES!r} if m in sys.modules))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+        if result.returncode != 0:
+            if "ModuleNotFoundError" in result.stderr:
+                self.skipTest(result.stderr.strip().splitlines()[-1])
+            self.fail(result.stderr)
+
+        elapsed, loaded = result.stdout.split("\n")[:2]
+        self.assertEqual(loaded, "", f"source dependencies loaded at import: {loaded}")
+        self.assertLess(float(elapsed), IMPORT_TIME_BUDGET)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,61 @@
+import importlib.util
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+LICENSE_RESOLVER_PATH = REPO_ROOT / "mardi_importer" / "mardi_importer" / "utils" / "LicenseResolver.py"
+
+
+def _load_license_resolver():
+    spec = importlib.util.spec_from_file_location("license_resolver_under_test", LICENSE_RESOLVER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.LicenseResolver
+
+
+LicenseResolver = _load_license_resolver()
+
+
+class TestLicenseResolver(unittest.TestCase):
+    def setUp(self) -> None:
+        LicenseResolver._labeled = {}
+        self.api = MagicMock()
+        self.api.item.new.return_value.is_instance_of.return_value = "Q42"
+
+    def test_mapped_licenses_need_no_search(self) -> None:
+        self.assertEqual(LicenseResolver.software_license(self.api, "GPL-3"), "wd:Q10513445")
+        self.assertEqual(LicenseResolver.software_license(self.api, "Artistic-2.0"), "wd:Q14624826")
+        self.assertIsNone(LicenseResolver.software_license(self.api, "Proprietary"))
+
+        self.api.item.new.assert_not_called()
+
+    def test_labeled_licenses_are_searched_once(self) -> None:
+        for name in ["file LICENSE", "file LICENCE", "file LICENSE"]:
+            self.assertEqual(LicenseResolver.software_license(self.api, name), "Q42")
+
+        self.api.item.new.assert_called_once()
+        self.api.item.new.return_value.labels.set.assert_called_once_with(
+            language="en", value="File License"
+        )
+
+    def test_missing_labeled_license_is_searched_again(self) -> None:
+        self.api.item.new.return_value.is_instance_of.return_value = None
+
+        self.assertIsNone(LicenseResolver.software_license(self.api, "Unlimited"))
+        self.assertIsNone(LicenseResolver.software_license(self.api, "Unlimited"))
+
+        self.assertEqual(self.api.item.new.call_count, 2)
+
+    def test_zenodo_and_zbmath_licenses(self) -> None:
+        self.assertEqual(LicenseResolver.zenodo_license("mit-license"), "wd:Q334661")
+        self.assertIsNone(LicenseResolver.zenodo_license("other"))
+        self.assertEqual(
+            LicenseResolver.zbmath_license("https://creativecommons.org/licenses/by/4.0/"),
+            "Q57056",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
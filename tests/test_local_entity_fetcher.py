@@ -0,0 +1,171 @@
+import importlib.util
+import sys
+import types
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+FETCHER_PATH = REPO_ROOT / "mardi_importer" / "mardi_importer" / "utils" / "LocalEntityFetcher.py"
+
+
+def _load_fetcher_module():
+    wbi = types.ModuleType("wikibaseintegrator")
+    wbi.wbi_helpers = types.ModuleType("wikibaseintegrator.wbi_helpers")
+    spec = importlib.util.spec_from_file_location("local_entity_fetcher_under_test", FETCHER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    with patch.dict(sys.modules, {"wikibaseintegrator": wbi}):
+        spec.loader.exec_module(module)
+    return module
+
+
+FetcherModule = _load_fetcher_module()
+LocalEntityFetcher = FetcherModule.LocalEntityFetcher
+
+
+def _entity(qid, label, aliases=(), orcid=None):
+    claims = {}
+    if orcid:
+        claims["P20"] = [
+            {"mainsnak": {"snaktype": "value", "datavalue": {"value": orcid}}},
+            {"mainsnak": {"snaktype": "novalue"}},
+        ]
+    return {
+        "id": qid,
+        "labels": {"en": {"language": "en", "value": label}},
+        "aliases": {"en": [{"language": "en", "value": alias} for alias in aliases]},
+        "claims": claims,
+    }
+
+
+class TestLocalEntityFetcher(unittest.TestCase):
+    def setUp(self) -> None:
+        self.api = Mock()
+        self.api.get_local_id_by_label.side_effect = lambda label, _type: {
+            "wdt:P496": "P20", "wdt:P4594": "P21"
+        }[label]
+        self.fetcher = LocalEntityFetcher(self.api)
+
+    def _response(self, data, **_kwargs):
+        ids = data["ids"].split("|")
+        entities = {
+            qid: {"id": qid, "missing": ""} if qid == "Q999"
+            else _entity(qid, f"Author {qid}", ["A."], orcid=f"orcid-{qid}")
+            for qid in ids
+        }
+        return {"entities": entities}
+
+    def test_fetch_requests_50_entities_per_call(self) -> None:
+        qids = [f"Q{i}" for i in range(1, 121)] + ["Q1", "Q999"]
+
+        with patch.object(
+            FetcherModule.wbi_helpers, "mediawiki_api_call_helper", create=True,
+            side_effect=self._response,
+        ) as call:
+            entities = self.fetcher.fetch(qids, ["wdt:P496", "wdt:P4594"])
+
+        self.assertEqual(call.call_count, 3)
+        self.assertEqual(len(call.call_args_list[0].kwargs["data"]["ids"].split("|")), 50)
+        self.assertEqual(len(entities), 120)
+        self.assertNotIn("Q999", entities)
+        self.assertEqual(entities["Q7"], {
+            "label": "Author Q7",
+            "aliases": ["A."],
+            "claims": {"wdt:P496": ["orcid-Q7"], "wdt:P4594": []},
+        })
+
+    def test_fetch_without_properties_skips_claims(self) -> None:
+        with patch.object(
+            FetcherModule.wbi_helpers, "mediawiki_api_call_helper", create=True,
+            side_effect=self._response,
+        ) as call:
+            entities = self.fetcher.fetch(["Q1"])
+
+        self.assertEqual(call.call_args.kwargs["data"]["props"], "labels|aliases")
+        self.assertEqual(entities["Q1"]["claims"], {})
+
+    def test_fetch_claims_of_one_entity_filters_by_property(self) -> None:
+        self.api.get_local_id_by_label.side_effect = lambda label, _type: "P30"
+        response = {"claims": {"P30": [{"mainsnak": {
+            "snaktype": "value",
+            "datavalue": {"value": {"time": "+2024-05-01T00:00:00Z", "precision": 11}},
+        }}]}}
+
+        with patch.object(
+            FetcherModule.wbi_helpers, "mediawiki_api_call_helper", create=True,
+            return_value=response,
+        ) as call:
+            claims = self.fetcher.fetch_claims(["Q5"], ["wdt:P5017"])
+
+        data = call.call_args.kwargs["data"]
+        self.assertEqual((data["action"], data["entity"], data["property"]), ("wbgetclaims", "Q5", "P30"))
+        self.assertEqual(claims, {"Q5": {"wdt:P5017": ["+2024-05-01T00:00:00Z"]}})
+
+    def test_fetch_claims_of_several_entities_with_sparql(self) -> None:
+        self.api.get_local_id_by_label.side_effect = lambda label, _type: "P30"
+        base = "https://portal.mardi4nfdi.de/entity/"
+        results = {"results": {"bindings": [
+            {
+                "entity": {"type": "uri", "value": f"{base}Q1"},
+                "prop": {"type": "uri", "value": "https://portal.mardi4nfdi.de/prop/direct/P30"},
+                "value": {
+                    "type": "literal",
+                    "datatype": "http://www.w3.org/2001/XMLSchema#dateTime",
+                    "value": "2024-05-01T00:00:00Z",
+                },
+            },
+            {
+                "entity": {"type": "uri", "value": f"{base}Q2"},
+                "prop": {"type": "uri", "value": "https://portal.mardi4nfdi.de/prop/direct/P30"},
+                "value": {"type": "uri", "value": f"{base}.well-known/genid/abc"},
+            },
+        ]}}
+
+        with patch.dict("os.environ", {"SPARQL_ENDPOINT_URL": "https://query.example.org/sparql"}), \
+                patch.object(
+                    FetcherModule.wbi_helpers, "execute_sparql_query", create=True,
+                    return_value=results,
+                ) as query, \
+                patch.object(
+                    FetcherModule.wbi_helpers, "mediawiki_api_call_helper", create=True,
+                ) as call:
+            claims = self.fetcher.fetch_claims(["Q1", "Q2", "Q3"], ["wdt:P5017"])
+
+        query.assert_called_once()
+        call.assert_not_called()
+        sparql = query.call_args.kwargs["query"]
+        self.assertIn("VALUES ?entity { wd:Q1 wd:Q2 wd:Q3 }", sparql)
+        self.assertIn("VALUES ?prop { wdt:P30 }", sparql)
+        self.assertEqual(claims, {
+            "Q1": {"wdt:P5017": ["+2024-05-01T00:00:00Z"]},
+            "Q2": {"wdt:P5017": []},
+            "Q3": {"wdt:P5017": []},
+        })
+
+    def test_fetch_claims_of_several_entities_falls_back_to_wbgetclaims(self) -> None:
+        def response(data, **_kwargs):
+            return {"claims": {data["property"]: [{"mainsnak": {
+                "snaktype": "value", "datavalue": {"value": f"orcid-{data['entity']}"},
+            }}]}}
+
+        with patch.dict("os.environ", {"SPARQL_ENDPOINT_URL": "https://query.example.org/sparql"}), \
+                patch.object(
+                    FetcherModule.wbi_helpers, "execute_sparql_query", create=True,
+                    side_effect=ConnectionError("unavailable"),
+                ), \
+                patch.object(
+                    FetcherModule.wbi_helpers, "mediawiki_api_call_helper", create=True,
+                    side_effect=response,
+                ) as call:
+            claims = self.fetcher.fetch_claims(["Q1", "Q2"], ["wdt:P496"])
+
+        self.assertEqual(call.call_count, 2)
+        self.assertTrue(all(
+            c.kwargs["data"]["action"] == "wbgetclaims" and c.kwargs["data"]["property"] == "P20"
+            for c in call.call_args_list
+        ))
+        self.assertEqual(claims, {"Q1": {"wdt:P496": ["orcid-Q1"]}, "Q2": {"wdt:P496": ["orcid-Q2"]}})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import importlib.util
+import sys
+import types
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+ORCID_RESOLVER_PATH = REPO_ROOT / "mardi_importer" / "mardi_importer" / "utils" / "OrcidResolver.py"
+
+
+def _load_orcid_resolver_module():
+    wbi = types.ModuleType("wikibaseintegrator")
+    wbi.wbi_helpers = types.ModuleType("wikibaseintegrator.wbi_helpers")
+    person_registry = types.ModuleType("mardi_importer.wikidata.PersonRegistry")
+    person_registry.ORCID = "orcid"
+    spec = importlib.util.spec_from_file_location("orcid_resolver_under_test", ORCID_RESOLVER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    modules = {
+        "wikibaseintegrator": wbi,
+        "mardi_importer.wikidata.PersonRegistry": person_registry,
+    }
+    with patch.dict(sys.modules, modules):
+        spec.loader.exec_module(module)
+    return module
+
+
+OrcidResolverModule = _load_orcid_resolver_module()
+OrcidResolver = OrcidResolverModule.OrcidResolver
+
+
+class FakeAuthor:
+    def __init__(self, orcid=None, QID=None):
+        self.orcid = orcid
+        self._QID = QID
+        self._orcid_checked = False
+
+
+def _bindings(pairs):
+    return {
+        "results": {
+            "bindings": [
+                {"item": {"value": f"https://wiki/entity/{qid}"}, "orcid": {"value": orcid}}
+                for orcid, qid in pairs
+            ]
+        }
+    }
+
+
+@patch.dict("os.environ", {"SPARQL_ENDPOINT_URL": "http://sparql"})
+class TestOrcidResolver(unittest.TestCase):
+    def setUp(self) -> None:
+        self.api = Mock()
+        self.api.get_local_id_by_label.return_value = "P20"
+        self.resolver = OrcidResolver(self.api)
+
+    def test_resolve_authors_uses_one_query(self) -> None:
+        known = FakeAuthor("0000-0001", QID="Q1")
+        found = FakeAuthor("0000-0002")
+        duplicate = FakeAuthor("0000-0002")
+        missing = FakeAuthor("0000-0003")
+        no_orcid = FakeAuthor()
+        response = _bindings([("0000-0002", "Q12"), ("0000-0002", "Q7")])
+
+        with patch.object(
+            OrcidResolverModule.wbi_helpers, "execute_sparql_query", create=True,
+            return_value=response,
+        ) as sparql:
+            resolved = self.resolver.resolve_authors(
+                [known, found, duplicate, missing, no_orcid]
+            )
+
+        sparql.assert_called_once()
+        query = sparql.call_args.kwargs["query"]
+        self.assertIn('"0000-0002" "0000-0003"', query)
+        self.assertIn("wdt:P20", query)
+        self.assertEqual(resolved, 2)
+        self.assertEqual((found._QID, duplicate._QID), ("Q7", "Q7"))
+        self.assertIsNone(missing._QID)
+        self.assertTrue(missing._orcid_checked)
+        self.assertEqual(known._QID, "Q1")
+        self.assertFalse(no_orcid._orcid_checked)
+
+    def test_failed_query_leaves_authors_unchecked(self) -> None:
+        author = FakeAuthor("0000-0002")
+
+        with patch.object(
+            OrcidResolverModule.wbi_helpers, "execute_sparql_query", create=True,
+            side_effect=RuntimeError("down"),
+        ):
+            self.assertEqual(self.resolver.resolve_authors([author]), 0)
+
+        self.assertIsNone(author._QID)
+        self.assertFalse(author._orcid_checked)
+
+    def test_registry_is_consulted_before_query(self) -> None:
+        registry = Mock()
+        registry.get_many.return_value = {"0000-0001": "Q1"}
+        resolver = OrcidResolver(self.api, registry=registry)
+        known = FakeAuthor("0000-0001")
+        found = FakeAuthor("0000-0002")
+
+        with patch.object(
+            OrcidResolverModule.wbi_helpers, "execute_sparql_query", create=True,
+            return_value=_bindings([("0000-0002", "Q2")]),
+        ) as sparql:
+            self.assertEqual(resolver.resolve_authors([known, found]), 2)
+
+        self.assertNotIn("0000-0001", sparql.call_args.kwargs["query"])
+        self.assertEqual((known._QID, found._QID), ("Q1", "Q2"))
+        registry.record.assert_called_once_with("Q2", orcid="0000-0002")
+
+    def test_resolve_skips_without_endpoint(self) -> None:
+        with patch.dict("os.environ", {"SPARQL_ENDPOINT_URL": ""}):
+            self.assertIsNone(self.resolver.resolve(["0000-0002"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
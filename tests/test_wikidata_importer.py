@@ -1,9 +1,30 @@
+import gzip
+import json
 import logging
+import os
+import sys
+import tempfile
+import threading
+import time
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, Mock, patch
 
 
-from mardi_importer.wikidata import WikidataImporter
+from mardi_importer.wikidata import (
+    IdMappingSnapshot,
+    EntityCache,
+    ImportBudget,
+    ImportPlanner,
+    ImportProfile,
+    PersonRegistry,
+    ResolutionCache,
+    WikidataDumpReader,
+    WikidataImporter,
+)
+
+WikidataImporterModule = sys.modules[WikidataImporter.__module__]
+PersonRegistryModule = sys.modules[PersonRegistry.__module__]
+ResolutionCacheModule = sys.modules[ResolutionCache.__module__]
 
 
 class TestWikidataImporterImportEntities(unittest.TestCase):
@@ -43,5 +64,628 @@ class TestWikidataImporterImportEntities(unittest.TestCase):
         self.assertEqual(result, "QLOCAL1")
 
 
+class TestWikidataImporterUpdateEntities(unittest.TestCase):
+    """Tests for the revision-aware skip and pooled fetches in update_entities."""
+
+    def setUp(self) -> None:
+        WikidataImporter._instance = None
+        WikidataImporter._initialized = False
+        with patch.object(WikidataImporter, "__init__", return_value=None):
+            self.wdi = WikidataImporter()
+        self.wdi.log = logging.getLogger("test")
+        self.wdi._prefetched = {}
+        self.wdi.fetch_workers = 2
+        self.wdi.request_timeout = 60
+        self.wdi._query_synced_revisions = Mock(
+            return_value={"Q1": ("Q10", 100), "Q2": ("Q20", 200)}
+        )
+        self.wdi._get_wikidata_revisions = Mock(return_value={"Q1": 100, "Q2": 201})
+
+    def test_unchanged_entities(self) -> None:
+        self.assertEqual(self.wdi.get_unchanged_entities(["Q1", "Q2"]), {"Q1": "Q10"})
+        self.wdi._get_wikidata_revisions.assert_called_once_with(["Q1", "Q2"])
+
+    def test_update_skips_unchanged_entity(self) -> None:
+        self.wdi._get_wikidata_information = Mock(side_effect=AssertionError("fetched"))
+
+        self.assertEqual(self.wdi.update_entities("Q1"), "Q10")
+
+    def test_update_fetches_changed_entities_on_pool(self) -> None:
+        self.wdi._get_wikidata_information = Mock(return_value=None)
+
+        result = self.wdi.update_entities(["Q1", "Q2", "Q3"])
+
+        self.assertEqual(result, "Q10")
+        fetched = sorted(c.args for c in self.wdi._get_wikidata_information.call_args_list)
+        self.assertEqual(fetched, [("Q2", True, 60, False), ("Q3", True, 60, False)])
+
+    def test_update_skips_entity_on_timeout(self) -> None:
+        release = threading.Event()
+        self.wdi._get_wikidata_information = Mock(side_effect=lambda *_: release.wait(5))
+
+        result = self.wdi.update_entities(["Q1", "Q3"], timeout=0.05)
+        release.set()
+
+        self.assertEqual(result, "Q10")
+
+
+class TestWikidataDumpReader(unittest.TestCase):
+    """Tests for reading entities from a local Wikidata JSON dump."""
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "slice.json")
+        entities = [
+            {"type": "item", "id": "Q1", "labels": {"en": {"language": "en", "value": "universe"}}},
+            {"type": "property", "id": "P31", "labels": {"en": {"language": "en", "value": "instance of"}}},
+        ]
+        with open(self.path, "wb") as f:
+            f.write(b"[\n")
+            f.write(",\n".join(json.dumps(e) for e in entities).encode() + b"\n")
+            f.write(b"]\n")
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_get_entity_by_id(self) -> None:
+        reader = WikidataDumpReader(self.path)
+        self.assertEqual(reader.get("P31")["labels"]["en"]["value"], "instance of")
+        self.assertEqual(reader.get("Q1")["type"], "item")
+        self.assertIsNone(reader.get("Q2"))
+        reader.close()
+
+    def test_index_is_reused(self) -> None:
+        WikidataDumpReader(self.path).build_index()
+        self.assertTrue(os.path.isfile(self.path + ".idx"))
+
+        reader = WikidataDumpReader(self.path)
+        with patch.object(reader, "_open", side_effect=AssertionError("dump re-read")):
+            self.assertEqual(len(reader.build_index()), 2)
+            self.assertIn("Q1", reader)
+            self.assertIn("P31", reader)
+            self.assertNotIn("P1", reader)
+        reader.close()
+
+    def test_outdated_index_format_is_rebuilt(self) -> None:
+        with open(self.path + ".idx", "w") as f:
+            f.write("Q1\t2\n")
+
+        reader = WikidataDumpReader(self.path)
+        self.assertEqual(reader.get("Q1")["type"], "item")
+        reader.close()
+
+    def test_compressed_dump_is_rejected(self) -> None:
+        path = os.path.join(self.tmpdir.name, "slice.json.gz")
+        with gzip.open(path, "wb") as f:
+            f.write(b"[\n]\n")
+
+        with self.assertRaises(ValueError):
+            WikidataDumpReader(path)
+
+    def test_importer_reads_from_dump(self) -> None:
+        WikidataImporter._instance = None
+        WikidataImporter._initialized = False
+        with patch.object(WikidataImporter, "__init__", return_value=None):
+            wdi = WikidataImporter()
+        wdi.log = logging.getLogger("test")
+        wdi.api = Mock()
+        wdi._prefetched = {}
+        wdi.dump = WikidataDumpReader(self.path)
+        wdi._filter_entity = lambda entity, recurse: entity
+
+        entity = wdi._get_wikidata_information("Q1")
+
+        wdi.api.item.new.return_value.from_json.assert_called_once()
+        wdi.api.item.get.assert_not_called()
+        self.assertIs(entity, wdi.api.item.new.return_value.from_json.return_value)
+        wdi.dump.close()
+
+    def test_updates_do_not_read_from_dump(self) -> None:
+        WikidataImporter._instance = None
+        WikidataImporter._initialized = False
+        with patch.object(WikidataImporter, "__init__", return_value=None):
+            wdi = WikidataImporter()
+        wdi.log = logging.getLogger("test")
+        wdi.api = Mock()
+        wdi._prefetched = {}
+        wdi.dump = Mock()
+        wdi._filter_entity = lambda entity, recurse: entity
+        wdi._wbgetentities = Mock(return_value={"Q1": {"id": "Q1"}})
+        wdi._write_entity_cache = Mock()
+
+        wdi._get_wikidata_information("Q1", True, 30, False)
+
+        wdi.dump.get.assert_not_called()
+        wdi._wbgetentities.assert_called_once_with(["Q1"], True, 30)
+
+
+class TestWikidataImporterFetch(unittest.TestCase):
+    """Tests for the language-restricted wbgetentities requests."""
+
+    def setUp(self) -> None:
+        WikidataImporter._instance = None
+        WikidataImporter._initialized = False
+        with patch.object(WikidataImporter, "__init__", return_value=None):
+            self.wdi = WikidataImporter()
+        self.wdi.log = logging.getLogger("test")
+        self.wdi.languages = ["en", "de"]
+        self.wdi._prefetched = {}
+        self.wdi.dump = None
+        self.wdi.entity_cache = None
+
+    def test_label_only_request(self) -> None:
+        with patch.object(
+            WikidataImporterModule.wbi_helpers, "mediawiki_api_call_helper", create=True,
+            return_value={"entities": {"Q1": {"id": "Q1"}, "Q2": {"id": "Q2", "missing": ""}}},
+        ) as mock_api_call:
+            entities = self.wdi.prefetch_entities(["Q1", "Q2"], recurse=False)
+
+        data = mock_api_call.call_args.kwargs["data"]
+        self.assertEqual(data["languages"], "en|de")
+        self.assertNotIn("claims", data["props"])
+        self.assertNotIn("sitelinks", data["props"])
+        self.assertEqual(list(entities), ["Q1"])
+
+    def test_label_only_cache_is_not_used_for_claims(self) -> None:
+        self.wdi._prefetched = {"Q1": {"id": "Q1"}, "Q2": {"id": "Q2", "claims": {}}}
+        with patch.object(
+            WikidataImporterModule.wbi_helpers, "mediawiki_api_call_helper", create=True,
+            return_value={"entities": {"Q1": {"id": "Q1", "claims": {}}}},
+        ) as mock_api_call:
+            self.wdi.prefetch_entities(["Q1", "Q2"])
+
+        data = mock_api_call.call_args.kwargs["data"]
+        self.assertEqual(data["ids"], "Q1")
+        self.assertIn("claims", data["props"])
+        self.assertIn("claims", self.wdi._prefetched["Q1"])
+
+    def test_requests_with_timeout_have_bounded_retries(self) -> None:
+        with patch.object(
+            WikidataImporterModule.wbi_helpers, "mediawiki_api_call_helper", create=True,
+            return_value={"entities": {"Q1": {"id": "Q1"}}},
+        ) as mock_api_call:
+            self.wdi._wbgetentities(["Q1"], recurse=True, timeout=30)
+
+        kwargs = mock_api_call.call_args.kwargs
+        self.assertEqual(kwargs["timeout"], 30)
+        self.assertEqual(kwargs["max_retries"], WikidataImporterModule.FETCH_MAX_RETRIES)
+        self.assertEqual(kwargs["retry_after"], WikidataImporterModule.FETCH_RETRY_AFTER)
+
+
+class TestEntityCache(unittest.TestCase):
+    """Tests for the on-disk cache of Wikidata entity JSON."""
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = EntityCache(self.tmpdir.name, max_age=3600)
+        WikidataImporter._instance = None
+        WikidataImporter._initialized = False
+        with patch.object(WikidataImporter, "__init__", return_value=None):
+            self.wdi = WikidataImporter()
+        self.wdi.log = logging.getLogger("test")
+        self.wdi.languages = ["en", "de"]
+        self.wdi.entity_cache = self.cache
+        self.wdi._get_wikidata_revisions = Mock(return_value={})
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_newest_revision_is_used(self) -> None:
+        self.cache.store("Q1", "claims-de.en", {"id": "Q1", "lastrevid": 5})
+        self.cache.store("Q1", "claims-de.en", {"id": "Q1", "lastrevid": 7})
+
+        lastrevid, path, _ = self.cache.lookup("Q1", ["claims-de.en"])
+        self.assertEqual(lastrevid, 7)
+        self.assertEqual(self.cache.read(path)["lastrevid"], 7)
+        self.assertIsNone(self.cache.lookup("Q1", ["claims-en"]))
+
+    def test_claims_entry_serves_label_requests(self) -> None:
+        self.wdi._write_entity_cache({"Q1": {"id": "Q1", "lastrevid": 5}}, recurse=True)
+
+        self.assertEqual(self.wdi._read_entity_cache(["Q1", "Q2"], recurse=False), {
+            "Q1": {"id": "Q1", "lastrevid": 5},
+        })
+        self.wdi._get_wikidata_revisions.assert_not_called()
+
+    def test_stale_entries_are_revalidated(self) -> None:
+        self.wdi._write_entity_cache({
+            "Q1": {"id": "Q1", "lastrevid": 5},
+            "Q2": {"id": "Q2", "lastrevid": 8},
+        }, recurse=True)
+        self.cache.max_age = -1
+        self.wdi._get_wikidata_revisions.return_value = {"Q1": 5, "Q2": 9}
+
+        self.assertEqual(list(self.wdi._read_entity_cache(["Q1", "Q2"], recurse=True)), ["Q1"])
+        self.wdi._get_wikidata_revisions.assert_called_once_with(["Q1", "Q2"])
+
+    def test_eviction_keeps_cache_below_size_bound(self) -> None:
+        self.cache.max_bytes = 1
+        self.cache.store("Q1", "claims-de.en", {"id": "Q1", "lastrevid": 5})
+        self.assertIsNone(self.cache.lookup("Q1", ["claims-de.en"]))
+
+
+class TestWikidataImporterLocking(unittest.TestCase):
+    """Tests for the coordination of entity creation across workers."""
+
+    def setUp(self) -> None:
+        WikidataImporter._instance = None
+        WikidataImporter._initialized = False
+        with patch.object(WikidataImporter, "__init__", return_value=None):
+            self.wdi = WikidataImporter()
+        self.wdi.log = logging.getLogger("test")
+        self.wdi.engine = MagicMock()
+        self.wdi.lock_timeout = 1
+        self.connection = self.wdi.engine.connect.return_value.__enter__.return_value
+
+    def test_lock_is_released(self) -> None:
+        self.connection.execute.return_value.scalar.return_value = 1
+        with self.wdi._entity_lock("Q1"):
+            pass
+        statements = [c.args[0] for c in self.connection.execute.call_args_list]
+        self.assertEqual(
+            statements,
+            ["SELECT GET_LOCK(:name, :timeout)", "SELECT RELEASE_LOCK(:name)"],
+        )
+
+    def test_lock_timeout(self) -> None:
+        self.connection.execute.return_value.scalar.return_value = 0
+        with self.assertRaises(TimeoutError):
+            with self.wdi._entity_lock("Q1"):
+                self.fail("lock not acquired")
+
+    def test_waiting_worker_uses_mapping_of_other_worker(self) -> None:
+        self.connection.execute.return_value.scalar.return_value = 1
+        entity = Mock(type="item", id="Q1")
+        self.wdi._get_wikidata_information = Mock(return_value=entity)
+        self.wdi.resolve_cached_id = lambda wikidata_id: wikidata_id
+        # Not mapped before the lock, mapped by another worker once acquired
+        self.wdi.query = Mock(side_effect=[None, None, "Q10"])
+
+        self.assertEqual(self.wdi._import_claim_entities("Q1"), "Q10")
+        entity.write.assert_not_called()
+
+    def test_waiting_worker_does_not_import_claims_again(self) -> None:
+        self.connection.execute.return_value.scalar.return_value = 1
+        entity = Mock(type="item", id="Q1")
+        self.wdi._get_wikidata_information = Mock(return_value=entity)
+        self.wdi._convert_claim_ids = Mock()
+        self.wdi._add_wikidata_ID_claim = Mock(return_value=entity)
+        self.wdi.resolve_cached_id = lambda wikidata_id: wikidata_id
+        self.wdi.api = Mock()
+        # Imported with all claims by another worker once the lock is acquired
+        answers = {"has_all_claims": [False, True], "local_id": ["Q10"]}
+        self.wdi.query = lambda kind, _wikidata_id: answers[kind].pop(0)
+
+        self.assertEqual(self.wdi.import_entities("Q1", recurse=True), "Q10")
+        entity.write.assert_not_called()
+        entity.exists.assert_not_called()
+        self.wdi.api.item.get.assert_not_called()
+
+
+class TestIdMappingSnapshot(unittest.TestCase):
+    """Tests for the memory-mapped id mapping snapshot."""
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.snapshot = IdMappingSnapshot.write(
+            self.tmpdir.name,
+            {
+                "items": [(1, 42, 7, True), (2, 5, 8, False)],
+                "properties": [(1, 31, 2, False)],
+            },
+        )
+
+    def tearDown(self) -> None:
+        self.snapshot.close()
+        self.tmpdir.cleanup()
+
+    def test_lookup(self) -> None:
+        self.assertEqual(self.snapshot.get("Q42"), ("Q7", True))
+        self.assertEqual(self.snapshot.get("Q5"), ("Q8", False))
+        self.assertEqual(self.snapshot.get("P31"), ("P2", False))
+        self.assertIsNone(self.snapshot.get("Q1"))
+        self.assertIsNone(self.snapshot.get("P42"))
+
+    def test_overlay_and_save(self) -> None:
+        self.snapshot.record("Q1", "Q9", False)
+        self.snapshot.record("Q5", has_all_claims=True)
+        self.assertEqual(self.snapshot.get("Q1"), ("Q9", False))
+        self.assertEqual(self.snapshot.get("Q5"), ("Q8", True))
+
+        self.snapshot.save()
+        reloaded = IdMappingSnapshot(self.tmpdir.name)
+        self.assertEqual(reloaded.get("Q1"), ("Q9", False))
+        self.assertEqual(reloaded.get("Q5"), ("Q8", True))
+        self.assertEqual(reloaded.get("Q42"), ("Q7", True))
+        reloaded.close()
+
+    def test_refreshed_rows_are_saved_above_threshold(self) -> None:
+        WikidataImporter._instance = None
+        WikidataImporter._initialized = False
+        with patch.object(WikidataImporter, "__init__", return_value=None):
+            wdi = WikidataImporter()
+        wdi.log = logging.getLogger("test")
+        wdi.engine = Mock()
+        new_rows = {"items": [(3, 100, 9, True), (4, 101, 10, False)], "properties": []}
+
+        with patch.object(IdMappingSnapshot, "_read_tables", return_value=new_rows):
+            with patch.dict(os.environ, {"WIKIDATA_ID_SNAPSHOT_MAX_OVERLAY": "2"}):
+                wdi.load_id_snapshot(self.tmpdir.name)
+            self.assertEqual(wdi.id_snapshot.overlay_size, 2)
+            wdi.id_snapshot.close()
+
+            with patch.dict(os.environ, {"WIKIDATA_ID_SNAPSHOT_MAX_OVERLAY": "1"}):
+                wdi.load_id_snapshot(self.tmpdir.name)
+            self.assertEqual(wdi.id_snapshot.overlay_size, 0)
+            wdi.id_snapshot.close()
+
+        reloaded = IdMappingSnapshot(self.tmpdir.name)
+        self.assertEqual(reloaded.get("Q100"), ("Q9", True))
+        self.assertEqual(reloaded.get("Q42"), ("Q7", True))
+        reloaded.close()
+
+    def test_query_served_from_snapshot(self) -> None:
+        WikidataImporter._instance = None
+        WikidataImporter._initialized = False
+        with patch.object(WikidataImporter, "__init__", return_value=None):
+            wdi = WikidataImporter()
+        wdi.id_snapshot = self.snapshot
+        wdi._get_table = Mock(side_effect=AssertionError("DB queried"))
+
+        self.assertEqual(wdi.query("local_id", "Q42"), "Q7")
+        self.assertTrue(wdi.query("has_all_claims", "Q42"))
+
+
+class TestImportPlanner(unittest.TestCase):
+    """Tests for the batch-level dependency planner."""
+
+    @staticmethod
+    def _entity(entity_id, claims):
+        return {"id": entity_id, "claims": claims}
+
+    def setUp(self) -> None:
+        unit = "http://www.wikidata.org/entity/Q11573"
+        self.entities = {
+            "Q1": self._entity("Q1", {
+                "P31": [{
+                    "mainsnak": {
+                        "property": "P31",
+                        "datatype": "wikibase-item",
+                        "datavalue": {"value": {"id": "Q5"}},
+                    },
+                    "qualifiers": {"P580": [{"property": "P580", "datatype": "time", "datavalue": {"value": {}}}]},
+                    "references": [{"snaks": {"P248": [{
+                        "property": "P248",
+                        "datatype": "wikibase-item",
+                        "datavalue": {"value": {"id": "Q2"}},
+                    }]}}],
+                }],
+                "P1855": [{"mainsnak": {"property": "P1855", "datatype": "wikibase-item", "datavalue": {"value": {"id": "Q9"}}}}],
+            }),
+            "Q2": self._entity("Q2", {
+                "P2048": [{"mainsnak": {
+                    "property": "P2048",
+                    "datatype": "quantity",
+                    "datavalue": {"value": {"amount": "+1", "unit": unit}},
+                }}],
+                "P31": [{"mainsnak": {"property": "P31", "datatype": "wikibase-item", "datavalue": {"value": {"id": "Q5"}}}}],
+            }),
+        }
+        self.wdi = Mock()
+        self.wdi.excluded_properties = ["P1855"]
+        self.wdi.excluded_datatypes = ["wikibase-lexeme"]
+        self.wdi.query.return_value = None
+        self.wdi.prefetch_entities.side_effect = lambda ids, recurse=True: {
+            i: self.entities[i] for i in ids if i in self.entities
+        }
+        self.wdi.query_local_ids.return_value = {"P580": "P3"}
+        self.wdi.resolve_cached_id.side_effect = lambda wikidata_id: wikidata_id
+        self.wdi.import_profile = ImportProfile(name="full")
+
+    def test_plan_deduplicates_dependencies(self) -> None:
+        plan = ImportPlanner(self.wdi).plan(["Q1", "Q2", "Q1"])
+
+        self.assertEqual(plan["entities"], ["Q1", "Q2"])
+        self.assertEqual(plan["properties"], ["P2048", "P248", "P31"])
+        self.assertEqual(plan["items"], ["Q11573", "Q5"])
+
+    def test_prepare_imports_properties_before_items(self) -> None:
+        ImportPlanner(self.wdi).prepare(["Q1", "Q2"])
+
+        imported = [c.args[0] for c in self.wdi._import_claim_entities.call_args_list]
+        self.assertEqual(imported, ["P2048", "P248", "P31", "Q11573", "Q5"])
+
+    def test_plan_applies_import_profile(self) -> None:
+        self.wdi.import_profile = ImportProfile(
+            name="test", denied_properties={"P2048"}, max_new_dependencies=3
+        )
+        plan = ImportPlanner(self.wdi).plan(["Q1", "Q2"])
+
+        # Q1 depends on P31, P248 and Q5; Q2's unit is not needed anymore
+        self.assertEqual(plan["properties"], ["P248", "P31"])
+        self.assertEqual(plan["items"], ["Q5"])
+
+        self.wdi.import_profile.max_new_dependencies = 2
+        plan = ImportPlanner(self.wdi).plan(["Q1", "Q2"])
+        self.assertEqual(plan["properties"], ["P31"])
+        self.assertEqual(plan["items"], ["Q5"])
+
+
+class TestImportBudget(unittest.TestCase):
+    """Tests for the limits of recursive Wikidata imports."""
+
+    def test_budget_limits_and_report(self) -> None:
+        budget = ImportBudget(
+            ImportProfile(name="test", max_new_dependencies=1, max_claims_per_property=2)
+        )
+        self.assertEqual(budget.limit_claims("P31", ["a", "b", "c"]), ["a", "b"])
+        self.assertTrue(budget.reserve_dependency("Q1"))
+        self.assertFalse(budget.reserve_dependency("Q2"))
+        self.assertEqual(
+            budget.report(),
+            {"claim_limit": {"P31": 1}, "dependency_budget": {"Q2": 1}},
+        )
+
+    def test_dependency_budget_is_passed_per_call(self) -> None:
+        WikidataImporter._instance = None
+        WikidataImporter._initialized = False
+        with patch.object(WikidataImporter, "__init__", return_value=None):
+            wdi = WikidataImporter()
+        wdi.query = Mock(return_value=None)
+        wdi.resolve_cached_id = Mock(side_effect=lambda wikidata_id: wikidata_id)
+        wdi._get_wikidata_information = Mock(return_value=None)
+        wdi.resolution_cache = Mock()
+        exhausted = ImportBudget(ImportProfile(name="test", max_new_dependencies=0))
+
+        self.assertIsNone(wdi._import_claim_entities("Q1", budget=exhausted))
+        wdi._get_wikidata_information.assert_not_called()
+
+        # Imports without a budget of their own are not limited by another one
+        wdi._import_claim_entities("Q1")
+        wdi._get_wikidata_information.assert_called_once_with("Q1")
+
+    def test_skipped_claims_are_reported_per_import_call(self) -> None:
+        WikidataImporter._instance = None
+        WikidataImporter._initialized = False
+        with patch.object(WikidataImporter, "__init__", return_value=None):
+            wdi = WikidataImporter()
+        wdi.log = logging.getLogger("test")
+        wdi.excluded_properties = []
+        wdi.import_profile = ImportProfile(name="test", denied_properties={"P2860"})
+        entity = Mock(id="Q2")
+        entity.claims.claims = {"P2860": [Mock(), Mock()]}
+
+        wdi._convert_claim_ids(entity, "Q1")
+        self.assertIn("Q1", wdi.skipped_claims)
+        self.assertNotIn("Q2", wdi.skipped_claims)
+
+        # A new top-level import call starts with an empty report
+        wdi.import_entities([])
+        self.assertEqual(wdi.skipped_claims, {})
+
+    def test_profile_from_env(self) -> None:
+        env = {
+            "WIKIDATA_IMPORT_PROFILE": "compact",
+            "WIKIDATA_PROPERTY_DENYLIST": "P1, P2",
+            "WIKIDATA_MAX_CLAIMS_PER_PROPERTY": "5",
+        }
+        with patch.dict(os.environ, env):
+            profile = ImportProfile.from_env()
+        self.assertFalse(profile.allows_property("P2"))
+        self.assertFalse(profile.allows_property("P2860"))
+        self.assertTrue(profile.allows_property("P31"))
+        self.assertEqual(profile.max_claims_per_property, 5)
+        self.assertEqual(profile.max_new_dependencies, 100)
+
+        with patch.dict(os.environ, {"WIKIDATA_IMPORT_PROFILE": "unknown"}):
+            with self.assertRaises(ValueError):
+                ImportProfile.from_env()
+
+
+
+class TestResolutionCache(unittest.TestCase):
+    """Tests for the cache of redirected and unimportable Wikidata ids."""
+
+    def setUp(self) -> None:
+        WikidataImporter._instance = None
+        WikidataImporter._initialized = False
+        with patch.object(WikidataImporter, "__init__", return_value=None):
+            self.wdi = WikidataImporter()
+        self.wdi.log = logging.getLogger("test")
+        self.wdi.excluded_datatypes = ["wikibase-lexeme"]
+        self.wdi.query = Mock(return_value=None)
+        self.cache = ResolutionCache(engine=MagicMock(), ttl=3600)
+        self.cache._entries = {}
+        self.cache._get_table = Mock()
+        self.wdi.resolution_cache = self.cache
+
+    def test_expired_entries_are_ignored(self) -> None:
+        now = int(time.time())
+        self.cache._entries = {
+            "Q1": ("no_labels", None, now),
+            "Q2": ("no_labels", None, now - 7200),
+        }
+        self.assertEqual(self.cache.get("Q1"), ("no_labels", None))
+        self.assertIsNone(self.cache.get("Q2"))
+
+    def test_unimportable_entity_is_fetched_once(self) -> None:
+        self.wdi._get_wikidata_information = Mock(return_value=None)
+
+        self.assertIsNone(self.wdi._import_claim_entities("Q1"))
+        self.assertIsNone(self.wdi._import_claim_entities("Q1"))
+
+        self.wdi._get_wikidata_information.assert_called_once_with("Q1")
+
+    def test_redirect_is_resolved_from_cache(self) -> None:
+        self.wdi._get_wikidata_information = Mock(
+            return_value=Mock(type="item", id="Q2")
+        )
+        self.wdi.query = Mock(side_effect=[None, None, "Q20"])
+
+        self.assertEqual(self.wdi._import_claim_entities("Q1"), "Q20")
+        self.assertEqual(self.cache.get("Q1"), ("redirect", "Q2"))
+
+        self.wdi.query = Mock(side_effect=[None, "Q20"])
+        self.assertEqual(self.wdi._import_claim_entities("Q1"), "Q20")
+        self.wdi._get_wikidata_information.assert_called_once()
+
+    def test_record_is_a_single_upsert(self) -> None:
+        connection = self.cache.engine.connect.return_value.__enter__.return_value
+
+        with patch.object(ResolutionCacheModule, "insert") as insert:
+            self.cache.record("Q1", "redirect", "Q2")
+
+        insert.return_value.values.assert_called_once()
+        upsert = insert.return_value.values.return_value.on_duplicate_key_update.return_value
+        connection.execute.assert_called_once_with(upsert)
+
+    def test_failed_write_does_not_fail_the_import(self) -> None:
+        self.cache.engine.connect.side_effect = ResolutionCacheModule.db.exc.SQLAlchemyError(
+            "Deadlock found"
+        )
+        self.wdi._get_wikidata_information = Mock(return_value=None)
+
+        self.assertIsNone(self.wdi._import_claim_entities("Q1"))
+        self.assertEqual(self.cache.get("Q1"), ("no_labels", None))
+
+
+class TestPersonRegistry(unittest.TestCase):
+    """Tests for the registry of person identifiers."""
+
+    def setUp(self) -> None:
+        self.engine = MagicMock()
+        self.connection = self.engine.connect.return_value.__enter__.return_value
+        self.registry = PersonRegistry(engine=self.engine)
+        self.registry._get_table = MagicMock()
+
+    def test_known_identifiers_are_not_queried_again(self) -> None:
+        self.connection.execute.return_value.fetchall.return_value = [("0000-0001", "Q1")]
+
+        with patch.object(PersonRegistryModule.db, "select", create=True):
+            found = self.registry.get_many("orcid", ["0000-0001", "0000-0002", None])
+            self.assertEqual(found, {"0000-0001": "Q1"})
+            self.assertEqual(self.registry.get("orcid", "0000-0001"), "Q1")
+            self.assertIsNone(self.registry.get("orcid", None))
+
+        self.connection.execute.assert_called_once()
+
+    def test_record_skips_known_and_empty_identifiers(self) -> None:
+        self.registry.record("Q1", orcid="0000-0001", arxiv_author=None)
+        self.registry.record("Q1", orcid="0000-0001")
+
+        # One upsert for the ORCID only
+        self.connection.execute.assert_called_once()
+        self.assertEqual(self.registry.get("orcid", "0000-0001"), "Q1")
+
+    def test_failed_write_is_not_raised(self) -> None:
+        self.connection.execute.side_effect = PersonRegistryModule.db.exc.SQLAlchemyError(
+            "Duplicate entry"
+        )
+
+        self.registry.record("Q1", orcid="0000-0001")
+
+        self.assertNotIn(("orcid", "0000-0001"), self.registry._known)
+
+
 if __name__ == "__main__":
     unittest.main()